@@ -0,0 +1,73 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+
+class BackgroundLoop:
+    def __init__(self, name: str = "scraper-loop", DEBUG: bool = False):
+        """
+        Purpose: One asyncio event loop running for the life of the app in a daemon thread, so async resources
+                 (browser, HTTP sessions) stay warm between jobs submitted from another thread (ex. the Tk thread)
+        Input:
+            - name = thread name
+        """
+        self.name = name
+        self.DEBUG = DEBUG
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.thread: threading.Thread | None = None
+        self._ready = threading.Event()
+
+    def start(self) -> None:
+        """
+        Purpose: Start the loop thread and wait until the loop is running
+        """
+        if self.thread and self.thread.is_alive():
+            return
+        self._ready.clear()
+        self.thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self.thread.start()
+        self._ready.wait()
+
+    def _run(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(self._ready.set)
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+
+    def submit(self, coroutine) -> Future:
+        """
+        Purpose: Schedule a coroutine on the loop from any thread
+        Output:
+            - concurrent.futures.Future for its result; Future.cancel() cancels the running coroutine
+        """
+        if not self.loop or not self.loop.is_running():
+            raise RuntimeError("Background loop not started.")
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def stop(self, shutdown=None, timeout: float = 30) -> None:
+        """
+        Purpose: Optionally run a shutdown coroutine (ex. closing the browser), cancel leftover tasks and stop the loop
+        Input:
+            - shutdown = coroutine run on the loop before it stops
+            - timeout = seconds to wait for the shutdown coroutine and the thread
+        """
+        if not self.loop or not self.loop.is_running():
+            return
+        if shutdown is not None:
+            try:
+                self.submit(shutdown).result(timeout)
+            except Exception as e:
+                if self.DEBUG:
+                    print(f"[DEBUG][LOOP][ERROR] Shutdown failed: {e}")
+        self.submit(self._cancel_tasks()).result(timeout)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout)
+
+    async def _cancel_tasks(self) -> None:
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
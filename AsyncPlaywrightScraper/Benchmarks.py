@@ -0,0 +1,209 @@
+import asyncio
+import glob
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from urllib.parse import urljoin, unquote
+
+from BrowserHandler import BrowserHandler
+from LinkExtractor import extract_links, normalize_url
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+def write_static_site(directory: str, page_count: int, links_per_page: int = 25) -> list[str]:
+    """
+    Purpose: Write a small static site of link-heavy pages to serve locally
+    Input:
+        - directory = folder to write pages into
+        - page_count = number of pages to create
+        - links_per_page = number of <a href> links on each page
+    Output:
+        - List of page file names
+    """
+    names = []
+    for i in range(page_count):
+        name = f"page{i}.html"
+        links = "\n".join(f'<a href="/news/article-{i}-{j}">Article {i}-{j}</a>' for j in range(links_per_page))
+        with open(os.path.join(directory, name), "w", encoding="utf-8") as f:
+            f.write(f"<html><head><title>Page {i}</title></head><body>{links}</body></html>")
+        names.append(name)
+    return names
+
+
+def start_static_server(directory: str) -> tuple[ThreadingHTTPServer, str]:
+    """
+    Purpose: Serve a folder over HTTP on a free local port in a background thread
+    Output:
+        - Tuple containing the server and its base URL
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=directory))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+async def _run_concurrently(urls: list[str], concurrency: int, fetch) -> float:
+    """
+    Purpose: Fetch every URL with a fixed number of concurrent workers and return elapsed seconds
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    for url in urls:
+        queue.put_nowait(url)
+
+    async def worker():
+        while not queue.empty():
+            await fetch(queue.get_nowait())
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start
+
+
+async def benchmark_page_pool(page_count: int = 200, concurrency: int = 10) -> dict[str, float]:
+    """
+    Purpose: Compare pooled pages against opening and closing a new page for every URL
+    Input:
+        - page_count = number of URLs to load on each path
+        - concurrency = number of pages loading at once
+    Output:
+        - Dict with elapsed seconds for each path
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        names = write_static_site(directory, page_count)
+        server, base_url = start_static_server(directory)
+        urls = [f"{base_url}/{name}" for name in names]
+
+        handler = BrowserHandler(headless=True, stealth=True, pool_size=concurrency)
+        await handler.start()
+        try:
+            async def unpooled_fetch(url: str) -> str:
+                page = await handler.get_page()
+                try:
+                    await page.goto(url)
+                    return await page.content()
+                finally:
+                    await page.close()
+
+            async def pooled_fetch(url: str) -> str:
+                async with handler.page_pool.page() as page:
+                    await page.goto(url)
+                    return await page.content()
+
+            await handler.page_pool.warm()
+            timings = {
+                "unpooled": await _run_concurrently(urls, concurrency, unpooled_fetch),
+                "pooled": await _run_concurrently(urls, concurrency, pooled_fetch),
+            }
+        finally:
+            await handler.stop()
+            server.shutdown()
+
+    print(f"[BENCHMARK][PAGE POOL] {page_count} pages, {concurrency} concurrent")
+    for name, elapsed in timings.items():
+        print(f"                        {name}: {elapsed:.2f}s ({page_count / elapsed:.1f} pages/s)")
+    return timings
+
+
+def legacy_extract_links(content: str, source_url: str) -> dict[str, str]:
+    """
+    Purpose: Previous BeautifulSoup implementation of link extraction (full tree, one pass per link source),
+             kept as the baseline for benchmark_link_extraction
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, "lxml")
+    found_links: dict[str, str] = {}
+
+    def add(url: str, anchor_text: str = "") -> None:
+        normalized_url = normalize_url(url)
+        if normalized_url and normalized_url not in found_links:
+            found_links[normalized_url] = anchor_text
+
+    for tag in soup.find_all("a", href=True):
+        add(urljoin(source_url, unquote(tag["href"].strip())), tag.get_text(separator=" ").strip())
+
+    onclick_pattern = re.compile(r"location\.href\s*=\s*['\"](.*?)['\"]", re.IGNORECASE)
+    for el in soup.find_all(attrs={"onclick": True}):
+        match = onclick_pattern.search(el["onclick"])
+        if match:
+            add(urljoin(source_url, match.group(1).strip()))
+
+    for attr in ("data-url", "data-href"):
+        for el in soup.find_all(attrs={attr: True}):
+            add(urljoin(source_url, el[attr].strip()))
+
+    meta_refresh = soup.find("meta", attrs={"http-equiv": "refresh"})
+    if meta_refresh:
+        match = re.search(r"url=(.+)", meta_refresh.get("content", ""), re.IGNORECASE)
+        if match:
+            add(urljoin(source_url, match.group(1).strip()))
+
+    return found_links
+
+
+def benchmark_link_extraction(corpus_dir: str, rounds: int = 3) -> dict[str, dict[str, float]]:
+    """
+    Purpose: Compare throughput and peak Python memory of the single-pass extractor against the BeautifulSoup baseline
+    Input:
+        - corpus_dir = folder of saved homepages (*.html / *.htm)
+        - rounds = number of times the corpus is parsed by each implementation
+    Output:
+        - Dict with pages/s, MB/s and peak traced memory (MB) for each implementation
+    """
+    pages = []
+    for path in sorted(glob.glob(os.path.join(corpus_dir, "*.htm*"))):
+        with open(path, encoding="utf-8", errors="replace") as f:
+            pages.append(f.read())
+    if not pages:
+        print(f"[BENCHMARK][LINK EXTRACTION] No saved pages found in {corpus_dir}")
+        return {}
+    total_mb = sum(len(page) for page in pages) / 1e6
+    source_url = "https://example.com/"
+
+    stats = {}
+    for name, extractor in (("beautifulsoup", legacy_extract_links), ("single_pass", extract_links)):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for page in pages:
+                extractor(page, source_url)
+        elapsed = time.perf_counter() - start
+
+        # Peak memory is traced separately so tracing overhead does not skew the timings
+        tracemalloc.start()
+        for page in pages:
+            extractor(page, source_url)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        stats[name] = {
+            "pages_per_second": len(pages) * rounds / elapsed,
+            "mb_per_second": total_mb * rounds / elapsed,
+            "peak_memory_mb": peak / 1e6,
+        }
+
+    mismatches = sum(legacy_extract_links(page, source_url) != extract_links(page, source_url) for page in pages)
+
+    print(f"[BENCHMARK][LINK EXTRACTION] {len(pages)} pages ({total_mb:.1f} MB), {rounds} rounds, {mismatches} mismatched pages")
+    for name, result in stats.items():
+        print(f"                             {name}: {result['pages_per_second']:.1f} pages/s, "
+              f"{result['mb_per_second']:.1f} MB/s, peak {result['peak_memory_mb']:.1f} MB")
+    return stats
+
+
+async def main() -> None:
+    if len(sys.argv) > 1:
+        benchmark_link_extraction(sys.argv[1])
+    await benchmark_page_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
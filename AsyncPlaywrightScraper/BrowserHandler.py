@@ -1,38 +1,407 @@
 import asyncio
-from playwright.async_api import async_playwright
+import math
+import time
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager, nullcontext
+from urllib.parse import urlparse
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from HostScheduler import HostSlot
+from Metrics import Metrics, null_metrics
+from RequestBlocker import BlockingPolicy, RequestBlocker
+from StorageStateStore import StorageStateStore
+
+
+class LoadTimeTracker:
+    def __init__(self, default_timeout: int = 30000, min_timeout: int = 2000, margin: float = 1.5,
+                 min_samples: int = 5, window: int = 50):
+        """
+        Purpose: Learn per-domain readiness timeouts from observed page load times
+        Input:
+            - default_timeout = timeout (ms) used until a domain has enough samples, and the upper bound afterwards
+            - min_timeout = lower bound (ms) for learned timeouts
+            - margin = multiplier applied to the observed p95 load time
+            - min_samples = number of observed loads needed before a learned timeout is used
+            - window = number of most recent load times kept per domain
+        """
+        self.default_timeout = default_timeout
+        self.min_timeout = min_timeout
+        self.margin = margin
+        self.min_samples = min_samples
+        self.load_times: dict[str, deque] = defaultdict(lambda: deque(maxlen=window))
+
+    def record(self, domain: str, elapsed_ms: float) -> None:
+        self.load_times[domain].append(elapsed_ms)
+
+    def timeout_for(self, domain: str) -> int:
+        """
+        Purpose: Return p95 of the domain's recent load times plus margin, clamped to [min_timeout, default_timeout]
+        """
+        samples = self.load_times.get(domain)
+        if not samples or len(samples) < self.min_samples:
+            return self.default_timeout
+        ordered = sorted(samples)
+        p95 = ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)]
+        return int(max(self.min_timeout, min(self.default_timeout, p95 * self.margin)))
+
+
+class PagePool:
+    def __init__(self, context, size: int = 10, prepare_page=None, clear_storage: bool = True, DEBUG: bool = False):
+        """
+        Purpose: Keep a fixed number of warm pages open on a browser context and lend them out one at a time
+        Input:
+            - context = Playwright browser context pages are created on
+            - size = max number of pages kept open at once
+            - prepare_page = optional coroutine run once on each newly created page (ex. stealth scripts)
+            - clear_storage = clear localStorage when a page is returned (off when storage state is persisted)
+        """
+        self.context = context
+        self.size = size
+        self.prepare_page = prepare_page
+        self.clear_storage = clear_storage
+        self.DEBUG = DEBUG
+
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._pages: set = set()
+        self._creating = 0  # Pages being created; they hold a slot before new_page() returns
+        self._closed = False
+
+    async def _new_page(self):
+        """
+        Purpose: Create and prepare a new page, counting it against the pool size
+        """
+        # The slot is taken before awaiting, so concurrent callers cannot all pass the size check
+        self._creating += 1
+        try:
+            page = await self.context.new_page()
+        finally:
+            self._creating -= 1
+        self._pages.add(page)
+        if self.prepare_page:
+            try:
+                await self.prepare_page(page)
+            except Exception:
+                await self._discard(page)
+                raise
+        return page
+
+    async def _discard(self, page) -> None:
+        """
+        Purpose: Close a page and free its slot in the pool
+        """
+        self._pages.discard(page)
+        try:
+            await page.close()
+        except Exception:
+            pass
+
+    async def _reset(self, page) -> None:
+        """
+        Purpose: Clear page storage and navigate back to a blank document so the next user starts clean
+        """
+        if self.clear_storage:
+            await page.evaluate("() => { try { localStorage.clear(); sessionStorage.clear(); } catch (e) {} }")
+        else:
+            await page.evaluate("() => { try { sessionStorage.clear(); } catch (e) {} }")
+        await page.goto("about:blank")
+
+    async def warm(self, count: int = None) -> None:
+        """
+        Purpose: Open pages ahead of time so the first requests do not pay for page creation
+        """
+        count = min(count or self.size, self.size)
+        new_pages = await asyncio.gather(*(self._new_page() for _ in range(count - len(self._pages) - self._creating)))
+        for page in new_pages:
+            self._idle.put_nowait(page)
+
+    async def acquire(self):
+        """
+        Purpose: Return an idle page, create one if the pool has room, otherwise wait for one to be released
+        """
+        if self._closed:
+            raise RuntimeError("Page pool is closed.")
+        while not self._idle.empty():
+            page = self._idle.get_nowait()
+            if not page.is_closed():
+                return page
+            self._pages.discard(page)
+        if len(self._pages) + self._creating < self.size:
+            return await self._new_page()
+        page = await self._idle.get()
+        if page.is_closed():
+            self._pages.discard(page)
+            return await self._new_page()
+        return page
+
+    async def release(self, page) -> None:
+        """
+        Purpose: Reset a page and return it to the pool. Pages that fail to reset are closed and replaced later
+        """
+        if self._closed or page.is_closed():
+            await self._discard(page)
+            return
+        try:
+            await self._reset(page)
+        except Exception as e:
+            if self.DEBUG:
+                print(f"[DEBUG][BROWSER][POOL] Discarding page that failed to reset: {e}")
+            await self._discard(page)
+            return
+        self._idle.put_nowait(page)
+
+    @asynccontextmanager
+    async def page(self):
+        """
+        Purpose: Lend out a pooled page for the duration of an 'async with' block
+        """
+        page = await self.acquire()
+        try:
+            yield page
+        finally:
+            await self.release(page)
+
+    async def close(self) -> None:
+        """
+        Purpose: Close every page owned by the pool
+        """
+        self._closed = True
+        for page in list(self._pages):
+            await self._discard(page)
+        self._idle = asyncio.Queue()
+
 
 class BrowserHandler:
-    def __init__(self, headless: bool = True, stealth: bool = True, DEBUG: bool = False):
+    wait_strategies = ("domcontentloaded", "networkidle", "anchors_stable")
+
+    # Resolve once the number of links on the page has stopped changing for quietMs (or timeoutMs has passed)
+    anchors_stable_script = """([quietMs, timeoutMs]) => new Promise(resolve => {
+        let last = document.links.length;
+        let quietTimer = null;
+        const finish = () => {
+            observer.disconnect();
+            clearTimeout(quietTimer);
+            clearTimeout(deadline);
+            resolve(document.links.length);
+        };
+        const arm = () => {
+            clearTimeout(quietTimer);
+            quietTimer = setTimeout(finish, quietMs);
+        };
+        const observer = new MutationObserver(() => {
+            const count = document.links.length;
+            if (count !== last) {
+                last = count;
+                if (count > 0) arm();
+            }
+        });
+        observer.observe(document.documentElement, { childList: true, subtree: true, attributes: true, attributeFilter: ['href'] });
+        const deadline = setTimeout(finish, timeoutMs);
+        if (last > 0) arm();
+    })"""
+
+    def __init__(self, headless: bool = True, stealth: bool = True, pool_size: int = 10,
+                 fallback_pool_size: int = 2, wait_strategy: str = "anchors_stable", quiet_ms: int = 500,
+                 blocking_policy: BlockingPolicy = None, storage_state_dir: str = None, http_cache_dir: str = None,
+                 metrics: Metrics = None, DEBUG: bool = False):
+        if wait_strategy not in self.wait_strategies:
+            raise ValueError(f"Unknown wait strategy '{wait_strategy}', expected one of {self.wait_strategies}")
         self.playwright = None
         self.browser = None
         self.context = None
+        self.page_pool = None
+        self.pool_size = pool_size
         self.headless = headless
-        self.original_headless = headless
         self.stealth = stealth
+        self.wait_strategy = wait_strategy
+        self.quiet_ms = quiet_ms
+        self.load_times = LoadTimeTracker()
+        # Navigation, readiness wait and serialisation timings, fallbacks and blocked requests
+        self.metrics = metrics or null_metrics
         self.DEBUG = DEBUG
+        # Aborts images, media, trackers, etc. and counts what was blocked
+        self.request_blocker = RequestBlocker(blocking_policy, DEBUG=DEBUG)
+        # Cookies and localStorage (ex. accepted consent banners) saved per site and loaded into new contexts
+        self.storage_store = StorageStateStore(storage_state_dir, DEBUG=DEBUG) if storage_state_dir else None
+        # Registrable domain (ex. lenovo.com) this handler crawls; only its saved state is loaded (every site if None)
+        self.site: str | None = None
+        # Browser profile directory whose HTTP cache survives between runs (uses one persistent context)
+        self.http_cache_dir = http_cache_dir
+
+        # Headful browser launched only once a page fails in headless mode
+        self.fallback_browser = None
+        self.fallback_context = None
+        self.fallback_pool = None
+        self.fallback_pool_size = fallback_pool_size
+        self._fallback_lock = None
+
+        # Set on handlers created by new_isolated_handler(); they borrow the parent's browser
+        self.parent = None
+        # Optional semaphore shared by every handler on one browser to cap the total number of open tabs
+        self.tab_budget: asyncio.Semaphore | None = None
+
+    def new_isolated_handler(self, pool_size: int = None, site: str = None) -> "BrowserHandler":
+        """
+        Purpose: Create a handler with its own context and page pool on this handler's browser
+        Input:
+            - pool_size = number of pages the new handler may have open (defaults to this handler's pool size)
+            - site = registrable domain the new handler crawls; its context only gets that site's saved storage state
+                     (can also be set later, before start())
+        Output:
+            - BrowserHandler sharing the browser, fallback browser, learned load times, request blocker and tab budget
+        """
+        child = BrowserHandler(headless=self.headless, stealth=self.stealth, pool_size=pool_size or self.pool_size,
+                               fallback_pool_size=self.fallback_pool_size, wait_strategy=self.wait_strategy,
+                               quiet_ms=self.quiet_ms, DEBUG=self.DEBUG)
+        child.parent = self
+        child.load_times = self.load_times
+        child.metrics = self.metrics
+        child.request_blocker = self.request_blocker
+        child.storage_store = self.storage_store
+        child.site = site
+        child.http_cache_dir = self.http_cache_dir
+        child.tab_budget = self.tab_budget
+        return child
 
     async def start(self) -> None:
         """
-        Purpose: Open a browser with stealth and block heavy resources
+        Purpose: Open a browser with stealth and block heavy resources (on the persistent profile if http_cache_dir is set)
         """
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(headless=self.headless)
-        self.context = await self.browser.new_context()
+        if self.parent:
+            if not self.parent.context:
+                raise RuntimeError("Parent browser not started.")
+            if self.http_cache_dir:
+                # A persistent profile has a single context; share it (and its HTTP cache) with a separate page pool
+                self.context = self.parent.context
+                self.page_pool = self._new_page_pool(self.context, self.pool_size, persistent=True)
+                return
+            # Isolated handler: only a new context on the parent's already running browser
+            self.context, self.page_pool = await self._new_context(self.parent.browser, self.pool_size)
+            return
 
-        # Block heavy resources like images, stylesheets, fonts
-        await self.context.route("**/*", self._block_heavy_resources)
+        self.playwright = await async_playwright().start()
+        if self.http_cache_dir:
+            self.context, self.page_pool = await self._new_persistent_context()
+            self.browser = self.context.browser
+        else:
+            self.browser = await self.playwright.chromium.launch(headless=self.headless)
+            self.context, self.page_pool = await self._new_context(self.browser, self.pool_size)
+        self._fallback_lock = asyncio.Lock()
 
     async def stop(self) -> None:
         """
-        Purpose: Close browser and clean up resources
+        Purpose: Close browser (and fallback browser, if launched) and clean up resources
         """
-        if self.context:
-            await self.context.close()
-        if self.browser:
-            await self.browser.close()
+        if self.parent:
+            # Isolated handler: close only its own context, the parent keeps the browser running
+            if self.page_pool:
+                await self.page_pool.close()
+            if self.context and self.context is not self.parent.context:
+                await self._save_storage_state(self.context)
+                await self.context.close()
+            self.page_pool = self.context = None
+            return
+
+        for pool in (self.page_pool, self.fallback_pool):
+            if pool:
+                await pool.close()
+        for context in (self.context, self.fallback_context):
+            if context:
+                await self._save_storage_state(context)
+                await context.close()
+        for browser in (self.browser, self.fallback_browser):
+            if browser:
+                await browser.close()
         if self.playwright:
             await self.playwright.stop()
 
+        self.page_pool = self.context = self.browser = self.playwright = None
+        self.fallback_pool = self.fallback_context = self.fallback_browser = None
+
+    async def _new_context(self, browser, pool_size: int) -> tuple:
+        """
+        Purpose: Create a context that blocks heavy resources and starts with the saved storage state, along with a
+                 PagePool on it
+        Output:
+            - Tuple containing the context and its page pool
+        """
+        context = await browser.new_context(storage_state=self._load_storage_state())
+
+        # Block heavy resources like images, stylesheets, fonts and trackers
+        await self.request_blocker.install(context)
+
+        return context, self._new_page_pool(context, pool_size)
+
+    async def _new_persistent_context(self) -> tuple:
+        """
+        Purpose: Launch the browser on the on-disk profile in http_cache_dir, along with a PagePool on its context
+        Note: Routing disables the HTTP cache, so requests are blocked per page by URL wildcard instead
+              (RequestBlocker.install_on_page). The profile keeps cookies and localStorage itself
+        Output:
+            - Tuple containing the context and its page pool
+        """
+        context = await self.playwright.chromium.launch_persistent_context(self.http_cache_dir, headless=self.headless)
+        if storage_state := self._load_storage_state():
+            await context.add_cookies(storage_state["cookies"])
+        # The profile opens with a blank page that is not part of the pool
+        for page in context.pages:
+            await page.close()
+        return context, self._new_page_pool(context, self.pool_size, persistent=True)
+
+    def _new_page_pool(self, context, pool_size: int, persistent: bool = False) -> PagePool:
+        """
+        Purpose: Create a pool of warm pages with stealth (and per-page blocking on a persistent profile) already
+                 applied, reused across get_page_content calls
+        """
+        if persistent:
+            prepare_page = self._prepare_cached_page
+        else:
+            prepare_page = self._apply_stealth if self.stealth else None
+        keep_storage = bool(self.storage_store or self.http_cache_dir)
+        return PagePool(context, size=pool_size, prepare_page=prepare_page, clear_storage=not keep_storage,
+                        DEBUG=self.DEBUG)
+
+    async def _prepare_cached_page(self, page) -> None:
+        """
+        Purpose: Set up a page of the persistent profile: URL-wildcard blocking (keeps the HTTP cache) and stealth
+        """
+        await self.request_blocker.install_on_page(page)
+        if self.stealth:
+            await self._apply_stealth(page)
+
+    def _load_storage_state(self) -> dict | None:
+        """
+        Purpose: Load the saved storage state of this handler's site (of every saved site if no site is set)
+        """
+        if not self.storage_store:
+            return None
+        return self.storage_store.load(sites=[self.site] if self.site else None)
+
+    async def _save_storage_state(self, context) -> None:
+        """
+        Purpose: Save a context's cookies and localStorage per site, if storage state is persisted
+        """
+        if not self.storage_store:
+            return
+        try:
+            self.storage_store.save(await context.storage_state())
+        except Exception as e:
+            if self.DEBUG:
+                print(f"[DEBUG][BROWSER][ERROR] Failed to save storage state: {e}")
+
+    async def _get_fallback_pool(self) -> PagePool:
+        """
+        Purpose: Return the page pool of the headful fallback browser, launching it on first use
+        """
+        if self.parent:
+            return await self.parent._get_fallback_pool()
+        async with self._fallback_lock:
+            if not self.fallback_pool:
+                if self.DEBUG:
+                    print(f"[DEBUG][BROWSER] Launching headful fallback browser")
+                self.fallback_browser = await self.playwright.chromium.launch(headless=False)
+                self.fallback_context, self.fallback_pool = await self._new_context(self.fallback_browser,
+                                                                                    self.fallback_pool_size)
+        return self.fallback_pool
+
     async def get_page(self):
         """
         Purpose: Return new browser page with optional stealth
@@ -44,61 +413,85 @@ class BrowserHandler:
             await self._apply_stealth(page)
         return page
 
-    async def get_page_content(self, url: str, timeout: int = 30000, allow_retry: bool = True) -> str | None:
+    async def get_page_content(self, url: str, timeout: int = 30000, allow_retry: bool = True,
+                               slot: HostSlot = None) -> str | None:
         """
-        Purpose: Open link and return full HTML content. Retry in non-headless mode if needed.
+        Purpose: Open link in a pooled page and return full HTML content.
+                 Retry in the headful fallback browser if needed, leaving the main browser untouched.
+        Input:
+            - slot = HostSlot from the HostScheduler to record the response status (or a timeout) on
         """
-        page = await self.get_page()
-        try:
-            await page.goto(url, timeout=timeout)
+        if not self.page_pool:
+            raise RuntimeError("Browser context not started.")
 
-            try:
-                await page.wait_for_selector("a[href]", timeout=timeout)
-            except Exception:
-                await asyncio.sleep(5)
+        content = await self._load_content(self.page_pool, url, timeout, slot)
 
-            content = await page.content()
+        # Retry logic: only retry once, in the non-headless fallback browser (never when the host is throttling us)
+        if content is None and self.headless and allow_retry and not (slot and slot.throttled):
+            if self.DEBUG:
+                print(f"[DEBUG][BROWSER] Retrying with headless=False: {url}")
+            self.metrics.count("headful_fallbacks", url=url)
+            fallback_pool = await self._get_fallback_pool()
+            content = await self._load_content(fallback_pool, url, timeout, slot)
 
-            # Retry if content is empty or suspiciously short
-            if not content.strip() or "<a" not in content:
-                raise ValueError("Empty or non-functional page content")
+        return content
 
-            return content
+    async def _load_content(self, pool: PagePool, url: str, timeout: int, slot: HostSlot = None) -> str | None:
+        """
+        Purpose: Load a URL in a page borrowed from the given pool and return its HTML, or None on failure
+        """
+        async with self.tab_budget or nullcontext(), pool.page() as page:
+            try:
+                domain = urlparse(url).netloc.lower()
+                start = time.perf_counter()
+                with self.metrics.timer("navigate", url):
+                    response = await page.goto(url, timeout=timeout, wait_until="domcontentloaded")
+                if slot and response:
+                    slot.record_status(response.status, response.headers.get("retry-after"))
+                with self.metrics.timer("wait", url):
+                    await self._wait_until_ready(page, min(timeout, self.load_times.timeout_for(domain)))
+                self.load_times.record(domain, (time.perf_counter() - start) * 1000)
 
-        except Exception as e:
-            if self.DEBUG:
-                print(f"[DEBUG][BROWSER][ERROR] get_page_content failed (headless={self.headless}): {e}")
+                with self.metrics.timer("serialize", url):
+                    content = await page.content()
 
-            # Retry logic: only retry once, in non-headless mode
-            if self.headless and allow_retry:
-                if self.DEBUG:
-                    print(f"[DEBUG][BROWSER] Retrying with headless=False")
-                await self.stop()
-                self.headless = False
-                await self.start()
-                return await self.get_page_content(url, timeout=timeout, allow_retry=False)
+                # Retry if content is empty or suspiciously short
+                if not content.strip() or "<a" not in content:
+                    raise ValueError("Empty or non-functional page content")
 
-            return None
+                return content
 
-        finally:
-            await page.close()
+            except Exception as e:
+                if slot and isinstance(e, PlaywrightTimeoutError):
+                    slot.record_timeout()
+                if self.DEBUG:
+                    browser_name = "fallback" if pool is self.fallback_pool else "main"
+                    print(f"[DEBUG][BROWSER][ERROR] get_page_content failed ({browser_name} browser): {e}")
+                return None
 
-    async def reset_headless(self):
-        if self.headless != self.original_headless:
-            if self.DEBUG:
-                print(f"[DEBUG][BROWSER] Resetting headless from {self.headless} to {self.original_headless}")
-            await self.stop()
-            self.headless = self.original_headless
-            await self.start()
+            finally:
+                blocked = self.request_blocker.take_page_stats(page)
+                if blocked.requests:
+                    self.metrics.count("blocked_requests", blocked.requests, url)
+                    self.metrics.count("blocked_bytes_estimate", blocked.estimated_bytes, url)
+                if self.DEBUG and blocked.requests:
+                    print(f"[DEBUG][BROWSER] Blocked {blocked.requests} requests (~{blocked.estimated_bytes // 1024} KB saved): {url}")
 
-    async def _block_heavy_resources(self, route, request):
+    async def _wait_until_ready(self, page, timeout: int) -> None:
         """
-        Purpose: Block unnecessary resources like images and fonts
+        Purpose: Wait for the page to be ready according to the configured wait strategy.
+                 Running out of time is not an error; whatever has loaded by then is used.
         """
-        if request.resource_type in ["image", "stylesheet", "font"]:
-            await route.abort()
-        else:
-            await route.continue_()
+        if self.wait_strategy == "domcontentloaded":
+            return
+        try:
+            if self.wait_strategy == "networkidle":
+                await page.wait_for_load_state("networkidle", timeout=timeout)
+            else:
+                await page.evaluate(self.anchors_stable_script, [self.quiet_ms, timeout])
+        except Exception as e:
+            if self.DEBUG:
+                print(f"[DEBUG][BROWSER] Page not ready after {timeout}ms ({self.wait_strategy}): {e}")
 
     async def _apply_stealth(self, page):
         """
@@ -0,0 +1,359 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import sys
+from hashlib import blake2b
+from HomepageScraper import CrawlResult
+from HostScheduler import HostScheduler
+from LinkExtractor import normalize_url
+from ScraperHandler import ScraperHandler
+from SharedFrontier import WorkItem, create_frontier
+
+
+class CrawlWorker:
+    def __init__(self, mode: str = "companies", frontier_backend: str = "sqlite", frontier_options: dict = None,
+                 worker_id: str | None = None, concurrency: int = 2, handler_options: dict = None, site: dict = None,
+                 workers: int = 1, poll_interval: float = 1.0, DEBUG: bool = False):
+        """
+        Purpose: One crawl worker process. Claims items from the shared frontier, crawls them with its own browser
+                 and writes the outcome back, until the frontier has no pending or leased work left
+        Input:
+            - mode = "companies" (an item is a whole company crawl) or "pages" (an item is one page of a site)
+            - frontier_backend / frontier_options = Arguments for create_frontier (each worker opens its own connection)
+            - worker_id = Lease owner name (default: <host>:<pid>)
+            - concurrency = Items crawled at once (companies, or pages/tabs in pages mode)
+            - handler_options = Keyword arguments for this worker's ScraperHandler (ex. headless, max_depth)
+            - site = {"homepage", "search_terms", "max_depth", "scope"} of the site crawled in pages mode
+            - workers = Number of workers sharing the frontier; in pages mode per-host limits are divided by it
+            - poll_interval = Seconds between claims while other workers still hold work
+        """
+        self.mode = mode
+        self.frontier_backend = frontier_backend
+        self.frontier_options = frontier_options or {}
+        self.worker_id = worker_id
+        self.concurrency = concurrency
+        self.handler_options = handler_options or {}
+        self.site = site or {}
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.DEBUG = DEBUG
+
+        self.frontier = None
+        self.handler: ScraperHandler | None = None
+        self.active: dict[str, asyncio.Task] = {}
+        self.completed = 0
+
+    async def run(self) -> int:
+        """
+        Purpose: Start the browser, claim and crawl items until the frontier is drained, then close everything
+        Output:
+            - Number of items this worker completed
+        """
+        self.worker_id = self.worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.frontier = create_frontier(self.frontier_backend, **self.frontier_options)
+        self.handler = ScraperHandler(**self.handler_options, DEBUG = self.DEBUG)
+        if self.mode == "pages":
+            await self._start_site()
+        else:
+            await self.handler.start()
+
+        heartbeat = asyncio.create_task(self._renew_leases())
+        try:
+            while True:
+                free_slots = self.concurrency - len(self.active)
+                # Frontier calls block (SQLite locks, Redis round trips), so they run off the event loop
+                claimed = await asyncio.to_thread(self.frontier.claim, self.worker_id, free_slots) if free_slots else []
+                for item in claimed:
+                    self.active[item.key] = asyncio.create_task(self._process(item))
+
+                if not self.active:
+                    # Idle: stop once no other worker holds work that could still add items or be recovered
+                    counts = await asyncio.to_thread(self.frontier.counts)
+                    if not counts["pending"] and not counts["leased"]:
+                        break
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+
+                done, _ = await asyncio.wait(self.active.values(), timeout = self.poll_interval,
+                                             return_when = asyncio.FIRST_COMPLETED)
+                for key in [key for key, task in self.active.items() if task in done]:
+                    del self.active[key]
+        finally:
+            heartbeat.cancel()
+            for task in self.active.values():
+                task.cancel()
+            await asyncio.gather(heartbeat, *self.active.values(), return_exceptions = True)
+            if self.mode == "pages":
+                await self.handler.homepage_scraper.stop()
+            else:
+                await self.handler.stop()
+            self.frontier.close()
+
+        if self.DEBUG:
+            print(f"[DEBUG][CLUSTER][{self.worker_id}] Finished {self.completed} items")
+        return self.completed
+
+    async def _start_site(self) -> None:
+        """
+        Purpose: Prepare the worker's HomepageScraper for crawling pages of one site
+        """
+        scraper = self.handler.homepage_scraper
+        scraper.company_homepage = self.site["homepage"]
+        scraper.max_depth = self.site["max_depth"]
+        scraper.update_search_terms(self.site["search_terms"])
+        # Every worker fetches from the same host, so each gets its share of the per-host limits
+        share = max(self.workers, 1)
+        scraper.host_scheduler = HostScheduler(initial_per_host = max(1, 4 // share), max_per_host = max(1, 8 // share),
+                                               initial_rate = 4.0 / share, max_rate = 16.0 / share,
+                                               burst = max(1.0, 4.0 / share), DEBUG = self.DEBUG)
+        await scraper.start()
+
+    async def _renew_leases(self) -> None:
+        """
+        Purpose: Heartbeat renewing the leases of the items being crawled, every third of the lease time
+        """
+        while True:
+            await asyncio.sleep(self.frontier.lease_seconds / 3)
+            if self.active:
+                renewed = await asyncio.to_thread(self.frontier.renew, self.worker_id, list(self.active))
+                if self.DEBUG and renewed < len(self.active):
+                    print(f"[DEBUG][CLUSTER][{self.worker_id}] Lost {len(self.active) - renewed} leases")
+
+    async def _process(self, item: WorkItem) -> None:
+        """
+        Purpose: Crawl one claimed item and complete it; on error it is released for another attempt
+        """
+        try:
+            if self.mode == "pages":
+                outcome, new_items, results = await self._crawl_page(item)
+            else:
+                outcome, new_items, results = await self._crawl_company(item)
+        except Exception as e:
+            if self.DEBUG:
+                print(f"[DEBUG][CLUSTER][{self.worker_id}][ERROR] {item.key} failed (attempt {item.attempts}): {e}")
+            self._forget_seen_links()
+            await asyncio.to_thread(self.frontier.release, self.worker_id, item.key)
+            return
+
+        if await asyncio.to_thread(self.frontier.complete, self.worker_id, item.key, outcome, new_items, results):
+            self.completed += 1
+            return
+        self._forget_seen_links()
+        if self.DEBUG:
+            print(f"[DEBUG][CLUSTER][{self.worker_id}] Lease on {item.key} expired, result dropped")
+
+    def _forget_seen_links(self) -> None:
+        """
+        Purpose: In pages mode, drop this worker's local link dedup after an item was not completed. Its links were
+                 marked seen here but never reached the frontier, so the retried page (on any worker, often this one)
+                 must return them again instead of being skipped as already seen
+        Note: The frontier stays the dedup store shared by all workers; links returned twice are ignored by it
+        """
+        if self.mode == "pages":
+            self.handler.homepage_scraper.reset_link_stores()
+
+    async def _crawl_company(self, item: WorkItem) -> tuple[dict | None, list, list]:
+        company = item.payload["company"]
+        crawled = await self.handler.crawl_company(company, item.payload["search_terms"], item.payload["max_tabs"])
+        if not crawled:
+            return None, [], []
+        homepage, results = crawled
+        return {"homepage": homepage}, [], [(f"{item.key}\t{result.url}", result_payload(result)) for result in results]
+
+    async def _crawl_page(self, item: WorkItem) -> tuple[dict | None, list, list]:
+        depth = item.payload["depth"]
+        crawled = await self.handler.homepage_scraper._crawl_page(item.payload["url"], depth)
+        if not crawled:
+            return None, [], []
+        relevant_links, results = crawled
+        # The frontier drops links another worker already queued; this worker's own stores only save lookups
+        scope = self.site["scope"]
+        new_items = ([page_item(scope, link, depth + 1) for link in relevant_links]
+                     if depth + 1 <= self.site["max_depth"] else [])
+        return {"results": len(results)}, new_items, [(f"{scope}\t{result.url}", result_payload(result)) for result in results]
+
+
+def run_scope(*parts) -> str:
+    """
+    Purpose: Short hash of a run's settings (ex. search terms). Work item and result keys start with it, so runs with
+             other settings sharing a frontier never reuse each other's items or results
+    """
+    return blake2b(json.dumps(parts, separators=(",", ":")).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def page_item(scope: str, url: str, depth: int) -> tuple[str, dict]:
+    return f"page:{scope}:{url}", {"url": url, "depth": depth}
+
+
+def result_payload(result: CrawlResult) -> dict:
+    return {"url": result.url, "text": result.text, "matched_terms": result.matched_terms}
+
+
+def run_worker(options: dict) -> None:
+    """
+    Purpose: Process entry point of a CrawlWorker (top-level so it can be started with the spawn method)
+    """
+    asyncio.run(CrawlWorker(**options).run())
+
+
+class CrawlCoordinator:
+    def __init__(self, workers: int | None = None, frontier_backend: str = "sqlite", frontier_options: dict = None,
+                 worker_concurrency: int = 2, handler_options: dict = None, max_restarts: int = 3,
+                 poll_interval: float = 1.0, DEBUG: bool = False):
+        """
+        Purpose: Crawl with N worker processes (each with its own event loop and browser) sharing one frontier, so
+                 throughput grows with the number of cores instead of being capped by one event loop and one browser
+        Input:
+            - workers = Number of worker processes (default: one per CPU core)
+            - frontier_backend = "sqlite" (WAL file on this machine) or "redis" (Redis-compatible server)
+            - frontier_options = Arguments for the frontier (default: path "frontier.sqlite" for sqlite)
+            - worker_concurrency = Companies (or pages in crawl_site) each worker crawls at once
+            - handler_options = Keyword arguments for each worker's ScraperHandler (must be picklable)
+            - max_restarts = Worker processes restarted after crashing, across the whole run
+            - poll_interval = Seconds between checks on the workers
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.frontier_backend = frontier_backend
+        self.frontier_options = frontier_options or ({"path": "frontier.sqlite"} if frontier_backend == "sqlite" else {})
+        self.worker_concurrency = worker_concurrency
+        self.handler_options = handler_options or {}
+        self.max_restarts = max_restarts
+        self.poll_interval = poll_interval
+        self.DEBUG = DEBUG
+
+        self.frontier = create_frontier(frontier_backend, **self.frontier_options)
+
+    async def crawl_companies(self, companies: list[str], search_terms: list[str], per_company_tabs: int = 5,
+                              resume: bool = False) -> dict[str, tuple[str, list[CrawlResult]] | None]:
+        """
+        Purpose: Crawl many companies, one company per work item
+        Inputs:
+            - companies = Company names
+            - search_terms = Terms to search every company for
+            - per_company_tabs = Max number of tabs for a single company
+            - resume = Continue an interrupted run with the same search terms: companies it finished are not crawled
+                       again. Otherwise (default) the frontier is cleared and every company is crawled
+        Output:
+            - Dict of company name to (homepage, results), or None when no homepage was found or every attempt failed
+        """
+        prefix = f"company:{run_scope(sorted(search_terms))}:"
+        await self._prepare_frontier(prefix, resume)
+        keys = {company: prefix + company for company in companies}
+        await asyncio.to_thread(self.frontier.add, [(keys[company], {"company": company, "search_terms": search_terms,
+                                                                     "max_tabs": per_company_tabs}) for company in companies])
+        await self._run_workers("companies")
+
+        outcomes = await asyncio.to_thread(self.frontier.outcomes)
+        wanted = set(keys.values())
+        results: dict[str, list[CrawlResult]] = {}
+        for _, work_key, payload in await asyncio.to_thread(self.frontier.results):
+            if work_key in wanted:
+                results.setdefault(work_key, []).append(CrawlResult(payload["url"], payload["text"], payload["matched_terms"]))
+        crawled = {}
+        for company, key in keys.items():
+            outcome = outcomes.get(key)
+            crawled[company] = (outcome["homepage"], results.get(key, [])) if outcome else None
+        return crawled
+
+    async def crawl_site(self, homepage: str, search_terms: list[str], max_depth: int = 3,
+                         resume: bool = False) -> list[CrawlResult]:
+        """
+        Purpose: Crawl one large site with every worker, one page per work item; the frontier is the shared queue
+                 and dedup store
+        Inputs:
+            - homepage = URL the crawl starts from
+            - search_terms = Terms to find results with
+            - max_depth = Maximum link depth to crawl
+            - resume = Continue an interrupted crawl of the same site, terms and depth instead of clearing the frontier
+        Output:
+            - Results found by all workers for this site
+        """
+        start_url = normalize_url(homepage) or homepage
+        scope = run_scope(start_url, sorted(search_terms), max_depth)
+        await self._prepare_frontier(f"page:{scope}:", resume)
+        await asyncio.to_thread(self.frontier.add, [page_item(scope, start_url, 0)])
+        await self._run_workers("pages", {"homepage": homepage, "search_terms": search_terms, "max_depth": max_depth,
+                                          "scope": scope})
+        return [CrawlResult(payload["url"], payload["text"], payload["matched_terms"])
+                for key, _, payload in await asyncio.to_thread(self.frontier.results) if key.startswith(f"{scope}\t")]
+
+    async def _prepare_frontier(self, prefix: str, resume: bool) -> None:
+        """
+        Purpose: Clear the frontier for a new run. A resumed run keeps it, unless it holds unfinished work of a run
+                 with other settings (its workers would be handed items they cannot crawl)
+        Input:
+            - prefix = Key prefix of this run's work items
+            - resume = Continue an interrupted run with the same settings
+        """
+        if resume and all(key.startswith(prefix) for key in await asyncio.to_thread(self.frontier.unfinished)):
+            return
+        if resume and self.DEBUG:
+            print(f"[DEBUG][CLUSTER] Frontier holds unfinished work of another run, clearing it")
+        await asyncio.to_thread(self.frontier.clear)
+
+    async def _run_workers(self, mode: str, site: dict = None) -> None:
+        """
+        Purpose: Start the worker processes, restart crashed ones while work is left, and wait for all of them
+        Effect: A crashed worker's leases expire and its items are claimed again by the other workers
+        """
+        counts = await asyncio.to_thread(self.frontier.counts)
+        if not counts["pending"] and not counts["leased"]:
+            return  # Everything was finished by an earlier run
+        context = multiprocessing.get_context("spawn")  # Forking a process with a running event loop is unsafe
+        processes: dict[int, multiprocessing.Process] = {}
+        restarts = 0
+
+        def launch(index: int) -> None:
+            options = {"mode": mode, "frontier_backend": self.frontier_backend, "frontier_options": self.frontier_options,
+                       "concurrency": self.worker_concurrency, "handler_options": self.handler_options, "site": site,
+                       "workers": self.workers, "poll_interval": self.poll_interval, "DEBUG": self.DEBUG}
+            process = context.Process(target=run_worker, args=(options,), name=f"crawl-worker-{index}", daemon=True)
+            process.start()
+            processes[index] = process
+
+        for index in range(self.workers):
+            launch(index)
+        try:
+            while processes:
+                await asyncio.sleep(self.poll_interval)
+                for index, process in list(processes.items()):
+                    if process.is_alive():
+                        continue
+                    del processes[index]
+                    if process.exitcode == 0:
+                        continue
+                    counts = await asyncio.to_thread(self.frontier.counts)
+                    if self.DEBUG:
+                        print(f"[DEBUG][CLUSTER][ERROR] Worker {index} exited with code {process.exitcode}")
+                    if restarts < self.max_restarts and (counts["pending"] or counts["leased"]):
+                        restarts += 1
+                        launch(index)
+                if self.DEBUG:
+                    print(f"[DEBUG][CLUSTER] {len(processes)} workers, frontier: {await asyncio.to_thread(self.frontier.counts)}")
+        finally:
+            for process in processes.values():
+                process.terminate()
+            for process in processes.values():
+                process.join()
+
+    def close(self) -> None:
+        self.frontier.close()
+
+
+async def main() -> None:
+    # python CrawlCluster.py worker <redis url>  joins a coordinator's Redis frontier from another machine
+    if len(sys.argv) > 2 and sys.argv[1] == "worker":
+        await CrawlWorker(frontier_backend = "redis", frontier_options = {"url": sys.argv[2]}, DEBUG = True).run()
+        return
+
+    coordinator = CrawlCoordinator(workers = 4, DEBUG = True)
+    crawled = await coordinator.crawl_companies(["air liquide", "united aluminum"], ["second quarter", "tolling"])
+    for company, crawl in crawled.items():
+        print(f"{company}: {crawl[0] + f' ({len(crawl[1])} results)' if crawl else 'no homepage'}")
+    coordinator.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
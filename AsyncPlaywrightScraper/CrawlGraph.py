@@ -0,0 +1,116 @@
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+from hashlib import blake2b
+
+
+def content_hash(content: str) -> str:
+    """
+    Purpose: Hash page content for change detection between crawls
+    """
+    return blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+
+def graph_signature(*parts) -> str:
+    """
+    Purpose: Identify the settings a crawl classified links with (whitelist/blacklist, search terms, matching options)
+    Input:
+        - parts = JSON-serializable values that decide which links are relevant and which are results
+    Output:
+        - Short hash; pages and results stored under one signature are never reused by a crawl with another
+    """
+    return blake2b(json.dumps(parts, separators=(",", ":")).encode("utf-8"), digest_size=8).hexdigest()
+
+
+@dataclass
+class PageRecord:
+    url: str
+    depth: int
+    content_hash: str
+    last_fetched: float
+    links: list[str]
+
+
+class CrawlGraph:
+    def __init__(self, path: str = "crawl_graph.sqlite"):
+        """
+        Purpose: Persistent crawl graph for incremental re-crawls. Stores every crawled hub page (URL, depth, content
+                 hash, last fetch time and the relevant links found on it) and every result URL already emitted.
+                 Pages and results are kept per signature (see graph_signature), so a crawl with other search terms
+                 or keywords sharing the graph fetches and classifies pages again instead of getting no results
+        Input:
+            - path = SQLite database file (":memory:" for a throwaway graph)
+        """
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(pages)")]
+        if columns and "signature" not in columns:
+            # Graph written before pages were kept per signature; it is only a cache, so it is rebuilt
+            self.connection.executescript("DROP TABLE pages; DROP TABLE IF EXISTS results;")
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT NOT NULL,
+                signature TEXT NOT NULL,
+                depth INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                last_fetched REAL NOT NULL,
+                links TEXT NOT NULL,
+                PRIMARY KEY (url, signature)
+            );
+            CREATE TABLE IF NOT EXISTS results (
+                url TEXT NOT NULL,
+                signature TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                PRIMARY KEY (url, signature)
+            );
+        """)
+        self.connection.commit()
+
+    def get_page(self, url: str, signature: str = "") -> PageRecord | None:
+        row = self.connection.execute(
+            "SELECT url, depth, content_hash, last_fetched, links FROM pages WHERE url = ? AND signature = ?",
+            (url, signature),
+        ).fetchone()
+        if row is None:
+            return None
+        return PageRecord(row[0], row[1], row[2], row[3], json.loads(row[4]))
+
+    def record_page(self, url: str, depth: int, page_hash: str, links: list[str], signature: str = "") -> None:
+        """
+        Purpose: Store (or replace) a fetched page and the relevant links found on it
+        """
+        self.connection.execute(
+            "INSERT OR REPLACE INTO pages (url, signature, depth, content_hash, last_fetched, links) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (url, signature, depth, page_hash, time.time(), json.dumps(links)),
+        )
+        self.connection.commit()
+
+    def touch_page(self, url: str, signature: str = "") -> None:
+        """
+        Purpose: Reset a page's revisit clock after a fetch that found it unchanged
+        """
+        self.connection.execute("UPDATE pages SET last_fetched = ? WHERE url = ? AND signature = ?",
+                                (time.time(), url, signature))
+        self.connection.commit()
+
+    def new_results(self, urls: list[str], signature: str = "") -> set[str]:
+        """
+        Purpose: Record result URLs and return the ones that were not emitted by an earlier crawl with the same signature
+        """
+        if not urls:
+            return set()
+        placeholders = ",".join("?" * len(urls))
+        emitted = {row[0] for row in self.connection.execute(
+            f"SELECT url FROM results WHERE signature = ? AND url IN ({placeholders})", (signature, *urls))}
+        new_urls = set(urls) - emitted
+        now = time.time()
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO results (url, signature, first_seen) VALUES (?, ?, ?)",
+            [(url, signature, now) for url in new_urls]
+        )
+        self.connection.commit()
+        return new_urls
+
+    def close(self) -> None:
+        self.connection.close()
@@ -0,0 +1,236 @@
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from urllib.parse import urlparse
+
+
+@dataclass
+class JournalState:
+    frontier: dict[str, int] = field(default_factory=dict)              # Queued URL -> depth, not fetched yet
+    seen: set[str] = field(default_factory=set)                         # Every URL queued or returned as a result
+    results: dict[str, tuple[str, list[str]]] = field(default_factory=dict)  # Result URL -> (text, matched terms)
+    sitemaps_done: bool = False
+    complete: bool = False
+    completed_at: float = 0.0
+
+
+class CrawlJournal:
+    def __init__(self, path: str, flush_every: int = 100, flush_interval: float = 2.0, compact_every: int = 2000,
+                 DEBUG: bool = False):
+        """
+        Purpose: Append-only journal of one homepage crawl (queued links, fetched pages, results) so an interrupted
+                 crawl can be rebuilt and resumed. Events are JSON lines written in batches; the log is periodically
+                 compacted into a snapshot of the whole state
+        Input:
+            - path = Journal file prefix; the log is <path>.jsonl and the snapshot <path>.snapshot.json
+            - flush_every = Events buffered before they are written
+            - flush_interval = Seconds after which buffered events are written at the next event
+            - compact_every = Events written before the log is folded into the snapshot
+        """
+        self.log_path = path + ".jsonl"
+        self.snapshot_path = path + ".snapshot.json"
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.compact_every = compact_every
+        self.DEBUG = DEBUG
+
+        self.state = JournalState()
+        self.signature = ""           # Settings signature of the crawl that wrote the journal
+        self.sequence = 0             # Number of the last event; the snapshot stores the last one it includes
+        self.events_since_compact = 0
+        self.buffer: list[str] = []
+        self.last_flush = time.monotonic()
+        self.file = None
+
+    @classmethod
+    def for_site(cls, directory: str, homepage: str, **kwargs) -> "CrawlJournal":
+        """
+        Purpose: Create the journal for a homepage crawl inside a journal folder (one pair of files per homepage)
+        """
+        os.makedirs(directory, exist_ok=True)
+        parsed = urlparse(homepage)
+        name = re.sub(r"[^a-z0-9.-]", "_", (parsed.netloc + parsed.path).lower().rstrip("/"))
+        return cls(os.path.join(directory, name), **kwargs)
+
+    def open(self, signature: str) -> JournalState:
+        """
+        Purpose: Replay the snapshot and the log on disk and open the log for appending
+        Input:
+            - signature = Settings signature of the new crawl (ex. HomepageScraper._journal_signature()); a journal
+                          written by a crawl with other settings is discarded
+        Output:
+            - State rebuilt from the journal (empty if there was none)
+        """
+        self._replay()
+        if self.signature != signature and (self.state.seen or self.state.complete):
+            if self.DEBUG:
+                print(f"[DEBUG][JOURNAL] Crawl settings changed, discarding {self.log_path}")
+            self.discard()
+
+        self.signature = signature
+        self.file = open(self.log_path, "a", encoding="utf-8")
+        if self.events_since_compact:
+            self.compact()  # Start from a snapshot so a crash loop never re-reads a long log
+        return self.state
+
+    def _replay(self) -> None:
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as file:
+                snapshot = json.load(file)
+            self.sequence = snapshot["sequence"]
+            self.signature = snapshot["signature"]
+            self.state = JournalState(frontier=dict(snapshot["frontier"]), seen=set(snapshot["seen"]),
+                                      results={url: (text, terms) for url, text, terms in snapshot["results"]},
+                                      sitemaps_done=snapshot["sitemaps_done"], complete=snapshot["complete"],
+                                      completed_at=snapshot["completed_at"])
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            # The log only holds events after the snapshot, so it is useless without it
+            if self.DEBUG:
+                print(f"[DEBUG][JOURNAL][ERROR] Unreadable snapshot {self.snapshot_path}, starting over: {e}")
+            self.discard()
+            return
+
+        try:
+            log = open(self.log_path, "rb")
+        except OSError:
+            return
+        valid_bytes = 0
+        with log:
+            for line in log:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    break  # Torn last line from a crash; everything after it is dropped
+                valid_bytes += len(line)
+                if event["s"] <= self.sequence:
+                    continue  # Already in the snapshot (crash between writing the snapshot and truncating the log)
+                self.sequence = event["s"]
+                self.events_since_compact += 1
+                if "t" in event:
+                    self.signature = event["t"]
+                self._apply(event)
+        os.truncate(self.log_path, valid_bytes)
+
+        if self.DEBUG and self.state.seen:
+            print(f"[DEBUG][JOURNAL] Replayed {self.log_path}: {len(self.state.frontier)} queued, "
+                  f"{len(self.state.seen)} seen, {len(self.state.results)} results")
+
+    def _apply(self, event: dict) -> None:
+        state = self.state
+        if event.get("u"):
+            state.frontier.pop(event["u"], None)
+        for url, depth in event.get("q", ()):
+            if url not in state.seen:
+                state.seen.add(url)
+                state.frontier[url] = depth
+        for url, text, terms in event.get("r", ()):
+            state.seen.add(url)
+            state.results[url] = (text, terms)
+        if event.get("m"):
+            state.sitemaps_done = True
+
+    def record(self, fetched: str | None = None, queued: list[tuple[str, int]] = (),
+               results: list[tuple[str, str, list[str]]] = (), sitemaps: bool = False) -> None:
+        """
+        Purpose: Journal one step of the crawl as a single event, so a page's links and results are never half written
+        Input:
+            - fetched = URL that was crawled (None for seeding steps)
+            - queued = (url, depth) pairs added to the crawl queue
+            - results = (url, text, matched terms) results emitted
+            - sitemaps = The step is the sitemap seeding
+        """
+        self.sequence += 1
+        event = {"s": self.sequence}
+        if self.sequence == 1:
+            event["t"] = self.signature
+        if fetched:
+            event["u"] = fetched
+        if queued:
+            event["q"] = [list(item) for item in queued]
+        if results:
+            event["r"] = [list(item) for item in results]
+        if sitemaps:
+            event["m"] = 1
+        self._apply(event)
+        self.buffer.append(json.dumps(event, separators=(",", ":")) + "\n")
+        self.events_since_compact += 1
+
+        if len(self.buffer) >= self.flush_every or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+            if self.events_since_compact >= self.compact_every:
+                self.compact()
+
+    def flush(self) -> None:
+        """
+        Purpose: Write buffered events to the log and sync them to disk
+        """
+        self.last_flush = time.monotonic()
+        if not self.buffer or not self.file:
+            return
+        self.file.write("".join(self.buffer))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.buffer.clear()
+
+    def compact(self) -> None:
+        """
+        Purpose: Write the whole state as a snapshot (atomically), then empty the log
+        """
+        self.flush()
+        state = self.state
+        snapshot = {
+            "sequence": self.sequence,
+            "signature": self.signature,
+            "frontier": list(state.frontier.items()),
+            "seen": list(state.seen),
+            "results": [[url, text, terms] for url, (text, terms) in state.results.items()],
+            "sitemaps_done": state.sitemaps_done,
+            "complete": state.complete,
+            "completed_at": state.completed_at,
+        }
+        temp_path = self.snapshot_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(snapshot, file, separators=(",", ":"))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.snapshot_path)
+        if self.file:
+            self.file.truncate(0)
+        self.events_since_compact = 0
+        if self.DEBUG:
+            print(f"[DEBUG][JOURNAL] Compacted {self.log_path} at event {self.sequence}")
+
+    def finish(self) -> None:
+        """
+        Purpose: Mark the crawl complete; the snapshot keeps its results so a re-run can skip it
+        """
+        self.state.complete = True
+        self.state.completed_at = time.time()
+        self.state.frontier.clear()
+        self.compact()
+        self.close()
+
+    def discard(self) -> None:
+        """
+        Purpose: Delete the journal and start an empty one
+        """
+        self.close()
+        for path in (self.log_path, self.snapshot_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self.state = JournalState()
+        self.sequence = 0
+        self.events_since_compact = 0
+
+    def close(self) -> None:
+        """
+        Purpose: Write buffered events and close the log (the crawl can be resumed from it)
+        """
+        if self.file:
+            self.flush()
+            self.file.close()
+            self.file = None
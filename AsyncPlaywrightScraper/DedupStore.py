@@ -0,0 +1,225 @@
+import math
+import sys
+from array import array
+from hashlib import blake2b
+
+
+def url_fingerprint(url: str) -> int:
+    """
+    Purpose: Hash a URL to a non-zero 64-bit integer
+    """
+    fingerprint = int.from_bytes(blake2b(url.encode("utf-8"), digest_size=8).digest(), "little")
+    return fingerprint or 1  # 0 marks an empty slot in FingerprintDedupStore
+
+
+class ExactDedupStore:
+    name = "exact"
+
+    def __init__(self):
+        """
+        Purpose: Exact URL dedup backed by a Python set of strings (no false positives, highest memory)
+        """
+        self.urls: set[str] = set()
+
+    def add(self, url: str) -> bool:
+        """
+        Purpose: Add a URL; return True if it was not already present
+        """
+        if url in self.urls:
+            return False
+        self.urls.add(url)
+        return True
+
+    def update(self, urls) -> None:
+        self.urls.update(urls)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.urls
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def memory_bytes(self) -> int:
+        return sys.getsizeof(self.urls) + sum(sys.getsizeof(url) for url in self.urls)
+
+
+class FingerprintDedupStore:
+    name = "fingerprint"
+
+    def __init__(self, initial_capacity: int = 1024, max_load: float = 0.6):
+        """
+        Purpose: URL dedup storing 64-bit fingerprints in an open-addressing hash table backed by array('Q')
+                 (about 8 bytes per slot; a false positive needs a 64-bit hash collision)
+        Input:
+            - initial_capacity = starting number of slots (rounded up to a power of two)
+            - max_load = fraction of slots filled before the table doubles
+        """
+        capacity = 1 << max(4, math.ceil(math.log2(max(initial_capacity, 1))))
+        self.slots = array("Q", bytes(8 * capacity))
+        self.max_load = max_load
+        self.count = 0
+
+    def _probe(self, fingerprint: int) -> int:
+        """
+        Purpose: Return the slot index holding the fingerprint, or the empty slot where it would go
+        """
+        mask = len(self.slots) - 1
+        index = fingerprint & mask
+        while True:
+            slot = self.slots[index]
+            if slot == 0 or slot == fingerprint:
+                return index
+            index = (index + 1) & mask
+
+    def _grow(self) -> None:
+        old_slots = self.slots
+        self.slots = array("Q", bytes(16 * len(old_slots)))
+        for fingerprint in old_slots:
+            if fingerprint:
+                self.slots[self._probe(fingerprint)] = fingerprint
+
+    def add(self, url: str) -> bool:
+        """
+        Purpose: Add a URL; return True if it was not already present
+        """
+        fingerprint = url_fingerprint(url)
+        index = self._probe(fingerprint)
+        if self.slots[index] == fingerprint:
+            return False
+        self.slots[index] = fingerprint
+        self.count += 1
+        if self.count > self.max_load * len(self.slots):
+            self._grow()
+        return True
+
+    def update(self, urls) -> None:
+        for url in urls:
+            self.add(url)
+
+    def __contains__(self, url: str) -> bool:
+        fingerprint = url_fingerprint(url)
+        return self.slots[self._probe(fingerprint)] == fingerprint
+
+    def __len__(self) -> int:
+        return self.count
+
+    def memory_bytes(self) -> int:
+        return sys.getsizeof(self.slots)
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        Purpose: Fixed-size Bloom filter sized for a capacity and false-positive rate
+        """
+        self.capacity = capacity
+        self.bit_count = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.bit_count / capacity * math.log(2)))
+        self.bits = bytearray((self.bit_count + 7) // 8)
+        self.count = 0
+
+    def _positions(self, digest: bytes):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.bit_count
+
+    def contains(self, digest: bytes) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+
+    def add(self, digest: bytes) -> None:
+        for position in self._positions(digest):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+
+class BloomDedupStore:
+    name = "bloom"
+
+    def __init__(self, error_rate: float = 0.001, initial_capacity: int = 10000,
+                 growth_factor: int = 2, tightening_ratio: float = 0.5):
+        """
+        Purpose: Scalable Bloom filter dedup. Adds a larger filter with a tighter error rate whenever the current one
+                 is full, keeping the overall false-positive rate below error_rate (a false positive skips a new URL)
+        Input:
+            - error_rate = target overall false-positive rate
+            - initial_capacity = number of URLs the first filter is sized for
+            - growth_factor = capacity multiplier for each new filter
+            - tightening_ratio = error rate multiplier for each new filter
+        """
+        self.error_rate = error_rate
+        self.initial_capacity = initial_capacity
+        self.growth_factor = growth_factor
+        self.tightening_ratio = tightening_ratio
+        self.filters: list[BloomFilter] = []
+        self.count = 0
+        self._add_filter()
+
+    def _add_filter(self) -> None:
+        index = len(self.filters)
+        capacity = self.initial_capacity * (self.growth_factor ** index)
+        filter_error_rate = self.error_rate * (1 - self.tightening_ratio) * (self.tightening_ratio ** index)
+        self.filters.append(BloomFilter(capacity, filter_error_rate))
+
+    def _digest(self, url: str) -> bytes:
+        return blake2b(url.encode("utf-8"), digest_size=16).digest()
+
+    def add(self, url: str) -> bool:
+        """
+        Purpose: Add a URL; return True if it was (probably) not already present
+        """
+        digest = self._digest(url)
+        if any(bloom.contains(digest) for bloom in self.filters):
+            return False
+        if self.filters[-1].count >= self.filters[-1].capacity:
+            self._add_filter()
+        self.filters[-1].add(digest)
+        self.count += 1
+        return True
+
+    def update(self, urls) -> None:
+        for url in urls:
+            self.add(url)
+
+    def __contains__(self, url: str) -> bool:
+        digest = self._digest(url)
+        return any(bloom.contains(digest) for bloom in self.filters)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def memory_bytes(self) -> int:
+        return sum(sys.getsizeof(bloom.bits) for bloom in self.filters)
+
+
+dedup_backends = {
+    ExactDedupStore.name: ExactDedupStore,
+    FingerprintDedupStore.name: FingerprintDedupStore,
+    BloomDedupStore.name: BloomDedupStore,
+}
+
+
+def create_dedup_store(backend: str = "exact", error_rate: float = 0.001):
+    """
+    Purpose: Create a URL dedup store by backend name
+    Input:
+        - backend = "exact", "fingerprint" or "bloom"
+        - error_rate = false-positive rate for the bloom backend
+    Output:
+        - New, empty dedup store
+    """
+    if backend not in dedup_backends:
+        raise ValueError(f"Unknown dedup backend '{backend}', expected one of {list(dedup_backends)}")
+    if backend == BloomDedupStore.name:
+        return BloomDedupStore(error_rate=error_rate)
+    return dedup_backends[backend]()
+
+
+def memory_per_million(store) -> float:
+    """
+    Purpose: Return the store's memory use in MB scaled to one million URLs
+    """
+    if not len(store):
+        return 0.0
+    return store.memory_bytes() / len(store) * 1_000_000 / 1e6
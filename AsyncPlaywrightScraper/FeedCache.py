@@ -0,0 +1,76 @@
+import sqlite3
+import time
+
+
+class FeedCache:
+    def __init__(self, path: str = "feed_cache.sqlite"):
+        """
+        Purpose: Persistent store of HTTP validators (ETag / Last-Modified) and already seen entries per feed URL
+        Input:
+            - path = SQLite database file (":memory:" for a throwaway cache)
+        """
+        # Polls may run on a GUI worker thread; access is never concurrent, so the connection can be shared
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS feeds (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS seen_entries (
+                url TEXT NOT NULL,
+                entry_key TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                PRIMARY KEY (url, entry_key)
+            );
+        """)
+        self.connection.commit()
+
+    def get_validators(self, url: str) -> tuple[str | None, str | None]:
+        """
+        Purpose: Return the (etag, last_modified) stored for a feed URL
+        """
+        row = self.connection.execute("SELECT etag, last_modified FROM feeds WHERE url = ?", (url,)).fetchone()
+        return (row[0], row[1]) if row else (None, None)
+
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        """
+        Purpose: Build If-None-Match / If-Modified-Since headers for a feed URL
+        """
+        etag, last_modified = self.get_validators(url)
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def set_validators(self, url: str, etag: str | None, last_modified: str | None) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO feeds (url, etag, last_modified, fetched_at) VALUES (?, ?, ?, ?)",
+            (url, etag, last_modified, time.time()),
+        )
+        self.connection.commit()
+
+    def unseen(self, url: str, entry_keys: list[str]) -> set[str]:
+        """
+        Purpose: Return the entry keys that have not been seen before for a feed URL
+        """
+        if not entry_keys:
+            return set()
+        placeholders = ",".join("?" * len(entry_keys))
+        seen = {row[0] for row in self.connection.execute(
+            f"SELECT entry_key FROM seen_entries WHERE url = ? AND entry_key IN ({placeholders})", (url, *entry_keys))}
+        return set(entry_keys) - seen
+
+    def mark_seen(self, url: str, entry_keys: list[str]) -> None:
+        now = time.time()
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO seen_entries (url, entry_key, first_seen) VALUES (?, ?, ?)",
+            [(url, key, now) for key in entry_keys],
+        )
+        self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.close()
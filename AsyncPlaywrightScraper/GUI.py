@@ -2,11 +2,67 @@ import tkinter as tk
 from tkinter import ttk
 import webbrowser
 import asyncio
-import threading
+import queue
+from bisect import bisect_right
+from concurrent.futures import Future
 
 from ScraperHandler import ScraperHandler
+from HomepageScraper import CrawlResult
+from BackgroundLoop import BackgroundLoop
+
+class ResultList:
+    def __init__(self, parent, columns: list[tuple[str, str, int]], on_open = None):
+        """
+        Purpose: Scrollable result table backed by a ttk.Treeview, which only draws the rows in view
+                 (stays smooth with tens of thousands of rows, unlike one Frame + Labels per result)
+        Input:
+            - parent = widget the table is placed in
+            - columns = (column id, heading, width) for each column
+            - on_open = function called with a row's URL when it is double-clicked or Enter is pressed
+        """
+        self.frame = ttk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, columns=[column for column, _, _ in columns], show="headings",
+                                 selectmode="browse")
+        for column, heading, width in columns:
+            self.tree.heading(column, text=heading, anchor="w")
+            self.tree.column(column, width=width, minwidth=60, stretch=True, anchor="w")
+        scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        self.on_open = on_open
+        self.urls: dict[str, str] = {}  # Row id -> URL opened for that row
+        self.sort_keys: list[int] = []  # Row sort keys in display order (rows are kept sorted as they arrive)
+        self.tree.bind("<Double-1>", self._open_selected)
+        self.tree.bind("<Return>", self._open_selected)
+
+    def insert(self, values: tuple, url: str, sort_key: int = 0) -> None:
+        """
+        Purpose: Add a row, keeping rows ordered by sort_key (rows with equal keys stay in arrival order)
+        """
+        index = bisect_right(self.sort_keys, sort_key)
+        self.sort_keys.insert(index, sort_key)
+        row_id = self.tree.insert("", index, values=values)
+        self.urls[row_id] = url
+
+    def clear(self) -> None:
+        self.tree.delete(*self.tree.get_children())
+        self.urls.clear()
+        self.sort_keys.clear()
+
+    def __len__(self) -> int:
+        return len(self.sort_keys)
+
+    def _open_selected(self, event) -> None:
+        for row_id in self.tree.selection():
+            if self.on_open:
+                self.on_open(self.urls.get(row_id, ""))
 
 class ScraperGUI:
+    batch_size = 500  # Max rows added per Tk event-loop tick, so the window stays responsive while results stream in
+    poll_ms = 50
+
     def __init__(self, whitelist: list[str] = None, blacklist: list[str] = None,
                  headless: bool = True, stealth: bool = True, DEBUG: bool = True):
 
@@ -14,14 +70,28 @@ class ScraperGUI:
                                                       headless = headless, stealth = stealth, DEBUG = DEBUG)
         self.all_results: dict = {}
 
+        # Searches put (search id, kind, payload) here; the Tk thread drains it in batches with root.after
+        self.result_queue: queue.Queue = queue.Queue()
+        self.search_id = 0
+
+        # One event loop thread for the life of the GUI; it keeps the browser warm between searches
+        self.background = BackgroundLoop(DEBUG = DEBUG)
+        self.current_job: Future | None = None
+        self.progress_message = "Searching"
+
         self.root = None
         self.dropdown_var = None
         self.input_area = None
         self.search_entries = []
         self.tab_control = None
-        self.canvas = None
-        self.scrollable_frame = None
+        self.tab_news = None
+        self.tab_company = None
+        self.news_list = None
+        self.company_list = None
+        self.homepage_label = None
+        self.status_label = None
         self.search_button = None
+        self.cancel_button = None
         self.top_frame = None
 
     def update_input_fields(self, selection):
@@ -54,207 +124,199 @@ class ScraperGUI:
 
         self.update_tabs()  # Update tabs when inputs change
 
-    def update_tabs(self):
-        # Clear previous tabs
-        for tab in self.tab_control.tabs():
-            self.tab_control.forget(tab)
-
-        # Create new tabs
+    def create_tabs(self) -> None:
+        """
+        Purpose: Create the News and Company Page tabs once; searches only clear and refill their tables
+        """
         self.tab_news = ttk.Frame(self.tab_control)
         self.tab_company = ttk.Frame(self.tab_control)
-
         self.tab_control.add(self.tab_news, text="News")
         self.tab_control.add(self.tab_company, text="Company Page")
 
-        self.clear_tab(self.tab_news)
-        self.clear_tab(self.tab_company)
-
-    def clear_tab(self, tab) -> None:
-        for widget in tab.winfo_children():
-            widget.destroy()
+        self.news_list = ResultList(self.tab_news, [("title", "Title", 220), ("snippet", "Snippet", 200),
+                                                    ("link", "URL", 160)], on_open=self.create_clickable_link)
+        self.news_list.frame.pack(fill="both", expand=True)
 
-    def perform_search(self) -> None:
-        # Disable the search button to prevent simultaneous searches
-        self.search_button.config(state="disabled", text="Searching...")
+        self.homepage_label = tk.Label(self.tab_company, text="", font=("Arial", 11, "bold"), fg="blue",
+                                       cursor="hand2", anchor="w", justify="left")
+        self.homepage_label.pack(fill="x", padx=5, pady=(5, 0))
+        self.homepage_label.bind("<Button-1>", lambda e: self.create_clickable_link(self.all_results.get("homepage")))
+        self.company_list = ResultList(self.tab_company, [("text", "Anchor Text", 180), ("terms", "Search Terms", 120),
+                                                          ("url", "URL", 200)], on_open=self.create_clickable_link)
+        self.company_list.frame.pack(fill="both", expand=True)
 
-        # Run the async search in a separate thread
-        search_thread = threading.Thread(target=self._run_async_search)
-        search_thread.daemon = True  # Thread will die when main program dies
-        search_thread.start()
+    def update_tabs(self):
+        # Clear previous results (tabs and tables are reused)
+        self.news_list.clear()
+        self.company_list.clear()
+        self.homepage_label.config(text="")
+        self.tab_control.tab(self.tab_news, text="News")
+        self.tab_control.tab(self.tab_company, text="Company Page")
+        self.all_results = {"news": [], "homepage": None, "found_links": 0}
 
-    def _run_async_search(self):
-        update_gui: bool = False
-        try:
-            company = self.search_entries[0].get()
-            search_terms = [
-                term.strip()
-                for entry in self.search_entries[1:]
-                for term in entry.get().split(",")
-                if term.strip()
-            ]
-
-            self.scraper.retrieve_company(company)
-            self.scraper.retrieve_search_terms(search_terms)
-
-            news = self.scraper.run_news_scrape()
-
-            # Create new event loop
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-            homepage, found_links = None, []
-
-            try:
-                if self.dropdown_var.get() == "company":
-                    # Only find homepage, no full scrape
-                    homepage = self.scraper.find_homepage()
-
-                elif self.dropdown_var.get() == "company + keyword":
-                    async def run_scrape():
-                        return await self.scraper.run_company_scrape()
-                    result = loop.run_until_complete(run_scrape())
-                    if result:
-                        homepage, found_links = result
-                update_gui = True
-
-            finally:
-                self.all_results = {
-                    "news": news,
-                    "homepage": homepage,
-                    "found_links": found_links
-                }
-                loop.close()
-                if update_gui:
-                    self.root.after(0, self._update_gui_with_results)
-
-        except Exception as e:
-            print(f"Search error: {e}")
-            self.root.after(0, self._search_error, str(e))
-
-    def _update_gui_with_results(self):
-        self.search_button.config(state="normal", text="Search")
+    def perform_search(self) -> None:
+        company = self.search_entries[0].get()
+        search_terms = [
+            term.strip()
+            for entry in self.search_entries[1:]
+            for term in entry.get().split(",")
+            if term.strip()
+        ]
+        # News scrape runs in parallel with the homepage lookup ("company") or full crawl ("company + keyword")
+        homepage_only = self.dropdown_var.get() == "company"
+
+        # A new search supersedes the one in progress
+        self.cancel_search(status = False)
+        self.search_id += 1
         self.update_tabs()
-        self.display_results()
+        self.search_button.config(text="Search Again")
+        self.cancel_button.config(state="normal")
+        self.status_label.config(text="Searching...", fg="black")
+        self.progress_message = "Searching"
+
+        search_id = self.search_id
+        self.current_job = self.background.submit(self._stream_search(search_id, company, search_terms, homepage_only))
+        self.current_job.add_done_callback(lambda job: self._job_finished(search_id, job))
+
+    def cancel_search(self, status: bool = True) -> None:
+        """
+        Purpose: Cancel the search in progress (its crawl stops and its browser context is closed on the loop thread)
+        """
+        if self.current_job and not self.current_job.done():
+            self.current_job.cancel()
+            if status:
+                self.search_id += 1  # Drop anything the cancelled search already queued
+                self._search_ended("Search cancelled", "black")
+
+    def _job_finished(self, search_id: int, job: Future) -> None:
+        """
+        Purpose: Report how a search ended (runs on the loop thread, so it only queues a message for the Tk thread)
+        """
+        if job.cancelled():
+            return
+        error = job.exception()
+        if error:
+            print(f"Search error: {error}")
+            self.result_queue.put((search_id, "error", str(error)))
+        else:
+            self.result_queue.put((search_id, "done", None))
+
+    async def _stream_search(self, search_id: int, company: str, search_terms: list[str], homepage_only: bool) -> None:
+        """
+        Purpose: Run the news scrape and the homepage lookup/crawl together on the background loop, queueing results
+                 and progress for the GUI as they arrive
+        """
+        self.scraper.retrieve_company(company)
+        self.scraper.retrieve_search_terms(search_terms)
+
+        def progress(message: str) -> None:
+            self.result_queue.put((search_id, "progress", message))
+
+        async def news() -> None:
+            self.result_queue.put((search_id, "news", await self.scraper.run_news_scrape_async()))
+
+        async def company() -> None:
+            if homepage_only:
+                self.result_queue.put((search_id, "homepage", await self.scraper.find_homepage()))
+                return
+            if not self.scraper.warm:
+                progress("Starting browser...")
+            await self.scraper.start()  # Returns at once when the browser is already warm
+            homepage_sent = False
+            async for result in self.scraper.run_company_scrape_iter(on_progress = progress):
+                if not homepage_sent:
+                    self.result_queue.put((search_id, "homepage", self.scraper.homepage))
+                    homepage_sent = True
+                self.result_queue.put((search_id, "company", result))
+            if not homepage_sent:
+                self.result_queue.put((search_id, "homepage", self.scraper.homepage))
+
+        await asyncio.gather(news(), company())
+
+    def _drain_result_queue(self) -> None:
+        """
+        Purpose: Move up to batch_size queued results into the tables, then check again after poll_ms
+        """
+        added = False
+        try:
+            for _ in range(self.batch_size):
+                try:
+                    search_id, kind, payload = self.result_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if search_id != self.search_id:
+                    continue  # Left over from an earlier search
+                added = True
+                if kind == "company":
+                    self.display_company_result(payload)
+                elif kind == "news":
+                    self.display_news_results(payload)
+                elif kind == "homepage":
+                    self.display_homepage(payload)
+                elif kind == "done":
+                    self._search_finished()
+                elif kind == "error":
+                    self._search_error(payload)
+                elif kind == "progress":
+                    self.progress_message = payload
+        finally:
+            if added:
+                self._update_counts()
+            self.root.after(self.poll_ms, self._drain_result_queue)
+
+    def _update_counts(self) -> None:
+        """
+        Purpose: Show the number of results in each tab title (and in the status line while searching)
+        """
+        self.tab_control.tab(self.tab_news, text=f"News ({len(self.news_list)})")
+        self.tab_control.tab(self.tab_company, text=f"Company Page ({len(self.company_list)})")
+        if self.current_job and not self.current_job.done():
+            self.status_label.config(text=f"{self.progress_message}... {len(self.company_list)} company page results so far",
+                                     fg="black")
+
+    def _search_ended(self, message: str, color: str) -> None:
+        self.search_button.config(text="Search")
+        self.cancel_button.config(state="disabled")
+        self.status_label.config(text=message, fg=color)
+
+    def _search_finished(self):
+        found = self.all_results.get("found_links", 0)
+        self._search_ended(f"Done: {len(self.news_list)} news results, {found} company page results", "black")
+        if not self.all_results.get("homepage"):
+            self.homepage_label.config(text="No company page results found.", fg="black")
 
     def _search_error(self, error_msg):
-        self.search_button.config(state="normal", text="Search")
-        self.clear_tab(self.tab_news)
-        self.clear_tab(self.tab_company)
-        tk.Label(self.tab_news, text=f"Search failed: {error_msg}", font=("Arial", 10), pady=10, fg="red").pack()
-
-    def display_results(self):
-        self.clear_tab(self.tab_news)
-        self.clear_tab(self.tab_company)
-        self.display_news_results(self.tab_news)
-        self.display_company_results(self.tab_company)
-
-    def display_news_results(self, tab):
-        # Create a scrollable frame for news results
-        scrollable_frame = tab
-
-        # Display news results
-        news_data = self.all_results.get("news", [])
-        if not news_data:
-            tk.Label(scrollable_frame, text="No news results found.",
-                     font=("Arial", 10), pady=10).pack()
-            return
+        self._search_ended(f"Search failed: {error_msg}", "red")
 
-        for i, news_item in enumerate(news_data):
-            # Create frame for each news item
-            news_frame = tk.Frame(scrollable_frame, relief="solid", bd=1, padx=10, pady=10)
-            news_frame.pack(fill="x", padx=5, pady=5)
-
-            # Title (clickable link)
-            title_link = tk.Label(news_frame, text=news_item.get("title", "No title"),
-                                  font=("Arial", 12, "bold"), fg="blue", cursor="hand2",
-                                  wraplength=450, justify="left")
-            title_link.pack(anchor="w")
-            title_link.bind("<Button-1>", lambda e, url=news_item.get("link", ""): self.create_clickable_link(url))
-
-            # Snippet
-            snippet = news_item.get("snippet", "No snippet available")
-            snippet_label = tk.Label(news_frame, text=snippet, font=("Arial", 10),
-                                     wraplength=450, justify="left")
-            snippet_label.pack(anchor="w", pady=(5, 0))
-
-            # URL (smaller text)
-            url_label = tk.Label(news_frame, text=news_item.get("link", ""),
-                                 font=("Arial", 8), fg="gray", wraplength=450, justify="left")
-            url_label.pack(anchor="w", pady=(2, 0))
-
-    def display_company_results(self, tab):
-        scrollable_frame = tab
-
-        homepage = self.all_results.get("homepage", "")
-        found_links = self.all_results.get("found_links", [])
-
-        if not homepage and not found_links:
-            tk.Label(scrollable_frame, text="No company page results found.",
-                     font=("Arial", 10), pady=10).pack()
-            return
+    def display_news_results(self, news_data: list[dict]):
+        self.all_results["news"] = news_data
+        for news_item in news_data:
+            self.news_list.insert((news_item.get("title", "No title"),
+                                   news_item.get("snippet", "No snippet available"),
+                                   news_item.get("link", "")), url=news_item.get("link", ""))
 
-        # Display homepage
+    def display_homepage(self, homepage: str | None):
+        self.all_results["homepage"] = homepage
         if homepage:
-            homepage_frame = tk.Frame(scrollable_frame, relief="solid", bd=2, padx=10, pady=10)
-            homepage_frame.pack(fill="x", padx=5, pady=5)
-
-            tk.Label(homepage_frame, text="Company Homepage:",
-                     font=("Arial", 14, "bold")).pack(anchor="w")
-
-            homepage_link = tk.Label(homepage_frame, text=homepage, font=("Arial", 11),
-                                     fg="blue", cursor="hand2", wraplength=450, justify="left")
-            homepage_link.pack(anchor="w", pady=(5, 0))
-            homepage_link.bind("<Button-1>", lambda e, url=homepage: self.create_clickable_link(url))
-
-        # Display sublinks
-        if found_links:
-            tk.Label(scrollable_frame, text="Found Sublinks:",
-                     font=("Arial", 14, "bold")).pack(anchor="w", pady=(15, 5))
-
-            sorted_links = sorted(found_links, key=lambda x: len(x.matched_terms), reverse=True)
-
-            for link_data in sorted_links:
-                sublink = getattr(link_data, "url", "")
-                anchor_text = getattr(link_data, "text", "").strip()
-                keywords = getattr(link_data, "matched_terms", [])
-
-                link_frame = tk.Frame(scrollable_frame, relief="solid", bd=1, padx=10, pady=8)
-                link_frame.pack(fill="x", padx=5, pady=3)
-
-                if anchor_text:
-                    anchor_label = tk.Label(link_frame, text=anchor_text, font=("Arial", 10, "italic"),
-                                            wraplength=450, justify="left", fg="gray25")
-                    anchor_label.pack(anchor="w", pady=(0, 3))
-
-                # Clickable link
-                link_label = tk.Label(link_frame, text=sublink, font=("Arial", 10, "bold"),
-                                      fg="blue", cursor="hand2", wraplength=450, justify="left")
-                link_label.pack(anchor="w")
-                link_label.bind("<Button-1>", lambda e, url=sublink: self.create_clickable_link(url))
-
-                # Matched search terms
-                if keywords:
-                    if isinstance(keywords, list):
-                        keywords_text = ", ".join(keywords)
-                    else:
-                        keywords_text = str(keywords)
-
-                    keywords_label = tk.Label(link_frame, text=f"Search Terms: {keywords_text}",
-                                              font=("Arial", 9), fg="darkgreen")
-                    keywords_label.pack(anchor="w", pady=(2, 0))
+            self.homepage_label.config(text=f"Company Homepage: {homepage}", fg="blue")
+
+    def display_company_result(self, link_data: CrawlResult):
+        keywords = link_data.matched_terms
+        keywords_text = ", ".join(keywords) if isinstance(keywords, list) else str(keywords)
+        # Rows with the most matched search terms first
+        self.company_list.insert((link_data.text.strip(), keywords_text, link_data.url), url=link_data.url,
+                                 sort_key=-len(keywords))
+        self.all_results["found_links"] = len(self.company_list)
 
     def create_clickable_link(self, url):
         if url:
             webbrowser.open(url)
 
-    def on_mousewheel(self, event):
-        self.canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
-
     def create_GUI(self):
         # Root window
         self.root = tk.Tk()
         self.root.title("Fixed Header Search GUI")
-        self.root.geometry("500x400")
+        self.root.geometry("700x500")
 
         # Fixed top frame
         self.top_frame = tk.Frame(self.root)
@@ -271,32 +333,21 @@ class ScraperGUI:
         self.input_area = tk.Frame(self.top_frame)
         self.input_area.grid(row=0, column=1, padx=5)
 
-        # Search button
+        # Search button (a new search while one is running replaces it)
         self.search_button = tk.Button(self.top_frame, text="Search", command=self.perform_search)
         self.search_button.grid(row=0, column=2, padx=5)
 
-        # Scrollable content area with tabs
-        self.canvas = tk.Canvas(self.root)
-        scrollbar = tk.Scrollbar(self.root, orient="vertical", command=self.canvas.yview)
-
-        self.scrollable_frame = tk.Frame(self.canvas)
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        )
+        self.cancel_button = tk.Button(self.top_frame, text="Cancel", state="disabled", command=self.cancel_search)
+        self.cancel_button.grid(row=0, column=3, padx=5)
 
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=scrollbar.set)
+        # Search progress / errors
+        self.status_label = tk.Label(self.root, text="", anchor="w", font=("Arial", 9))
+        self.status_label.pack(side="bottom", fill="x", padx=5)
 
-        self.canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-
-        # Mousewheel scrolling
-        self.canvas.bind_all("<MouseWheel>", self.on_mousewheel)
-
-        # Create tab_control
-        self.tab_control = ttk.Notebook(self.scrollable_frame)
+        # Tabs; each result table scrolls on its own
+        self.tab_control = ttk.Notebook(self.root)
         self.tab_control.pack(fill="both", expand=True)
+        self.create_tabs()
 
         # Initialize input fields
         self.update_input_fields('company')
@@ -304,9 +355,26 @@ class ScraperGUI:
         # Bind dropdown selection change
         dropdown.bind('<<ComboboxSelected>>', lambda event: self.update_input_fields(self.dropdown_var.get()))
 
+        # Results from the background loop are added in batches on the Tk thread
+        self.root.after(self.poll_ms, self._drain_result_queue)
+
+        # Launch the browser in the background while the user types the first search
+        self.background.start()
+        self.background.submit(self.scraper.start())
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+
         # Start the GUI
         self.root.mainloop()
 
+    def close(self) -> None:
+        """
+        Purpose: Cancel any search, close the warm browser on the loop thread, then close the window
+        """
+        if self.current_job and not self.current_job.done():
+            self.current_job.cancel()
+        self.background.stop(self.scraper.stop())
+        self.root.destroy()
+
 
 async def main():
     app = ScraperGUI(headless = True, stealth = True, DEBUG=True)
@@ -314,4 +382,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
@@ -0,0 +1,192 @@
+import asyncio
+import os
+import re
+import sqlite3
+import time
+from urllib.parse import urlparse
+import aiohttp
+import tldextract
+from rapidfuzz import fuzz
+
+
+def normalize_company_name(company: str) -> str:
+    """
+    Purpose: normalize company name for cache lookups
+    Input:
+        - company = Company name
+    Output:
+        - Lowercased name with punctuation removed and whitespace collapsed
+    """
+    return " ".join(re.sub(r"[^\w\s]", " ", company.lower()).split())
+
+
+def default_cache_path() -> str:
+    """
+    Purpose: Location of the homepage cache when none is given, in the user's cache folder instead of the working folder
+    Output:
+        - <cache folder>/AsyncPlaywrightScraper/homepage_cache.sqlite (the folder is created if needed)
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    directory = os.path.join(base, "AsyncPlaywrightScraper")
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, "homepage_cache.sqlite")
+
+
+class HomepageCache:
+    def __init__(self, path: str | None = None):
+        """
+        Purpose: Persistent TTL cache from normalized company name to homepage (None = cached miss)
+        Input:
+            - path = SQLite database file (":memory:" for a throwaway cache, None for default_cache_path())
+        """
+        path = path or default_cache_path()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS homepages (company TEXT PRIMARY KEY, homepage TEXT, expires_at REAL NOT NULL)"
+        )
+        self.connection.commit()
+
+    def get(self, company: str) -> tuple[bool, str | None]:
+        """
+        Purpose: Look up a company
+        Output:
+            - Tuple containing whether there was an unexpired entry and the cached homepage (None for a cached miss)
+        """
+        row = self.connection.execute(
+            "SELECT homepage, expires_at FROM homepages WHERE company = ?", (company,)
+        ).fetchone()
+        if row is None or row[1] < time.time():
+            return False, None
+        return True, row[0]
+
+    def set(self, company: str, homepage: str | None, ttl: float) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO homepages (company, homepage, expires_at) VALUES (?, ?, ?)",
+            (company, homepage, time.time() + ttl),
+        )
+        self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class HomepageResolver:
+    def __init__(self, api_key: str, brave_url: str = "https://api.search.brave.com/res/v1/web/search",
+                 cache_path: str | None = None, ttl: float = 30 * 24 * 3600, negative_ttl: float = 24 * 3600,
+                 retries: int = 3, backoff_factor: float = 0.5, DEBUG: bool = False):
+        """
+        Purpose: Resolve company names to homepages through the Brave API with a shared client, a persistent cache,
+                 and a single API call for concurrent lookups of the same company
+        Input:
+            - api_key = API Key for BraveAPI
+            - brave_url = Brave web search endpoint
+            - cache_path = SQLite file for the homepage cache (None = user cache folder, see default_cache_path)
+            - ttl = seconds a found homepage stays cached
+            - negative_ttl = seconds a "no homepage found" result stays cached
+            - retries / backoff_factor = retry policy for connection errors, 429 and 5xx responses
+        """
+        self.api_key = api_key
+        self.brave_url = brave_url
+        self.header = {"Accept": "application/json", "X-Subscription-Token": api_key}
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.DEBUG = DEBUG
+
+        self.cache = HomepageCache(cache_path)
+        self.session = None
+        self._session_loop = None
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Purpose: Return the shared client session, creating it for the running event loop if needed
+        """
+        loop = asyncio.get_running_loop()
+        if self.session is None or self.session.closed or self._session_loop is not loop:
+            self.session = aiohttp.ClientSession(headers=self.header, timeout=aiohttp.ClientTimeout(total=15))
+            self._session_loop = loop
+            self._in_flight = {}
+        return self.session
+
+    async def stop(self) -> None:
+        """
+        Purpose: Close the shared client session
+        """
+        if self.session and not self.session.closed and self._session_loop is asyncio.get_running_loop():
+            await self.session.close()
+        self.session = None
+
+    async def resolve(self, company: str) -> str | None:
+        """
+        Purpose: Find company's homepage
+        Input:
+            - company = Company name
+        Output:
+            - Company homepage, or None if there is none
+        """
+        key = normalize_company_name(company)
+        hit, homepage = self.cache.get(key)
+        if hit:
+            if self.DEBUG:
+                print(f"[DEBUG][HOMEPAGE] Cached homepage for '{key}': {homepage}")
+            return homepage
+
+        await self._get_session()
+        in_flight = self._in_flight.get(key)
+        if in_flight is None:
+            in_flight = asyncio.ensure_future(self._lookup(company, key))
+            self._in_flight[key] = in_flight
+            in_flight.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # Shield so one cancelled caller does not cancel the lookup for everyone else waiting on it
+        return await asyncio.shield(in_flight)
+
+    async def _lookup(self, company: str, key: str) -> str | None:
+        """
+        Purpose: Query the Brave API, pick the result whose domain fuzzy-matches the company, and cache the outcome
+        """
+        query = f"{company} official website"
+        if self.DEBUG:
+            print(f"[DEBUG][HOMEPAGE] Query: {query}")
+        parameters = {"q": query, "count": 5, "source": "web"}
+
+        data = await self._get_json(parameters)
+        if data is None:
+            return None  # API failure is not cached so the next call tries again
+
+        results = data.get("web", {}).get("results", [])
+        company_domain = company.lower()
+        homepage = None
+        for result in results:
+            link = result.get("url", "")
+            result_domain = tldextract.extract(urlparse(link).netloc).domain.lower()
+            if fuzz.ratio(company_domain, result_domain) >= 45:
+                homepage = link
+                break
+
+        if self.DEBUG:
+            print(f"[DEBUG][HOMEPAGE] Matched domain: {homepage}" if homepage else f"[DEBUG][HOMEPAGE] No homepage found")
+        self.cache.set(key, homepage, self.ttl if homepage else self.negative_ttl)
+        return homepage
+
+    async def _get_json(self, parameters: dict) -> dict | None:
+        """
+        Purpose: GET the Brave API with retries and exponential backoff
+        """
+        session = await self._get_session()
+        for attempt in range(self.retries + 1):
+            try:
+                async with session.get(self.brave_url, params=parameters) as response:
+                    if response.status == 200:
+                        return await response.json(content_type=None)
+                    if response.status != 429 and response.status < 500:
+                        if self.DEBUG:
+                            print(f"[DEBUG][HOMEPAGE][ERROR] Brave API returned {response.status}")
+                        return None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if self.DEBUG:
+                    print(f"[DEBUG][HOMEPAGE][ERROR] Brave API request failed: {e}")
+            if attempt < self.retries:
+                await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+        return None
@@ -1,13 +1,23 @@
-import re
 import asyncio
-from urllib.parse import urlparse, urljoin, unquote, urlunparse
-from rapidfuzz import fuzz
-from bs4 import BeautifulSoup
-import requests
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlparse
 from dataclasses import dataclass
-import tldextract
+from typing import AsyncIterator
 from BrowserHandler import BrowserHandler
-from requests.adapters import HTTPAdapter, Retry
+from PageFetcher import TieredFetcher
+from LinkExtractor import extract_links, normalize_url
+from LinkClassifier import LinkClassifier
+from SearchTermIndex import SearchTermIndex, build_search_index
+from DedupStore import create_dedup_store, memory_per_million
+from HomepageResolver import HomepageResolver
+from CrawlGraph import CrawlGraph, PageRecord, content_hash, graph_signature
+from HostScheduler import HostScheduler
+from SitemapDiscovery import SitemapDiscovery
+from Metrics import Metrics, null_metrics
+from CrawlJournal import CrawlJournal
+from RequestBlocker import site_domain
 
 
 @dataclass
@@ -17,22 +27,6 @@ class CrawlResult:
     matched_terms: list[str]
 
 
-def normalize_url(url: str) -> str | None:
-    """
-    Purpose: normalize URL
-    Input:
-        - url = url to normalize
-    Output:
-        - normalized URL
-    """
-    parsed = urlparse(url)
-    if parsed.scheme not in ("http", "https"):
-        return None
-    netloc = parsed.netloc.lower().lstrip("www.")
-    path = parsed.path.rstrip("/")
-    return urlunparse((parsed.scheme, netloc, path, '', '', ''))
-
-
 def strip_common_path(source_url: str, target_url: str) -> str:
     """
     Purpose: Strip common path from link for processing
@@ -70,6 +64,73 @@ def strip_common_path(source_url: str, target_url: str) -> str:
     return unique_path + rest
 
 
+def is_result(text: str, search_index: SearchTermIndex) -> list[str] | None:
+    """
+    Purpose: determine if path is likely to be a result
+    """
+    matches = search_index.match(text)
+    return matches if matches else None
+
+
+def classify_links(source: str, links: dict[str, str], link_classifier: LinkClassifier, search_index: SearchTermIndex,
+                   DEBUG: bool = False) -> tuple[list[str], list[CrawlResult]]:
+    """
+    Purpose: Evaluate whether each link is relevant or contains search terms. Has no side effects, so it can
+             run in a worker process.
+    Input:
+        - source = URL the links were found on
+        - links = {normalized_url: anchor_text}
+        - link_classifier = LinkClassifier with the whitelist/blacklist rules
+        - search_index = SearchTermIndex of the terms to find results with
+    Output:
+        - relevant_links = links that match whitelist/blacklist rules
+        - result_links = CrawlResult objects where anchor or path matches search terms
+    """
+    relevant_links: list[str] = []
+    result_links: list[CrawlResult] = []
+
+    stripped_links = {link: strip_common_path(source, link) for link in links}
+    stripped_links = {link: stripped for link, stripped in stripped_links.items() if stripped}
+    relevance = link_classifier.classify(list(stripped_links.values()))
+
+    for (link, stripped_link), relevant in zip(stripped_links.items(), relevance):
+        anchor_text = links[link]
+        matched_terms = is_result(stripped_link + " " + anchor_text, search_index)
+
+        if relevant:
+            relevant_links.append(link)
+        if matched_terms:
+            result_links.append(CrawlResult(
+                url = link,
+                text = anchor_text,
+                matched_terms = matched_terms
+            ))
+
+        if DEBUG:
+            print(f'[DEBUG][HOMEPAGE] Processed link: {stripped_link}')
+            print(f"                  Relevant: {relevant}")
+            print(f"                  Matched Terms: {matched_terms}")
+
+    return relevant_links, result_links
+
+
+def parse_page(content: str, source_url: str, link_classifier: LinkClassifier,
+               search_index: SearchTermIndex) -> tuple[dict[str, str], list[str], list[CrawlResult]]:
+    """
+    Purpose: Extract and classify every link on a page. Top-level and side-effect free so it can be sent to a process pool
+    Input:
+        - content = HTML of the page
+        - source_url = URL the page was loaded from
+        - link_classifier = LinkClassifier with the whitelist/blacklist rules
+        - search_index = SearchTermIndex of the terms to find results with
+    Output:
+        - Tuple containing all found links, relevant links and results (not deduplicated against earlier pages)
+    """
+    found_links = extract_links(content, source_url)
+    relevant_links, result_links = classify_links(source_url, found_links, link_classifier, search_index)
+    return found_links, relevant_links, result_links
+
+
 class HomepageScraper:
     default_whitelist = [
         r'news(room)?',
@@ -102,38 +163,115 @@ class HomepageScraper:
         r'https?://(www\.)?X\.com/[^/?#\s]+',
     ]
     def __init__(self, api_key: str, search_terms: list[str], whitelist_keywords: list[str] = None, blacklist_keywords: list[str] = None,
-                 max_depth: int = 3, headless: bool = True, stealth: bool = True, DEBUG: bool = False):
+                 max_depth: int = 3, headless: bool = True, stealth: bool = True, http_fast_path: bool = True,
+                 parse_workers: int = 0, dedup_backend: str = "exact", dedup_error_rate: float = 0.001,
+                 homepage_cache_path: str | None = None, browser_handler: BrowserHandler = None,
+                 homepage_resolver: HomepageResolver = None, crawl_graph_path: str | None = None,
+                 crawl_graph: CrawlGraph = None, revisit_interval: float = 24 * 3600, politeness: bool = True,
+                 host_scheduler: HostScheduler = None, sitemap_discovery: bool = True, storage_state_dir: str | None = None,
+                 http_cache_dir: str | None = None, metrics: Metrics = None, journal_dir: str | None = None,
+                 DEBUG: bool = False):
         self.api_key = api_key
         self.DEBUG = DEBUG
         self.max_depth = max_depth
-        self.header = {"Accept": "application/json", "X-Subscription-Token": api_key}
         self.brave_url = "https://api.search.brave.com/res/v1/web/search"
 
-        self.browser_handler = BrowserHandler(headless = headless, stealth = stealth, DEBUG = DEBUG)
+        # A shared resolver (ex. across a batch of companies) is left open by stop()
+        self.owns_homepage_resolver = homepage_resolver is None
+        self.homepage_resolver = homepage_resolver or HomepageResolver(api_key, brave_url = self.brave_url,
+                                                                       cache_path = homepage_cache_path, DEBUG = DEBUG)
+
+        # Stage timings and counters; only recorded in DEBUG mode unless a Metrics instance is given
+        self.metrics = metrics or (Metrics(DEBUG = DEBUG) if DEBUG else null_metrics)
+        self.browser_handler = browser_handler or BrowserHandler(headless = headless, stealth = stealth, storage_state_dir = storage_state_dir,
+                                                                 http_cache_dir = http_cache_dir, metrics = self.metrics, DEBUG = DEBUG)
+        self.fetcher = TieredFetcher(self.browser_handler, http_enabled = http_fast_path, metrics = self.metrics, DEBUG = DEBUG)
+        # Per-host concurrency caps and rate limits between the crawl queue and the fetcher (None = no limits)
+        self.host_scheduler = host_scheduler or (HostScheduler(DEBUG = DEBUG) if politeness else None)
+        # robots.txt / sitemap discovery seeding the crawl queue with hubs and results without loading pages
+        self.sitemap_discovery = SitemapDiscovery(headers = TieredFetcher.default_headers, host_scheduler = self.host_scheduler,
+                                                  DEBUG = DEBUG) if sitemap_discovery else None
+
+        # Optional process pool for HTML parsing and link processing (0 = parse on the event loop thread)
+        self.parse_workers = parse_workers
+        self.parse_executor = None
 
         self.company_homepage = None
 
         whitelist_keywords = whitelist_keywords or self.default_whitelist
         blacklist_keywords = blacklist_keywords or self.default_blacklist
-        self.whitelist_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in whitelist_keywords]
-        self.blacklist_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in blacklist_keywords]
+        self.link_classifier = LinkClassifier(whitelist_keywords, blacklist_keywords)
 
         self.search_terms: list[str] = search_terms
+        self.search_index: SearchTermIndex = build_search_index(tuple(search_terms or []))
         self.results: list[CrawlResult] = []
-        self.seen_links: set[str] = set()
-        self.processed_links: set[str] = set()
 
-    def update_search_terms(self, search_terms: list[str]) -> None:
+        # Frontier dedup stores ("exact" set, "fingerprint" 64-bit hash table, or scalable "bloom" filter)
+        self.dedup_backend = dedup_backend
+        self.dedup_error_rate = dedup_error_rate
+        self.seen_links = create_dedup_store(dedup_backend, dedup_error_rate)
+        self.processed_links = create_dedup_store(dedup_backend, dedup_error_rate)
+        # Sitemap links queued without anchor text: processed, but a page linking them can still make them results
+        self.sitemap_queued_links: set[str] = set()
+
+        # Incremental mode: a persisted crawl graph lets re-runs skip fresh/unchanged hub pages and repeat results
+        self.crawl_graph = crawl_graph or (CrawlGraph(crawl_graph_path) if crawl_graph_path else None)
+        self.revisit_interval = revisit_interval
+        self.incremental_counts = {"fresh": 0, "unchanged": 0, "changed": 0}
+
+        # Checkpoint/resume: each crawl is journaled to <journal_dir>/<homepage>.jsonl and resumed after an interruption
+        self.journal_dir = journal_dir
+        self.journal: CrawlJournal | None = None
+
+    async def start(self) -> None:
+        """
+        Purpose: Start the browser, the pooled HTTP client used for fetching pages and the parse process pool
+        """
+        if self.company_homepage:
+            # The new browser context only gets the saved cookies/localStorage of the company's own site
+            self.browser_handler.site = site_domain(urlparse(self.company_homepage).hostname or "")
+        await self.browser_handler.start()
+        await self.fetcher.start()
+        if self.parse_workers and not self.parse_executor:
+            # Forking a process with a running event loop and Playwright threads is unsafe, so workers are spawned
+            self.parse_executor = ProcessPoolExecutor(max_workers = self.parse_workers,
+                                                      mp_context = multiprocessing.get_context("spawn"))
+
+    async def stop(self) -> None:
+        """
+        Purpose: Close the browser, the pooled HTTP clients and the parse process pool, and write buffered metrics events
+        """
+        await self.fetcher.stop()
+        if self.owns_homepage_resolver:
+            await self.homepage_resolver.stop()
+        await self.browser_handler.stop()
+        if self.parse_executor:
+            self.parse_executor.shutdown(cancel_futures = True)
+            self.parse_executor = None
+        # Flushed rather than closed: a Metrics instance may be shared by later crawls (ex. ScraperHandler)
+        self.metrics.flush()
+
+    def update_search_terms(self, search_terms: list[str], word_boundary: bool = False,
+                            fuzzy_threshold: int | None = None) -> None:
         self.search_terms = search_terms
+        self.search_index = build_search_index(tuple(search_terms or []), word_boundary, fuzzy_threshold)
 
     def reset_search_values(self) -> None:
         self.company_homepage = None
         self.search_terms = []
+        self.search_index = build_search_index(())
         self.results = []
-        self.seen_links = set()
-        self.processed_links = set()
+        self.reset_link_stores()
 
-    def find_company_homepage(self, company: str) -> str | None:
+    def reset_link_stores(self) -> None:
+        """
+        Purpose: Forget which links were already seen/processed, so every page is classified in full again
+        """
+        self.seen_links = create_dedup_store(self.dedup_backend, self.dedup_error_rate)
+        self.processed_links = create_dedup_store(self.dedup_backend, self.dedup_error_rate)
+        self.sitemap_queued_links = set()
+
+    async def find_company_homepage(self, company: str) -> str | None:
         """
         Purpose: Find company's homepage
         Input:
@@ -142,52 +280,15 @@ class HomepageScraper:
             - Company homepage
         Effect: Updates self.company_homepage
         """
-        def generate_brave_api_parameters(company_name: str) -> dict[str, str | int]:
-            """
-            Purpose: Create parameters to connect to Brave API
-            """
-            query = f"{company_name} official website"
-            if self.DEBUG:
-                print(f"[DEBUG][HOMEPAGE] Query: {query}")
-            return {"q": query, "count": 5, "source": "web"}
+        self.company_homepage = await self.homepage_resolver.resolve(company)
+        return self.company_homepage
 
-        def fuzzy_match(string1: str, string2: str, threshold: int = 45) -> bool:
-            """
-            Purpose: Match strings using fuzzy matching
-            """
-            return fuzz.ratio(string1.lower(), string2.lower()) >= threshold
-
-        parameters = generate_brave_api_parameters(company)
-        session = requests.Session()
-        session.mount("https://", HTTPAdapter(max_retries=Retry(total=3, backoff_factor=0.5)))
-        response = session.get(self.brave_url, headers=self.header, params=parameters)
-
-        if response.status_code != 200:
-            return None
-
-        results = response.json().get("web", {}).get("results", [])
-        company_domain = company.lower()
-
-        for result in results:
-            link = result.get("url", "")
-            result_domain = tldextract.extract(urlparse(link).netloc).domain.lower()
-            if fuzzy_match(company_domain, result_domain):
-                self.company_homepage = link
-                if self.DEBUG:
-                    print(f"[DEBUG][HOMEPAGE] Matched domain: {link}")
-                break
-        if self.company_homepage:
-            return self.company_homepage
-        else:
-            if self.DEBUG:
-                print(f'[DEBUG][HOMEPAGE] No homepage found')
-            return None
-
-    async def _scrape_for_links(self, start_url: str = None) -> tuple[str, dict[str, str]] | None:
+    async def _scrape_for_links(self, start_url: str = None, content: str = None) -> tuple[str, dict[str, str]] | None:
         """
         Purpose: scrape a designated page for all possible links and their anchor text
         Input:
             - start_url = URL to start scraping from
+            - content = HTML of start_url if it was already fetched
         Output:
             - Tuple containing starting url and a dict with links and their anchor text
         Effect: Adds any found links to self.seen_links
@@ -197,63 +298,18 @@ class HomepageScraper:
             print("Set Company Homepage First")
             return None
 
-        content = await self.browser_handler.get_page_content(start_url)
+        if content is None:
+            content = await self._fetch_page(start_url)
         if not content:
             return None
 
-        soup = BeautifulSoup(content, "lxml")
+        # Single streaming pass over anchors, onclick redirects, data-url/data-href and meta refresh
         found_links: dict[str, str] = {}
-
-        # 1) Find links having standard anchor (<a>) tags with href attribute
-        for tag in soup.find_all("a", href=True):
-            href = tag["href"].strip()
-            anchor_text = tag.get_text(separator=" ").strip()
-            full_url = urljoin(start_url, unquote(href))
-            parsed = urlparse(full_url)
-            if parsed.scheme not in {"http", "https"}:
-                continue
-
-            normalized_url = normalize_url(full_url)
-            if normalized_url and normalized_url not in self.seen_links:
+        for normalized_url, anchor_text in extract_links(content, start_url).items():
+            if normalized_url not in self.seen_links:
                 found_links[normalized_url] = anchor_text
                 self.seen_links.add(normalized_url)
 
-        # 2) Find JavaScript-driven links via onclick attributes
-        onclick_elements = soup.find_all(attrs={"onclick": True})
-        onclick_pattern = re.compile(r"location\.href\s*=\s*['\"](.*?)['\"]", re.IGNORECASE)
-        for el in onclick_elements:
-            onclick = el["onclick"]
-            match = onclick_pattern.search(onclick)
-            if match:
-                full_url = urljoin(start_url, match.group(1).strip())
-                normalized_url = normalize_url(full_url)
-                if normalized_url and normalized_url not in self.seen_links:
-                    found_links[normalized_url] = ""  # No anchor text
-                    self.seen_links.add(normalized_url)
-
-        # 3) Find links embedded in custom data attributes (data-url, data-href)
-        for attr in ("data-url", "data-href"):
-            data_elements = soup.find_all(attrs={attr: True})
-            for el in data_elements:
-                data_url = el[attr].strip()
-                full_url = urljoin(start_url, data_url)
-                normalized_url = normalize_url(full_url)
-                if normalized_url and normalized_url not in self.seen_links:
-                    found_links[normalized_url] = ""  # No anchor text
-                    self.seen_links.add(normalized_url)
-
-        # 4) Find meta refresh redirect links
-        meta_refresh = soup.find("meta", attrs={"http-equiv": "refresh"})
-        if meta_refresh:
-            content_attr = meta_refresh.get("content", "")
-            match = re.search(r"url=(.+)", content_attr, re.IGNORECASE)
-            if match:
-                full_url = urljoin(start_url, match.group(1).strip())
-                normalized_url = normalize_url(full_url)
-                if normalized_url and normalized_url not in self.seen_links:
-                    found_links[normalized_url] = ""  # No anchor text
-                    self.seen_links.add(normalized_url)
-
         if self.DEBUG:
             print(f"[DEBUG][HOMEPAGE] Collected {len(found_links)} links from: {start_url}")
 
@@ -269,82 +325,208 @@ class HomepageScraper:
             - result_links = CrawlResult objects where anchor or path matches search terms
         Effect: Adds any processed links to self.processed_links
         """
-        def is_article(path: str) -> bool:
-            """
-            Purpose: determine if path is likely to be an article
-            """
-            parsed = urlparse(path)
-            path = parsed.path.lower().strip("/") or path.lower().strip("/")
-            if not path:
-                return False
-            # Check for overly long slug [ ex) https://news.lenovo.com/long-article-title-with-many-hyphens ]
-            slug = path.split("/")[-1]
-            parts = slug.split("-")
-            if len(parts) >= 4 and sum(len(p) for p in parts) > 30:
-                return True
-            # Check for common date formats
-            if re.search(r'/\d{4}([/-])?\d{2}(([/-])?\d{2})?([/-])?', f"/{path}/"):  # /yyyy/mm/dd OR /yyyy-mm-dd OR /yyyymmdd
-                return True
-            if re.search(r'/\d{2}([/-])?\d{2}(([/-])?\d{4})?([/-])?', f"/{path}/"):  # /dd/mm/yyyy OR /dd-mm-yyyy OR /ddmmyyyy
-                return True
-            # Check for a UUID pattern
-            if re.search(r'[a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}', path):
-                return True
+        source = links[0]
+        links_to_process: dict[str, str] = {}
+        sitemap_links: dict[str, str] = {}
+
+        for link, anchor_text in links[1].items():
+            if link in self.sitemap_queued_links:
+                # Already queued from a sitemap, so only its anchor text is left to check for results
+                self.sitemap_queued_links.discard(link)
+                sitemap_links[link] = anchor_text
+                continue
+            if link in self.processed_links:
+                continue
+            self.processed_links.add(link) # Add any processed links to list to avoid re-processing unnecessarily
+            links_to_process[link] = anchor_text
 
-            return False
+        relevant_links, result_links = classify_links(source, links_to_process, self.link_classifier, self.search_index,
+                                                      DEBUG = self.DEBUG)
+        if sitemap_links:
+            result_links += classify_links(source, sitemap_links, self.link_classifier, self.search_index,
+                                           DEBUG = self.DEBUG)[1]
+        return relevant_links, result_links
 
-        def is_relevant(path: str) -> bool:
-            """
-            Purpose: determine if path is likely to be a relevant link
-            """
-            path_lower = path.lower()
-            article_check = is_article(path_lower)
-            has_whitelist_match = any(pattern.search(path_lower) for pattern in (self.whitelist_patterns or []))
-            has_blacklist_match = any(pattern.search(path_lower) for pattern in (self.blacklist_patterns or []))
+    async def _fetch_page(self, url: str) -> str | None:
+        """
+        Purpose: Fetch a page through the fetcher, waiting for a slot from the host scheduler first
+        Input:
+            - url = URL of page to fetch
+        Output:
+            - HTML of the page, or None if it could not be fetched
+        """
+        if not self.host_scheduler:
+            with self.metrics.timer("fetch", url):
+                return await self.fetcher.get_page_content(url)
+        waiting_since = time.perf_counter()
+        async with self.host_scheduler.slot(url) as slot:
+            self.metrics.observe("host_wait", (time.perf_counter() - waiting_since) * 1000, url)
+            with self.metrics.timer("fetch", url):
+                return await self.fetcher.get_page_content(url, slot)
+
+    def _graph_signature(self) -> str:
+        """
+        Purpose: Key the crawl graph by everything that decides relevant links and results, so crawls with other
+                 search terms or keywords sharing the graph never reuse each other's pages and results
+        """
+        return graph_signature(self.link_classifier.whitelist_keywords, self.link_classifier.blacklist_keywords,
+                               sorted(self.search_index.search_terms), self.search_index.word_boundary,
+                               self.search_index.fuzzy_threshold)
 
-            # If there is a whitelist match AND no blacklist match AND it's not an article, return True
-            return has_whitelist_match and not has_blacklist_match and not article_check
+    def _journal_signature(self) -> str:
+        """
+        Purpose: Key the crawl journal by the crawl graph's settings signature plus max_depth, since a journaled
+                 frontier and its results only fit a crawl that classifies links and stops at the same depth
+        """
+        return graph_signature(self._graph_signature(), self.max_depth)
 
-        def is_result(text: str) -> list[str] | None:
-            """
-            Purpose: determine if path is likely to be a result
-            """
-            matches = [term for term in self.search_terms if term.lower() in text.lower()]
-            return matches if matches else None
+    def _replay_links(self, record: PageRecord) -> list[str]:
+        """
+        Purpose: Follow the relevant links stored for a page in the crawl graph without fetching it
+        Input:
+            - record = Stored page from the crawl graph
+        Output:
+            - Stored relevant links that have not been seen before in this crawl
+        Effect: Adds the returned links to self.seen_links and self.processed_links
+        """
+        new_links = [link for link in record.links if link not in self.processed_links]
+        self.seen_links.update(new_links)
+        self.processed_links.update(new_links)
+        return new_links
 
-        source = links[0]
-        links_to_process = links[1]
-        relevant_links: list[str] = []
-        result_links: list[CrawlResult] = []
+    async def _crawl_page(self, url: str, depth: int = 0) -> tuple[list[str], list[CrawlResult]] | None:
+        """
+        Purpose: Fetch a page, then extract and classify its links either inline or in the parse process pool.
+                 With a crawl graph, pages fetched within revisit_interval are not fetched again, unchanged pages
+                 are not parsed again, and results emitted by an earlier crawl are dropped
+        Input:
+            - url = URL of page to crawl
+            - depth = Link depth of the page
+        Output:
+            - Tuple containing relevant links and results that have not been seen before
+        Effect: Adds any found links to self.seen_links and self.processed_links, updates the crawl graph
+        """
+        signature = self._graph_signature() if self.crawl_graph else ""
+        record = self.crawl_graph.get_page(url, signature) if self.crawl_graph else None
+        if record and time.time() - record.last_fetched < self.revisit_interval:
+            self.incremental_counts["fresh"] += 1
+            return self._replay_links(record), []
 
-        for link, anchor_text in links_to_process.items():
-            if link in self.processed_links:
-                continue
-            self.processed_links.add(link) # Add any processed links to list to avoid re-processing unnecessarily
+        content = await self._fetch_page(url)
+        if not content:
+            return None
+        if not self.crawl_graph:
+            return await self._parse_content(url, content)
+
+        page_hash = content_hash(content)
+        if record and record.content_hash == page_hash:
+            self.crawl_graph.touch_page(url, signature)
+            self.incremental_counts["unchanged"] += 1
+            return self._replay_links(record), []
+
+        self.incremental_counts["changed"] += 1
+        crawled = await self._parse_content(url, content)
+        if not crawled:
+            return None
+        relevant_links, result_links = crawled
+        self.crawl_graph.record_page(url, depth, page_hash, relevant_links, signature)
+        new_results = self.crawl_graph.new_results([result.url for result in result_links], signature)
+        return relevant_links, [result for result in result_links if result.url in new_results]
 
-            stripped_link = strip_common_path(source, link)
-            if not stripped_link:
-                continue
+    async def _parse_content(self, url: str, content: str) -> tuple[list[str], list[CrawlResult]] | None:
+        """
+        Purpose: Extract and classify the links of a fetched page either inline or in the parse process pool
+        Input:
+            - url = URL the page was loaded from
+            - content = HTML of the page
+        Output:
+            - Tuple containing relevant links and results that have not been seen before
+        Effect: Adds any found links to self.seen_links and self.processed_links
+        """
+        if self.parse_executor is None:
+            with self.metrics.timer("parse", url):
+                links_to_process = await self._scrape_for_links(url, content)
+            if not links_to_process:
+                return None
+            with self.metrics.timer("process", url):
+                return self._process_links(links_to_process)
+
+        # CPU-heavy parsing runs in a worker process; dedup against shared state stays here on the coordinator
+        loop = asyncio.get_running_loop()
+        with self.metrics.timer("parse", url):  # Includes classification, which runs in the same worker call
+            found_links, relevant_links, result_links = await loop.run_in_executor(
+                self.parse_executor, parse_page, content, url, self.link_classifier, self.search_index)
+
+        new_links = {link for link in found_links if link not in self.seen_links and link not in self.processed_links}
+        self.seen_links.update(new_links)
+        self.processed_links.update(new_links)
+        # Links already queued from a sitemap are not queued again, but their anchor text can still make them results
+        sitemap_links = {link for link in found_links if link in self.sitemap_queued_links}
+        self.sitemap_queued_links -= sitemap_links
+        self.seen_links.update(sitemap_links)
 
-            relevant = is_relevant(stripped_link)
-            matched_terms = is_result(stripped_link + " " + anchor_text)
+        if self.DEBUG:
+            print(f"[DEBUG][HOMEPAGE] Collected {len(new_links)} links from: {url}")
 
-            if relevant:
-                relevant_links.append(link)
-            if matched_terms:
-                result_links.append(CrawlResult(
-                    url = link,
-                    text = anchor_text,
-                    matched_terms = matched_terms
-                ))
+        return ([link for link in relevant_links if link in new_links],
+                [result for result in result_links if result.url in new_links or result.url in sitemap_links])
 
+    async def _seed_from_sitemaps(self, queue: asyncio.Queue, emit) -> int:
+        """
+        Purpose: Classify the company's sitemap URLs like links found on the homepage, queue the relevant ones and
+                 emit the results, most recently modified first
+        Input:
+            - queue = Crawl queue of (link, depth)
+            - emit = Coroutine function receiving each batch of results
+        Output:
+            - Number of results emitted
+        Effect: Adds result sitemap links to self.seen_links and self.processed_links, and queued ones to
+                self.processed_links and self.sitemap_queued_links
+        """
+        try:
+            with self.metrics.timer("sitemaps", self.company_homepage):
+                entries = await self.sitemap_discovery.discover(
+                    self.company_homepage, prioritize = self.link_classifier.whitelist_matcher.search)
+        except Exception as e:
             if self.DEBUG:
-                print(f'[DEBUG][HOMEPAGE] Processed link: {stripped_link}')
-                print(f"                  Relevant: {relevant}")
-                print(f"                  Matched Terms: {matched_terms}")
+                print(f"[DEBUG][HOMEPAGE][ERROR] Sitemap discovery failed: {e}")
+            return 0
+
+        links: dict[str, str] = {}
+        for entry in entries:
+            normalized_url = normalize_url(entry.loc)
+            if normalized_url and normalized_url not in self.seen_links and normalized_url not in self.processed_links:
+                links[normalized_url] = ""
+
+        # Sitemap links have no anchor text, so links that are not used here stay unmarked, and queued links are not
+        # marked seen: a page linking them later in the crawl can still match them on its anchor text
+        relevant_links, result_links = classify_links(self.company_homepage, links, self.link_classifier,
+                                                      self.search_index, DEBUG = self.DEBUG)
+        result_urls = {result.url for result in result_links}
+        self.seen_links.update(result_urls)
+        self.processed_links.update(result_urls)
+        if self.max_depth >= 1:
+            queued_links = [link for link in relevant_links if link not in result_urls]
+            self.processed_links.update(queued_links)
+            self.sitemap_queued_links.update(queued_links)
+        if self.crawl_graph:
+            # Like results found on pages, results an earlier crawl already emitted are dropped (and never journaled)
+            new_results = self.crawl_graph.new_results([result.url for result in result_links], self._graph_signature())
+            result_links = [result for result in result_links if result.url in new_results]
+        if self.max_depth >= 1:
+            for relevant_link in relevant_links:
+                queue.put_nowait((relevant_link, 1))
+        if self.journal:
+            self.journal.record(queued = [(link, 1) for link in relevant_links] if self.max_depth >= 1 else [],
+                                results = [(result.url, result.text, result.matched_terms) for result in result_links],
+                                sitemaps = True)
 
-        return relevant_links, result_links
+        if self.DEBUG:
+            print(f"[DEBUG][HOMEPAGE] Sitemaps: {len(links)} links, {len(relevant_links)} queued, {len(result_links)} results")
 
+        if result_links:
+            await emit(result_links)
+        return len(result_links)
 
     async def crawl(self, max_tabs: int = 10) -> None:
         """
@@ -353,52 +535,201 @@ class HomepageScraper:
             - max_tabs = max number of concurrent tabs able to be opened by Playwright
         Effect: Add results to self.results
         """
-        semaphore = asyncio.Semaphore(max_tabs)
-        queue: list[tuple[str, int]] = [(self.company_homepage, 0)]
-        iterations = 1
+        async def store(result_links: list[CrawlResult]) -> None:
+            self.results.extend(result_links)
 
-        async def scrape_and_process(link: str, depth: int):
-            """
-            Purpose: asynchronously scrape and process a link
-            """
-            async with semaphore:
-                links_to_process = await self._scrape_for_links(link)
-                if not links_to_process:
-                    return []
-
-                relevant_links, result_links = self._process_links(links_to_process)
-                self.results.extend(result_links)
+        await self._run_crawl(max_tabs, store)
 
-                # Return new links to crawl with incremented depth
-                return [(rl, depth + 1) for rl in relevant_links if depth + 1 <= self.max_depth]
+    async def crawl_iter(self, max_tabs: int = 10, buffer_size: int = 100) -> AsyncIterator[CrawlResult]:
+        """
+        Purpose: Crawl like crawl(), but yield each result as soon as it is found
+            - ex) async for result in scraper.crawl_iter(): ...
+        Inputs:
+            - max_tabs = max number of concurrent tabs able to be opened by Playwright
+            - buffer_size = max number of results waiting for the consumer; workers that find more wait (backpressure)
+        Output:
+            - CrawlResult objects in the order they are found
+        Effect: Results are not added to self.results. Leaving the loop early cancels the crawl
+        """
+        buffer: asyncio.Queue[CrawlResult] = asyncio.Queue(maxsize = buffer_size)
+
+        async def emit(result_links: list[CrawlResult]) -> None:
+            for result in result_links:
+                await buffer.put(result)  # Blocks the worker while the consumer is behind
+
+        crawl_task = asyncio.create_task(self._run_crawl(max_tabs, emit))
+        try:
+            while True:
+                if not buffer.empty():
+                    yield buffer.get_nowait()
+                    continue
+                if crawl_task.done():
+                    break
+                getter = asyncio.ensure_future(buffer.get())
+                await asyncio.wait((getter, crawl_task), return_when = asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    yield getter.result()
+                else:
+                    getter.cancel()
+            crawl_task.result()  # Raise any error from the crawl itself
+        finally:
+            if not crawl_task.done():
+                crawl_task.cancel()
+                await asyncio.gather(crawl_task, return_exceptions = True)
+
+    async def _resume_from_journal(self, queue: asyncio.Queue, emit) -> bool | None:
+        """
+        Purpose: Open the crawl journal of the company homepage and rebuild the queue, dedup stores and results from it
+        Input:
+            - queue = Crawl queue of (link, depth)
+            - emit = Coroutine function receiving the results already found by the interrupted crawl
+        Output:
+            - True if an interrupted crawl was resumed, False for a new crawl, None if the crawl finished within
+              revisit_interval (its results are emitted and nothing is crawled)
+        Effect: Sets self.journal (None without journal_dir)
+        """
+        if not self.journal_dir:
+            return False
+        self.journal = CrawlJournal.for_site(self.journal_dir, self.company_homepage, DEBUG = self.DEBUG)
+        signature = self._journal_signature()
+        state = self.journal.open(signature)
+        if state.complete and time.time() - state.completed_at >= self.revisit_interval:
+            self.journal.discard()
+            self.journal.open(signature)
+            return False
+        if not state.seen:
+            return False
 
+        # Queued and result URLs are enough for dedup: other links seen before are neither queued nor results
+        self.seen_links.update(state.seen)
+        self.processed_links.update(state.seen)
+        for url, depth in state.frontier.items():
+            queue.put_nowait((url, depth))
         if self.DEBUG:
-            print(f"[DEBUG][HOMEPAGE][BEGIN] Beginning Crawl")
-
-        while queue:
-            if self.DEBUG:
-                print(f"[DEBUG][HOMEPAGE][CRAWL #{iterations}][BEGIN]")
-
-            # Launch concurrent scraping tasks
-            tasks = [scrape_and_process(link, depth) for link, depth in queue]
-            relevant_links = await asyncio.gather(*tasks)
+            print(f"[DEBUG][HOMEPAGE] {'Reusing finished' if state.complete else 'Resuming'} crawl of "
+                  f"{self.company_homepage}: {len(state.frontier)} queued, {len(state.results)} results")
+
+        # Results of the earlier run are emitted again so this crawl's output is complete
+        if state.results:
+            await emit([CrawlResult(url, text, terms) for url, (text, terms) in state.results.items()])
+        if state.complete:
+            self.journal.close()
+            self.journal = None
+            return None
+        return True
 
-            # Combine results into singular list and add all relevant links to queue
-            queue = [link for sublist in relevant_links for link in sublist]
+    async def _run_crawl(self, max_tabs: int, emit) -> None:
+        """
+        Purpose: Crawl from the company homepage with a fixed pool of workers, passing results to emit as they are found
+        Inputs:
+            - max_tabs = max number of concurrent tabs able to be opened by Playwright
+            - emit = Coroutine function receiving each batch of new results
+        """
+        queue: asyncio.Queue[tuple[str, int]] = asyncio.Queue()
+        pages_crawled = 0
+        results_found = 0
+        self.fetcher.reset_metrics()
+        self.incremental_counts = {"fresh": 0, "unchanged": 0, "changed": 0}
+
+        resumed = await self._resume_from_journal(queue, emit)
+        if resumed is None:
+            return  # Finished recently; its results were emitted from the journal
+        seed_sitemaps = self.sitemap_discovery and not (resumed and self.journal.state.sitemaps_done)
+        if not resumed:
+            queue.put_nowait((self.company_homepage, 0))
+            if self.journal:
+                self.journal.record(queued = [(self.company_homepage, 0)])
+
+        async def worker(worker_id: int) -> None:
+            """
+            Purpose: pull links from the queue, scrape and process them, and queue any relevant links found
+            """
+            nonlocal pages_crawled, results_found
+            while True:
+                link, depth = await queue.get()
+                try:
+                    crawled = await self._crawl_page(link, depth)
+                    if not crawled:
+                        if self.journal:
+                            self.journal.record(fetched = link)
+                        continue
+
+                    relevant_links, result_links = crawled
+                    self.metrics.count("pages_crawled", url = link)
+
+                    # Queue new links to crawl with incremented depth
+                    if depth + 1 > self.max_depth:
+                        relevant_links = []
+                    for relevant_link in relevant_links:
+                        queue.put_nowait((relevant_link, depth + 1))
+
+                    if result_links:
+                        results_found += len(result_links)
+                        self.metrics.count("results", len(result_links), link)
+                        await emit(result_links)
+
+                    # Journaled after the results are emitted: an interrupted page is crawled again on resume
+                    if self.journal:
+                        self.journal.record(fetched = link, queued = [(relevant_link, depth + 1) for relevant_link in relevant_links],
+                                            results = [(result.url, result.text, result.matched_terms) for result in result_links])
+
+                    pages_crawled += 1
+                    if self.DEBUG:
+                        print(f"[DEBUG][HOMEPAGE][WORKER #{worker_id}] Crawled (depth {depth}): {link}")
+                        print(f"                            Links Still In Queue: {queue.qsize()}")
+                        print(f"                            Total Results Found: {results_found}")
+                except Exception as e:
+                    if self.DEBUG:
+                        print(f"[DEBUG][HOMEPAGE][WORKER #{worker_id}][ERROR] Failed to crawl {link}: {e}")
+                    if self.journal:
+                        self.journal.record(fetched = link)
+                finally:
+                    queue.task_done()
 
-            if self.DEBUG:
-                print(f"[DEBUG][HOMEPAGE][CRAWL #{iterations}] Links Still In Queue: {len(queue)}")
-                print(f"                            Total Results Found: {len(self.results)}")
-                print(f"[DEBUG][HOMEPAGE][CRAWL #{iterations}][END]")
-            iterations += 1
+        if self.DEBUG:
+            print(f"[DEBUG][HOMEPAGE][BEGIN] Beginning Crawl")
 
-        await self.browser_handler.reset_headless()
+        # Fixed pool of workers, one per tab; the crawl is finished once every queued link is done
+        workers = [asyncio.create_task(worker(i + 1)) for i in range(max_tabs)]
+        try:
+            # Sitemaps are read while the homepage is being crawled; their links are queued before waiting on the queue
+            if seed_sitemaps:
+                sitemap_results = await self._seed_from_sitemaps(queue, emit)
+                results_found += sitemap_results
+            await queue.join()
+            if self.journal:
+                self.journal.finish()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            if self.journal:
+                self.journal.close()  # Interrupted crawls keep their journal for the next run
+                self.journal = None
 
         if self.DEBUG:
             print(f"[DEBUG][HOMEPAGE][END] Crawl Completed:")
+            print(f"                       {pages_crawled} Pages Crawled")
             print(f"                       {len(self.seen_links)} Links Seen")
             print(f"                       {len(self.processed_links)} Links Processed")
-            print(f"                       {len(self.results)} Results Found")
+            print(f"                       {results_found} Results Found")
+            print(f"                       Fetches Per Tier: {self.fetcher.tier_counts}")
+            if self.host_scheduler:
+                print(f"                       Host Backoffs: {self.host_scheduler.backoffs}")
+            blocked = self.browser_handler.request_blocker.totals
+            print(f"                       Browser Requests Blocked: {blocked.requests} "
+                  f"(~{blocked.estimated_bytes / 1e6:.1f} MB saved, all crawls)")
+            if self.crawl_graph:
+                print(f"                       Incremental Pages (fresh/unchanged/changed): "
+                      f"{self.incremental_counts['fresh']}/{self.incremental_counts['unchanged']}/"
+                      f"{self.incremental_counts['changed']}")
+            print(f"                       Dedup Memory ({self.dedup_backend}): "
+                  f"{memory_per_million(self.seen_links):.1f} MB seen / "
+                  f"{memory_per_million(self.processed_links):.1f} MB processed per million URLs")
+            if self.metrics.enabled:
+                print(f"                       Stage Timings And Counters (all crawls):")
+                for line in self.metrics.format_summary().splitlines():
+                    print(f"                           {line}")
 
 async def main() -> None:
 
@@ -411,15 +742,15 @@ async def main() -> None:
     scraper = HomepageScraper(BRAVE_API_KEY, SEARCH_TERMS,
                               max_depth=3, headless = True, DEBUG=DEBUG_MODE)
 
-    await scraper.browser_handler.start()
+    await scraper.start()
 
-    homepage = scraper.find_company_homepage(COMPANY)
+    homepage = await scraper.find_company_homepage(COMPANY)
 
     if homepage:
         await scraper.crawl()
         print(scraper.results)
 
-    await scraper.browser_handler.stop()
+    await scraper.stop()
 
 
 if __name__ == "__main__":
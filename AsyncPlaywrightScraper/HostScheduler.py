@@ -0,0 +1,176 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        """
+        Purpose: Rate limiter allowing `rate` requests per second on average with bursts of up to `burst` requests
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> None:
+        """
+        Purpose: Wait until a token is available and take it (waiters are served in arrival order)
+        """
+        async with self.lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HostSlot:
+    throttle_statuses = (429, 503)
+
+    def __init__(self, host: str):
+        """
+        Purpose: Permission to fetch one URL from a host. Fetchers record the outcome on it for the AIMD controller
+        """
+        self.host = host
+        self.status: int | None = None
+        self.retry_after: float | None = None
+        self.timed_out = False
+        self.started = time.monotonic()
+
+    def record_status(self, status: int, retry_after: str | None = None) -> None:
+        self.status = status
+        if retry_after and retry_after.strip().isdigit():
+            self.retry_after = float(retry_after)
+
+    def record_timeout(self) -> None:
+        self.timed_out = True
+
+    @property
+    def throttled(self) -> bool:
+        """
+        Purpose: determine if the host told us to slow down (retrying elsewhere right away would only make it worse)
+        """
+        return self.status in self.throttle_statuses
+
+
+class HostState:
+    def __init__(self, limit: float, rate: float, burst: float):
+        self.limit = limit
+        self.active = 0
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+        self.bucket = TokenBucket(rate, burst)
+        self.condition = asyncio.Condition()
+
+
+class HostScheduler:
+    def __init__(self, initial_per_host: int = 4, max_per_host: int = 8, initial_rate: float = 4.0,
+                 min_rate: float = 0.2, max_rate: float = 16.0, burst: float = 4.0, decrease_factor: float = 0.5,
+                 fast_ms: float = 2000, max_pause: float = 60.0, DEBUG: bool = False):
+        """
+        Purpose: Per-host politeness between the crawl queue and the fetcher. Each host gets a concurrency cap and a
+                 token-bucket rate limit, both adjusted by an AIMD controller: halved on 429/503/timeouts and
+                 raised a little after every fast success
+        Input:
+            - initial_per_host / max_per_host = starting and highest number of concurrent fetches per host
+            - initial_rate / min_rate / max_rate = starting, lowest and highest fetches per second per host
+            - burst = fetches a host may receive back-to-back before the rate limit applies
+            - decrease_factor = multiplier for the cap and rate when a host throttles us
+            - fast_ms = fetches faster than this (in ms) count as fast successes
+            - max_pause = longest Retry-After (seconds) honoured before fetching from a host again
+        """
+        self.initial_per_host = initial_per_host
+        self.max_per_host = max_per_host
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.decrease_factor = decrease_factor
+        self.fast_ms = fast_ms
+        self.max_pause = max_pause
+        self.DEBUG = DEBUG
+
+        self.hosts: dict[str, HostState] = {}
+        self.backoffs = 0
+        self._loop = None
+
+    def _host(self, host: str) -> HostState:
+        """
+        Purpose: Return a host's state, creating it on first use
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Learned limits survive a new event loop (ex. one per GUI search); waiting primitives cannot
+            self._loop = loop
+            for state in self.hosts.values():
+                state.active = 0
+                state.condition = asyncio.Condition()
+                state.bucket.lock = asyncio.Lock()
+        state = self.hosts.get(host)
+        if state is None:
+            state = HostState(self.initial_per_host, self.initial_rate, self.burst)
+            self.hosts[host] = state
+        return state
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """
+        Purpose: Wait for the host's concurrency cap, pause and rate limit, then hold a slot while fetching
+        Output:
+            - HostSlot for the fetch to record its outcome on
+                - ex) async with scheduler.slot(url) as slot: await fetcher.get_page_content(url, slot)
+        """
+        host = urlparse(url).netloc.lower()
+        state = self._host(host)
+
+        while (delay := state.paused_until - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+        async with state.condition:
+            await state.condition.wait_for(lambda: state.active < max(1, int(state.limit)))
+            state.active += 1
+
+        try:
+            await state.bucket.acquire()
+            slot = HostSlot(host)
+            start = time.perf_counter()
+            try:
+                yield slot
+            except asyncio.TimeoutError:
+                slot.record_timeout()
+                raise
+            finally:
+                self._adjust(state, slot, (time.perf_counter() - start) * 1000)
+        finally:
+            async with state.condition:
+                state.active -= 1
+                state.condition.notify_all()
+
+    def _adjust(self, state: HostState, slot: HostSlot, elapsed_ms: float) -> None:
+        """
+        Purpose: AIMD step - multiplicative decrease on throttling, additive increase on fast successes
+        """
+        if slot.throttled or slot.timed_out:
+            if slot.started < state.last_decrease:
+                return  # Sent before the last decrease; that decrease already answered this burst of throttling
+            state.last_decrease = time.monotonic()
+            state.limit = max(1.0, state.limit * self.decrease_factor)
+            state.bucket.rate = max(self.min_rate, state.bucket.rate * self.decrease_factor)
+            if slot.retry_after:
+                state.paused_until = max(state.paused_until, time.monotonic() + min(slot.retry_after, self.max_pause))
+            self.backoffs += 1
+            if self.DEBUG:
+                print(f"[DEBUG][SCHEDULER] Backing off {slot.host} ({slot.status or 'timeout'}): "
+                      f"{int(state.limit)} concurrent, {state.bucket.rate:.2f}/s")
+        elif slot.status is not None and slot.status < 400 and elapsed_ms < self.fast_ms:
+            # About +1 concurrent fetch and +1 fetch/s once a full window of fetches has succeeded quickly
+            state.limit = min(self.max_per_host, state.limit + 1 / state.limit)
+            state.bucket.rate = min(self.max_rate, state.bucket.rate + 1 / state.limit)
@@ -0,0 +1,126 @@
+import re
+from functools import lru_cache
+from urllib.parse import urlparse
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+
+class HyperscanMatcher:
+    def __init__(self, patterns: tuple[str, ...]):
+        """
+        Purpose: Multi-pattern matcher answering "does any pattern match?" in a single Hyperscan scan
+        """
+        self.database = hyperscan.Database()
+        flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+        self.database.compile(
+            expressions=[pattern.encode("utf-8") for pattern in patterns],
+            ids=list(range(len(patterns))),
+            flags=[flags] * len(patterns),
+        )
+        self.scratch = hyperscan.Scratch(self.database)
+
+    def search(self, text: str) -> bool:
+        matched = False
+
+        def on_match(pattern_id, start, end, flags, context):
+            nonlocal matched
+            matched = True
+            return True  # Stop scanning at the first match
+
+        try:
+            self.database.scan(text.encode("utf-8"), match_event_handler=on_match, scratch=self.scratch)
+        except hyperscan.ScanTerminated:
+            pass
+        return matched
+
+
+class NeverMatcher:
+    """
+    Purpose: Matcher for an empty keyword list
+    """
+    def search(self, text: str) -> bool:
+        return False
+
+
+@lru_cache(maxsize=None)
+def compile_keywords(patterns: tuple[str, ...], use_hyperscan: bool = True):
+    """
+    Purpose: Compile a keyword list into one matcher whose search() is true when any keyword matches
+    Input:
+        - patterns = REGEX patterns (matched case-insensitively)
+        - use_hyperscan = Set whether Hyperscan is used when it is installed
+    Output:
+        - Hyperscan matcher if available and able to compile the patterns, otherwise a single compiled alternation
+    Note: Cached per process, so worker processes compile each keyword set only once
+    """
+    if not patterns:
+        return NeverMatcher()
+    if use_hyperscan and hyperscan is not None:
+        try:
+            return HyperscanMatcher(patterns)
+        except Exception:
+            pass  # Unsupported syntax (ex. lookarounds, backreferences); fall back to Python regex
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE)
+
+
+class LinkClassifier:
+    article_patterns = [
+        r'/\d{4}([/-])?\d{2}(([/-])?\d{2})?([/-])?',  # /yyyy/mm/dd OR /yyyy-mm-dd OR /yyyymmdd
+        r'/\d{2}([/-])?\d{2}(([/-])?\d{4})?([/-])?',  # /dd/mm/yyyy OR /dd-mm-yyyy OR /ddmmyyyy
+        r'[a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}',  # UUID
+    ]
+    article_regex = re.compile("|".join(f"(?:{pattern})" for pattern in article_patterns))
+
+    def __init__(self, whitelist_keywords: list[str], blacklist_keywords: list[str], use_hyperscan: bool = True):
+        """
+        Purpose: Decide whether link paths are relevant using combined whitelist/blacklist matchers
+        Input:
+            - whitelist_keywords = REGEX patterns for relevant links
+            - blacklist_keywords = REGEX patterns for links to avoid
+            - use_hyperscan = Set whether Hyperscan is used when it is installed
+        """
+        self.whitelist_keywords = tuple(whitelist_keywords or [])
+        self.blacklist_keywords = tuple(blacklist_keywords or [])
+        self.use_hyperscan = use_hyperscan
+        self.whitelist_matcher = compile_keywords(self.whitelist_keywords, use_hyperscan)
+        self.blacklist_matcher = compile_keywords(self.blacklist_keywords, use_hyperscan)
+
+    def __reduce__(self):
+        # Rebuild from keywords when sent to a worker process (Hyperscan databases cannot be pickled)
+        return LinkClassifier, (list(self.whitelist_keywords), list(self.blacklist_keywords), self.use_hyperscan)
+
+    def is_article(self, path: str) -> bool:
+        """
+        Purpose: determine if path is likely to be an article
+        """
+        parsed = urlparse(path)
+        path = parsed.path.lower().strip("/") or path.lower().strip("/")
+        if not path:
+            return False
+        # Check for overly long slug [ ex) https://news.lenovo.com/long-article-title-with-many-hyphens ]
+        slug = path.split("/")[-1]
+        parts = slug.split("-")
+        if len(parts) >= 4 and sum(len(p) for p in parts) > 30:
+            return True
+        # Check for common date formats or a UUID
+        return self.article_regex.search(f"/{path}/") is not None
+
+    def is_relevant(self, path: str) -> bool:
+        """
+        Purpose: determine if path is likely to be a relevant link
+        """
+        path_lower = path.lower()
+
+        # If there is a whitelist match AND no blacklist match AND it's not an article, return True
+        return (bool(self.whitelist_matcher.search(path_lower))
+                and not self.blacklist_matcher.search(path_lower)
+                and not self.is_article(path_lower))
+
+    def classify(self, paths: list[str]) -> list[bool]:
+        """
+        Purpose: determine relevance for a batch of link paths in one call
+        """
+        return [self.is_relevant(path) for path in paths]
@@ -0,0 +1,142 @@
+import re
+from urllib.parse import urlparse, urljoin, unquote, urlunparse
+from lxml import etree
+
+
+def normalize_url(url: str) -> str | None:
+    """
+    Purpose: normalize URL
+    Input:
+        - url = url to normalize
+    Output:
+        - normalized URL
+    """
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https"):
+        return None
+    netloc = parsed.netloc.lower().lstrip("www.")
+    path = parsed.path.rstrip("/")
+    return urlunparse((parsed.scheme, netloc, path, '', '', ''))
+
+
+class LinkCollector:
+    onclick_pattern = re.compile(r"location\.href\s*=\s*['\"](.*?)['\"]", re.IGNORECASE)
+    meta_refresh_pattern = re.compile(r"url=(.+)", re.IGNORECASE)
+    data_attributes = ("data-url", "data-href")
+    # Text inside these elements is not anchor text (BeautifulSoup's get_text() skips it as well)
+    non_text_tags = ("script", "style", "template")
+
+    def __init__(self):
+        """
+        Purpose: lxml parser target that collects every link source in a single pass without building a tree
+        """
+        self.anchors: list[tuple[str, list[str]]] = []
+        self.onclick_links: list[str] = []
+        self.data_links: dict[str, list[str]] = {attr: [] for attr in self.data_attributes}
+        self.meta_refresh: str | None = None
+
+        self._open_anchors: list[tuple[str, list[str]]] = []
+        self._pending_text: list[str] = []
+        self._non_text_depth = 0
+
+    def _flush_text(self) -> None:
+        """
+        Purpose: Close the current text node and add it to every open anchor
+        """
+        if self._pending_text:
+            text = "".join(self._pending_text)
+            self._pending_text = []
+            for _, pieces in self._open_anchors:
+                pieces.append(text)
+
+    def start(self, tag, attrib) -> None:
+        self._flush_text()
+        if tag in self.non_text_tags:
+            self._non_text_depth += 1
+        if tag == "a" and "href" in attrib:
+            # Anchors are recorded in document order; their text pieces are filled in until the tag closes
+            anchor = (attrib["href"], [])
+            self.anchors.append(anchor)
+            self._open_anchors.append(anchor)
+
+        onclick = attrib.get("onclick")
+        if onclick is not None:
+            match = self.onclick_pattern.search(onclick)
+            if match:
+                self.onclick_links.append(match.group(1))
+
+        for attr in self.data_attributes:
+            value = attrib.get(attr)
+            if value is not None:
+                self.data_links[attr].append(value)
+
+        if tag == "meta" and self.meta_refresh is None and attrib.get("http-equiv", "").lower() == "refresh":
+            self.meta_refresh = attrib.get("content", "")
+
+    def end(self, tag) -> None:
+        self._flush_text()
+        if tag in self.non_text_tags and self._non_text_depth:
+            self._non_text_depth -= 1
+        if tag == "a" and self._open_anchors:
+            self._open_anchors.pop()
+
+    def data(self, data) -> None:
+        if self._open_anchors and not self._non_text_depth:
+            self._pending_text.append(data)
+
+    def comment(self, text) -> None:
+        # A comment ends the text node before it, so "x<!-- -->y" gives "x y" like two separate strings
+        self._flush_text()
+
+    def close(self):
+        self._flush_text()
+        self._open_anchors = []
+        return self
+
+
+def extract_links(content: str, source_url: str) -> dict[str, str]:
+    """
+    Purpose: Extract every navigable link from raw HTML in one streaming pass
+    Input:
+        - content = HTML of the page
+        - source_url = URL the page was loaded from, used to resolve relative links
+    Output:
+        - Dict of normalized links and their anchor text, in the order:
+          <a href> anchors, onclick redirects, data-url, data-href, meta refresh
+          (the first source to find a link decides its anchor text)
+    """
+    collector = LinkCollector()
+    parser = etree.HTMLParser(target=collector, recover=True)
+    try:
+        parser.feed(content)
+        parser.close()
+    except etree.Error:
+        collector.close()
+
+    found_links: dict[str, str] = {}
+
+    def add(url: str, anchor_text: str = "") -> None:
+        normalized_url = normalize_url(url)
+        if normalized_url and normalized_url not in found_links:
+            found_links[normalized_url] = anchor_text
+
+    # 1) Standard anchor (<a>) tags with href attribute
+    for href, pieces in collector.anchors:
+        add(urljoin(source_url, unquote(href.strip())), " ".join(pieces).strip())
+
+    # 2) JavaScript-driven links via onclick attributes
+    for onclick_url in collector.onclick_links:
+        add(urljoin(source_url, onclick_url.strip()))
+
+    # 3) Links embedded in custom data attributes (data-url, data-href)
+    for attr in collector.data_attributes:
+        for data_url in collector.data_links[attr]:
+            add(urljoin(source_url, data_url.strip()))
+
+    # 4) Meta refresh redirect link
+    if collector.meta_refresh:
+        match = collector.meta_refresh_pattern.search(collector.meta_refresh)
+        if match:
+            add(urljoin(source_url, match.group(1).strip()))
+
+    return found_links
@@ -0,0 +1,348 @@
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+
+# Upper bounds (ms) of the histogram buckets; one more bucket holds everything slower
+histogram_buckets_ms = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+
+class Histogram:
+    def __init__(self):
+        """
+        Purpose: Fixed-bucket latency histogram (constant memory however many samples are observed)
+        """
+        self.counts = [0] * (len(histogram_buckets_ms) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        self.counts[bisect_left(histogram_buckets_ms, value_ms)] += 1
+        self.count += 1
+        self.sum += value_ms
+        self.max = max(self.max, value_ms)
+
+    def quantile(self, q: float) -> float:
+        """
+        Purpose: Estimate a quantile as the upper bound of the bucket it falls in (capped at the largest sample)
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and i < len(histogram_buckets_ms):
+                return min(histogram_buckets_ms[i], self.max)
+        return self.max
+
+
+class StageTimer:
+    __slots__ = ("metrics", "stage", "url", "start")
+
+    def __init__(self, metrics: "Metrics", stage: str, url: str | None):
+        self.metrics = metrics
+        self.stage = stage
+        self.url = url
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        self.metrics.observe(self.stage, (time.perf_counter() - self.start) * 1000, self.url)
+        return False
+
+
+class MemorySink:
+    name = "memory"
+    wants_events = False  # Set on sinks that receive every event, not just the aggregates
+
+    def attach(self, metrics: "Metrics") -> None:
+        """
+        Purpose: Nothing to set up; Metrics keeps the in-memory aggregates that Metrics.summary() reports
+        """
+
+    def emit(self, event: dict) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class JsonLinesSink(MemorySink):
+    name = "jsonl"
+    wants_events = True
+
+    def __init__(self, path: str = "metrics.jsonl", flush_every: int = 500):
+        """
+        Purpose: Append every timing and counter event to a JSON lines file (written in batches)
+        Input:
+            - path = file events are appended to
+            - flush_every = number of buffered events that triggers a write
+        """
+        self.path = path
+        self.flush_every = flush_every
+        self.buffer: list[str] = []
+        self.lock = threading.Lock()
+        self.file = open(path, "a", encoding="utf-8")
+
+    def emit(self, event: dict) -> None:
+        line = json.dumps(event)
+        with self.lock:
+            self.buffer.append(line)
+            if len(self.buffer) >= self.flush_every:
+                self._flush()
+
+    def _flush(self) -> None:
+        if self.buffer:
+            self.file.write("\n".join(self.buffer) + "\n")
+            self.file.flush()
+            self.buffer.clear()
+
+    def flush(self) -> None:
+        with self.lock:
+            if not self.file.closed:
+                self._flush()
+
+    def close(self) -> None:
+        with self.lock:
+            self._flush()
+            self.file.close()
+
+
+class PrometheusSink(MemorySink):
+    name = "prometheus"
+
+    def __init__(self, port: int = 9464, host: str = "127.0.0.1"):
+        """
+        Purpose: Serve the current aggregates in Prometheus text format at http://host:port/metrics
+        """
+        self.port = port
+        self.host = host
+        self.server = None
+
+    def attach(self, metrics: "Metrics") -> None:
+        class MetricsRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer((self.host, self.port), MetricsRequestHandler)
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+class Metrics:
+    def __init__(self, enabled: bool = True, sink: MemorySink = None, DEBUG: bool = False):
+        """
+        Purpose: Stage timings, counters and per-domain histograms for the crawl pipeline
+        Input:
+            - enabled = Set whether anything is recorded; a disabled instance returns right away from every call
+            - sink = where events go besides the in-memory aggregates (MemorySink, JsonLinesSink, PrometheusSink)
+        """
+        self.enabled = enabled
+        self.sink = sink or MemorySink()
+        self.DEBUG = DEBUG
+        self.emits = self.sink.wants_events
+        self.lock = threading.Lock()  # The Prometheus endpoint reads from another thread
+        self.reset()
+        if enabled:
+            self.sink.attach(self)
+
+    def reset(self) -> None:
+        with self.lock:
+            self.stages: dict[str, Histogram] = {}
+            self.domain_stages: dict[tuple[str, str], Histogram] = {}
+            self.counters: dict[str, float] = {}
+            self.domain_counters: dict[tuple[str, str], float] = {}
+
+    def timer(self, stage: str, url: str = None):
+        """
+        Purpose: Time a block of code as one sample of a stage
+            - ex) with metrics.timer("fetch", url): ...
+        """
+        if not self.enabled:
+            return _null_timer
+        return StageTimer(self, stage, url)
+
+    def observe(self, stage: str, elapsed_ms: float, url: str = None) -> None:
+        """
+        Purpose: Record one timing sample for a stage, overall and for the URL's domain
+        """
+        if not self.enabled:
+            return
+        domain = urlparse(url).netloc.lower() if url else ""
+        with self.lock:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = Histogram()
+            histogram.observe(elapsed_ms)
+            if domain:
+                histogram = self.domain_stages.get((stage, domain))
+                if histogram is None:
+                    histogram = self.domain_stages[(stage, domain)] = Histogram()
+                histogram.observe(elapsed_ms)
+        if self.emits:
+            self.sink.emit({"ts": time.time(), "type": "timing", "name": stage, "value": round(elapsed_ms, 3),
+                            "domain": domain})
+
+    def count(self, name: str, value: float = 1, url: str = None) -> None:
+        """
+        Purpose: Add to a counter, overall and for the URL's domain
+        """
+        if not self.enabled:
+            return
+        domain = urlparse(url).netloc.lower() if url else ""
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+            if domain:
+                self.domain_counters[(name, domain)] = self.domain_counters.get((name, domain), 0) + value
+        if self.emits:
+            self.sink.emit({"ts": time.time(), "type": "count", "name": name, "value": value, "domain": domain})
+
+    def summary(self) -> dict:
+        """
+        Purpose: Return the in-memory aggregates
+        Output:
+            - {"stages": {stage: {count, total_ms, p50_ms, p95_ms, max_ms}}, "counters": {name: value},
+               "domains": {domain: {"stages": {...}, "counters": {...}}}}
+        """
+        def describe(histogram: Histogram) -> dict:
+            return {"count": histogram.count, "total_ms": round(histogram.sum, 1),
+                    "p50_ms": histogram.quantile(0.5), "p95_ms": histogram.quantile(0.95), "max_ms": round(histogram.max, 1)}
+
+        with self.lock:
+            domains: dict[str, dict] = {}
+            for (stage, domain), histogram in self.domain_stages.items():
+                domains.setdefault(domain, {"stages": {}, "counters": {}})["stages"][stage] = describe(histogram)
+            for (name, domain), value in self.domain_counters.items():
+                domains.setdefault(domain, {"stages": {}, "counters": {}})["counters"][name] = value
+            return {"stages": {stage: describe(histogram) for stage, histogram in self.stages.items()},
+                    "counters": dict(self.counters), "domains": domains}
+
+    def format_summary(self) -> str:
+        """
+        Purpose: Return the stage timings and counters as readable lines (slowest stages first)
+        """
+        summary = self.summary()
+        lines = []
+        for stage, stats in sorted(summary["stages"].items(), key=lambda item: -item[1]["total_ms"]):
+            lines.append(f"{stage}: {stats['count']} x, {stats['total_ms'] / 1000:.1f}s total, "
+                         f"p50 {stats['p50_ms']:.0f}ms, p95 {stats['p95_ms']:.0f}ms, max {stats['max_ms']:.0f}ms")
+        for name, value in sorted(summary["counters"].items()):
+            lines.append(f"{name}: {value:g}")
+        return "\n".join(lines)
+
+    def render_prometheus(self, prefix: str = "scraper") -> str:
+        """
+        Purpose: Return the aggregates in Prometheus text exposition format (durations in seconds)
+                 Totals and per-domain series are separate metrics (ex. scraper_stage_seconds and
+                 scraper_domain_stage_seconds), so summing a metric never counts a sample twice
+        """
+        def escape(value: str) -> str:
+            return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+        def histogram_lines(metric: str, labels: str, histogram: Histogram) -> list[str]:
+            lines = []
+            cumulative = 0
+            for bound, bucket_count in zip(histogram_buckets_ms + (float("inf"),), histogram.counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else f"{bound / 1000:g}"
+                lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f"{metric}_sum{{{labels}}} {histogram.sum / 1000:.6f}")
+            lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+            return lines
+
+        lines = []
+        with self.lock:
+            lines += [f"# HELP {prefix}_stage_seconds Time spent per crawl stage",
+                      f"# TYPE {prefix}_stage_seconds histogram"]
+            for stage, histogram in sorted(self.stages.items()):
+                lines += histogram_lines(f"{prefix}_stage_seconds", f'stage="{escape(stage)}"', histogram)
+            lines += [f"# HELP {prefix}_domain_stage_seconds Time spent per crawl stage and domain",
+                      f"# TYPE {prefix}_domain_stage_seconds histogram"]
+            for (stage, domain), histogram in sorted(self.domain_stages.items()):
+                lines += histogram_lines(f"{prefix}_domain_stage_seconds",
+                                         f'stage="{escape(stage)}",domain="{escape(domain)}"', histogram)
+
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"# TYPE {prefix}_{name}_total counter")
+                lines.append(f"{prefix}_{name}_total {value:g}")
+            for name in sorted({name for name, _ in self.domain_counters}):
+                lines.append(f"# TYPE {prefix}_domain_{name}_total counter")
+                for (counter_name, domain), value in sorted(self.domain_counters.items()):
+                    if counter_name == name:
+                        lines.append(f'{prefix}_domain_{name}_total{{domain="{escape(domain)}"}} {value:g}')
+        return "\n".join(lines) + "\n"
+
+    def flush(self) -> None:
+        """
+        Purpose: Write buffered events without closing the sink (the instance stays usable, ex. shared across crawls)
+        """
+        if self.enabled:
+            self.sink.flush()
+
+    def close(self) -> None:
+        """
+        Purpose: Flush and close the sink; called by whoever created the instance once it is no longer used
+        """
+        if self.enabled:
+            self.sink.close()
+
+
+_null_timer = nullcontext()
+# Shared disabled instance used when no metrics are wanted
+null_metrics = Metrics(enabled=False)
+
+metrics_sinks = {
+    MemorySink.name: MemorySink,
+    JsonLinesSink.name: JsonLinesSink,
+    PrometheusSink.name: PrometheusSink,
+}
+
+
+def create_metrics(sink: str | None = "memory", path: str = "metrics.jsonl", port: int = 9464,
+                   DEBUG: bool = False) -> Metrics:
+    """
+    Purpose: Create a Metrics instance by sink name
+    Input:
+        - sink = "memory", "jsonl", "prometheus", or None for a disabled instance
+        - path = file for the "jsonl" sink
+        - port = port for the "prometheus" endpoint (0 = any free port)
+    Output:
+        - Metrics instance
+    """
+    if sink is None:
+        return Metrics(enabled=False)
+    if sink not in metrics_sinks:
+        raise ValueError(f"Unknown metrics sink '{sink}', expected one of {list(metrics_sinks)}")
+    if sink == JsonLinesSink.name:
+        return Metrics(sink=JsonLinesSink(path), DEBUG=DEBUG)
+    if sink == PrometheusSink.name:
+        return Metrics(sink=PrometheusSink(port), DEBUG=DEBUG)
+    return Metrics(sink=MemorySink(), DEBUG=DEBUG)
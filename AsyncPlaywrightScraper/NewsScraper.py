@@ -1,5 +1,11 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from html.parser import HTMLParser
+import aiohttp
 import feedparser
+from FeedCache import FeedCache
+from SearchTermIndex import SearchTermIndex, build_search_index
 
 class SnippetStripper(HTMLParser):
     def __init__(self):
@@ -27,8 +33,43 @@ def strip_html_snippet(html_snippet: str) -> str:
 
 
 class NewsScraper:
-    def __init__(self, DEBUG: bool = False):
+    def __init__(self, parse_workers: int = 4, feed_cache_path: str | None = None, max_connections: int = 10,
+                 DEBUG: bool = False):
+        """
+        Purpose: Search Google News RSS for a company and search terms
+        Input:
+            - parse_workers = threads that run feedparser on downloaded feeds
+            - feed_cache_path = SQLite file for the feed cache. When set, feeds are requested conditionally
+                                (ETag / Last-Modified) and searches only return entries not returned before
+            - max_connections = size of the shared client session's connection pool
+        """
         self.DEBUG: bool = DEBUG
+        # Worker threads that run feedparser on downloaded feeds, off the event loop
+        self.parse_executor = ThreadPoolExecutor(max_workers = parse_workers)
+        self.feed_cache = FeedCache(feed_cache_path) if feed_cache_path else None
+        # One client session for every async search, so pooled connections are reused until stop()
+        self.max_connections = max_connections
+        self.session: aiohttp.ClientSession | None = None
+        self._session_loop = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Purpose: Return the shared client session, creating it for the running event loop if needed
+        """
+        loop = asyncio.get_running_loop()
+        if self.session is None or self.session.closed or self._session_loop is not loop:
+            self.session = aiohttp.ClientSession(connector = aiohttp.TCPConnector(limit = self.max_connections),
+                                                 timeout = aiohttp.ClientTimeout(total = 30))
+            self._session_loop = loop
+        return self.session
+
+    async def stop(self) -> None:
+        """
+        Purpose: Close the shared client session
+        """
+        if self.session and not self.session.closed and self._session_loop is asyncio.get_running_loop():
+            await self.session.close()
+        self.session = None
 
     def _create_query(self, company: str, search_terms: list[str] = None) -> str:
         """
@@ -60,17 +101,38 @@ class NewsScraper:
         rss_url = f"https://news.google.com/rss/search?q={query.replace(' ', '+')}"
         return rss_url
 
-    def _parse_feed(self, feed, max_results: int) -> list[dict]:
+    def _entry_key(self, entry) -> str:
+        """
+        Purpose: identify a feed entry across polls by its GUID, falling back to its link
+        """
+        return entry.get("id") or entry.get("link", "")
+
+    def _parse_feed(self, feed, max_results: int, search_index: SearchTermIndex = None, rss_url: str = None,
+                    validators: tuple[str | None, str | None] = (None, None)) -> list[dict]:
         """
         Purpose: parse and clean results from RSS feed
         Inputs:
             - feed = Parsed RSS feed object
             - max_results = Max results to return
+            - search_index = SearchTermIndex used to find which search terms appear in each title/snippet
+            - rss_url = RSS url the feed came from; with a feed cache, only entries not seen before for it are returned
+            - validators = (ETag, Last-Modified) of the response the feed came from, stored in the feed cache
         Outputs:
-            - List of dicts with title and link
+            - List of dicts with title, link, snippet and matched search terms
         """
         results = []
-        entries_to_parse = feed.entries[:max_results]
+        entries = feed.entries
+        if self.feed_cache and rss_url:
+            unseen = self.feed_cache.unseen(rss_url, [self._entry_key(entry) for entry in entries])
+            entries = [entry for entry in entries if self._entry_key(entry) in unseen]
+        entries_to_parse = entries[:max_results]
+        if self.feed_cache and rss_url:
+            # Only returned entries are marked, so new entries past max_results come back on the next poll.
+            # The validators are kept only when nothing is held back; otherwise the next poll would get a 304
+            # and never see the held back entries
+            self.feed_cache.mark_seen(rss_url, [self._entry_key(entry) for entry in entries_to_parse])
+            held_back = len(entries) > len(entries_to_parse)
+            self.feed_cache.set_validators(rss_url, *((None, None) if held_back else validators))
         if self.DEBUG:
             print(f"[DEBUG][NEWS] Parsing {len(entries_to_parse)} feed entries")
         for entry in entries_to_parse:
@@ -79,7 +141,8 @@ class NewsScraper:
             results.append({
                 "title": entry.title,
                 "link": entry.link,
-                "snippet": stripped_summary
+                "snippet": stripped_summary,
+                "matched_terms": search_index.match(f"{entry.title} {stripped_summary}") if search_index else []
             })
         return results
 
@@ -96,12 +159,95 @@ class NewsScraper:
         if self.DEBUG:
             print(f"[DEBUG][NEWS] Starting search for company: '{company}' with keywords: {search_terms}")
         rss_url: str = self._build_rss_url(company, search_terms)
-        feed = feedparser.parse(rss_url)
-        results: list[dict] = self._parse_feed(feed, max_results)
+        validators = (None, None)
+        if self.feed_cache:
+            etag, last_modified = self.feed_cache.get_validators(rss_url)
+            feed = feedparser.parse(rss_url, etag = etag, modified = last_modified)
+            if feed.get("status") == 304:
+                if self.DEBUG:
+                    print(f"[DEBUG][NEWS] Feed not modified: {rss_url}")
+                return []
+            if feed.get("status") == 200:
+                validators = (feed.get("etag"), feed.get("modified"))
+        else:
+            feed = feedparser.parse(rss_url)
+        search_index = build_search_index(tuple(search_terms or []))
+        results: list[dict] = self._parse_feed(feed, max_results, search_index, rss_url, validators)
         if self.DEBUG:
             print(f"[DEBUG][NEWS] Search complete. Found {len(results)} results.")
         return results
 
+    async def _fetch_feed(self, session: aiohttp.ClientSession, rss_url: str) -> tuple[bytes | None, tuple[str | None, str | None]]:
+        """
+        Purpose: download raw RSS feed, conditionally when a feed cache is set
+        Inputs:
+            - session = pooled HTTP client session
+            - rss_url = RSS url
+        Outputs:
+            - Tuple containing the feed bytes (None if the request failed or the feed has not changed since the last
+              poll) and the response's (ETag, Last-Modified)
+        """
+        headers = self.feed_cache.conditional_headers(rss_url) if self.feed_cache else None
+        try:
+            async with session.get(rss_url, headers = headers) as response:
+                if response.status == 304:
+                    if self.DEBUG:
+                        print(f"[DEBUG][NEWS] Feed not modified: {rss_url}")
+                    return None, (None, None)
+                if response.status != 200:
+                    if self.DEBUG:
+                        print(f"[DEBUG][NEWS][ERROR] RSS request returned {response.status}: {rss_url}")
+                    return None, (None, None)
+                data = await response.read()
+                return data, (response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if self.DEBUG:
+                print(f"[DEBUG][NEWS][ERROR] RSS request failed: {rss_url}: {e}")
+            return None, (None, None)
+
+    async def perform_search_many(self, queries: list[tuple[str, list[str]]], max_results: int = 10,
+                                  max_concurrency: int = 10) -> list[list[dict]]:
+        """
+        Purpose: perform many company/search term searches concurrently
+        Inputs:
+            - queries = list of (company, search_terms)
+            - max_results = Max results to return per query
+            - max_concurrency = Max number of RSS requests in flight at once
+        Outputs:
+            - List of result lists (same order as queries), each a list of dicts with title and link
+        """
+        loop = asyncio.get_running_loop()
+        session = await self._get_session()
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def search(company: str, search_terms: list[str]) -> list[dict]:
+            """
+            Purpose: fetch one feed, then parse it in a worker thread
+            """
+            if self.DEBUG:
+                print(f"[DEBUG][NEWS] Starting search for company: '{company}' with keywords: {search_terms}")
+            rss_url = self._build_rss_url(company, search_terms)
+            async with semaphore:
+                data, validators = await self._fetch_feed(session, rss_url)
+            if data is None:
+                return []
+            # Parse against the feed URL, as feedparser.parse(rss_url) does, so relative GUIDs resolve the same way
+            feed = await loop.run_in_executor(self.parse_executor, partial(feedparser.parse, data,
+                                              response_headers = {"content-location": rss_url}))
+            search_index = build_search_index(tuple(search_terms or []))
+            results = self._parse_feed(feed, max_results, search_index, rss_url, validators)
+            if self.DEBUG:
+                print(f"[DEBUG][NEWS] Search complete for '{company}'. Found {len(results)} results.")
+            return results
+
+        return list(await asyncio.gather(*(search(company, search_terms) for company, search_terms in queries)))
+
+    async def perform_search_async(self, company: str, search_terms: list[str], max_results: int = 10) -> list[dict]:
+        """
+        Purpose: async version of perform_search
+        """
+        return (await self.perform_search_many([(company, search_terms)], max_results))[0]
+
 def main():
     COMPANY: str = 'midjourney'
     KEYWORDS: list[str] = ['AI', 'disney']
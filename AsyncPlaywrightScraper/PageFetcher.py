@@ -0,0 +1,150 @@
+import asyncio
+import re
+from urllib.parse import urlparse
+import aiohttp
+from BrowserHandler import BrowserHandler
+from HostScheduler import HostSlot
+from Metrics import Metrics, null_metrics
+
+
+class TieredFetcher:
+    HTTP = "http"
+    BROWSER = "browser"
+
+    default_headers = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                      "(KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.9",
+    }
+    # Markers of a client-rendered app shell (empty mount point or framework bootstrap data)
+    spa_markers = [
+        r'<div[^>]+id=["\'](root|app|__next|__nuxt|___gatsby)["\'][^>]*>\s*</div>',
+        r'<app-root[^>]*>\s*</app-root>',
+        r'window\.__(INITIAL_STATE|PRELOADED_STATE|NUXT)__\s*=',
+    ]
+    noscript_markers = [
+        r'<noscript[^>]*>[^<]*(enable|requires?|turn on)[^<]*javascript',
+    ]
+
+    def __init__(self, browser_handler: BrowserHandler, http_enabled: bool = True, min_anchors: int = 5,
+                 max_connections: int = 50, timeout: int = 15, metrics: Metrics = None, DEBUG: bool = False):
+        """
+        Purpose: Fetch pages over plain HTTP first and escalate to the browser only when a page needs JavaScript
+        Input:
+            - browser_handler = BrowserHandler used for pages that need rendering
+            - http_enabled = Set whether the plain HTTP tier is tried at all
+            - min_anchors = pages with fewer <a href> tags than this are treated as JS-rendered
+            - max_connections = size of the pooled HTTP connection limit
+            - timeout = total seconds allowed for a plain HTTP fetch
+            - metrics = Metrics that HTTP timings and per-tier page counts are recorded on
+        """
+        self.browser_handler = browser_handler
+        self.http_enabled = http_enabled
+        self.min_anchors = min_anchors
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.metrics = metrics or null_metrics
+        self.DEBUG = DEBUG
+
+        self.session = None
+        self.anchor_pattern = re.compile(r'<a\s[^>]*href\s*=', re.IGNORECASE)
+        self.spa_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.spa_markers]
+        self.noscript_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.noscript_markers]
+
+        self.domain_tiers: dict[str, str] = {}
+        self.tier_counts: dict[str, int] = {}
+        self.reset_metrics()
+
+    async def start(self) -> None:
+        """
+        Purpose: Open the pooled HTTP client session
+        """
+        if self.http_enabled and not self.session:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=10, ttl_dns_cache=300)
+            self.session = aiohttp.ClientSession(connector=connector, headers=self.default_headers,
+                                                 timeout=aiohttp.ClientTimeout(total=self.timeout))
+
+    async def stop(self) -> None:
+        """
+        Purpose: Close the pooled HTTP client session
+        """
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    def reset_metrics(self) -> None:
+        self.tier_counts = {self.HTTP: 0, self.BROWSER: 0, "failed": 0}
+
+    def looks_js_rendered(self, content: str) -> bool:
+        """
+        Purpose: determine if raw HTML is likely a shell that only gets its links once JavaScript runs
+        """
+        if len(self.anchor_pattern.findall(content)) < self.min_anchors:
+            return True
+        if any(pattern.search(content) for pattern in self.noscript_patterns):
+            return True
+        return any(pattern.search(content) for pattern in self.spa_patterns)
+
+    async def _fetch_http(self, url: str, slot: HostSlot = None) -> str | None:
+        """
+        Purpose: GET a URL with the pooled HTTP client and return the HTML, or None if it is not usable HTML
+        Effect: Records the response status (or a timeout) on the host slot, if given
+        """
+        if not self.session:
+            await self.start()
+        try:
+            async with self.session.get(url, allow_redirects=True) as response:
+                if slot:
+                    slot.record_status(response.status, response.headers.get("Retry-After"))
+                if response.status != 200 or "html" not in response.headers.get("Content-Type", "html"):
+                    if self.DEBUG:
+                        print(f"[DEBUG][FETCHER] HTTP {response.status} ({response.headers.get('Content-Type')}): {url}")
+                    return None
+                return await response.text(errors="replace")
+        except Exception as e:
+            if slot and isinstance(e, asyncio.TimeoutError):
+                slot.record_timeout()
+            if self.DEBUG:
+                print(f"[DEBUG][FETCHER][ERROR] HTTP fetch failed for {url}: {e}")
+            return None
+
+    async def get_page_content(self, url: str, slot: HostSlot = None) -> str | None:
+        """
+        Purpose: Return the HTML for a URL from the cheapest tier that produces a usable page
+        Input:
+            - url = URL of page to fetch
+            - slot = HostSlot from the HostScheduler to record the outcome on
+        Effect: Records per-domain which tier worked and counts fetches per tier
+        """
+        domain = urlparse(url).netloc.lower()
+
+        if self.http_enabled and self.domain_tiers.get(domain) != self.BROWSER:
+            with self.metrics.timer("http", url):
+                content = await self._fetch_http(url, slot)
+            if content is not None and not self.looks_js_rendered(content):
+                self.domain_tiers[domain] = self.HTTP
+                self.tier_counts[self.HTTP] += 1
+                self.metrics.count("pages_http", url=url)
+                self.metrics.count("content_bytes", len(content), url)
+                return content
+            if slot and slot.throttled:
+                # The host is rate limiting us; loading it in the browser now would only get us blocked
+                self.tier_counts["failed"] += 1
+                self.metrics.count("fetch_failures", url=url)
+                return None
+            self.metrics.count("escalations", url=url)
+            if self.DEBUG:
+                print(f"[DEBUG][FETCHER] Escalating to browser: {url}")
+
+        content = await self.browser_handler.get_page_content(url, slot=slot)
+        if content is None:
+            self.tier_counts["failed"] += 1
+            self.metrics.count("fetch_failures", url=url)
+            return None
+
+        self.domain_tiers[domain] = self.BROWSER
+        self.tier_counts[self.BROWSER] += 1
+        self.metrics.count("pages_browser", url=url)
+        self.metrics.count("content_bytes", len(content), url)
+        return content
@@ -0,0 +1,302 @@
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from urllib.parse import urlparse
+import tldextract
+
+
+# File extensions that identify a resource type from its URL alone (used for native, pattern-based blocking)
+resource_type_extensions = {
+    "image": ("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp"),
+    "stylesheet": ("css",),
+    "font": ("woff", "woff2", "ttf", "otf", "eot"),
+    "media": ("mp4", "webm", "mp3", "m4a", "ogg", "wav", "mov", "m3u8"),
+    "texttrack": ("vtt",),
+    "manifest": ("webmanifest",),
+}
+
+# Typical transfer sizes used to estimate the bytes a blocked request would have cost (blocked bodies are never seen)
+typical_resource_bytes = {
+    "image": 40_000,
+    "stylesheet": 20_000,
+    "font": 30_000,
+    "media": 500_000,
+    "script": 30_000,
+    "document": 50_000,
+    "texttrack": 5_000,
+    "manifest": 1_000,
+}
+
+default_blocked_resource_types = ("image", "stylesheet", "font", "media", "texttrack", "manifest",
+                                  "eventsource", "websocket", "ping")
+
+# Analytics, advertising and session-recording hosts that never contribute links
+default_blocked_domains = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "googleadservices.com", "adservice.google.com", "connect.facebook.net", "hotjar.com", "hotjar.io",
+    "clarity.ms", "bat.bing.com", "px.ads.linkedin.com", "snap.licdn.com", "analytics.tiktok.com",
+    "cdn.segment.com", "api.segment.io", "mixpanel.com", "amplitude.com", "fullstory.com", "nr-data.net",
+    "js-agent.newrelic.com", "optimizely.com", "adnxs.com", "criteo.com", "criteo.net", "taboola.com",
+    "outbrain.com", "scorecardresearch.com", "quantserve.com", "adsrvr.org", "demdex.net", "omtrdc.net",
+)
+
+
+def load_domain_list(path: str) -> list[str]:
+    """
+    Purpose: Read a domain blocklist file
+    Input:
+        - path = file with one domain per line; hosts-file lines ("0.0.0.0 ads.example.com"), adblock domain rules
+                 ("||ads.example.com^") and # comments are also accepted
+    Output:
+        - List of domains
+    """
+    domains = []
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            line = line.split("#", 1)[0].strip()
+            if not line or line.startswith("!"):
+                continue
+            parts = line.split()
+            domain = parts[-1] if len(parts) > 1 else parts[0]
+            domain = domain.removeprefix("||").split("^", 1)[0].strip(".").lower()
+            if domain and domain not in ("localhost", "0.0.0.0", "127.0.0.1"):
+                domains.append(domain)
+    return domains
+
+
+class DomainTrie:
+    end = ""  # Labels are never empty, so "" marks the end of a stored domain
+
+    def __init__(self, domains=()):
+        """
+        Purpose: Suffix trie over domain labels (stored right to left) answering "is this host or any parent domain
+                 listed?" in one walk over the host's labels, however long the list is
+        """
+        self.root: dict = {}
+        self.count = 0
+        for domain in domains:
+            self.add(domain)
+
+    def add(self, domain: str) -> None:
+        node = self.root
+        for label in reversed(domain.lower().strip(".").split(".")):
+            node = node.setdefault(label, {})
+        if self.end not in node:
+            node[self.end] = True
+            self.count += 1
+
+    def matches(self, host: str) -> bool:
+        node = self.root
+        for label in reversed(host.lower().split(".")):
+            node = node.get(label)
+            if node is None:
+                return False
+            if self.end in node:
+                return True
+        return False
+
+    def __len__(self) -> int:
+        return self.count
+
+
+@lru_cache(maxsize=4096)
+def site_domain(host: str) -> str:
+    """
+    Purpose: Return the registrable domain of a host (ex. news.lenovo.com -> lenovo.com), used to spot third parties
+    """
+    return tldextract.extract(host).registered_domain or host
+
+
+class BlockingPolicy:
+    def __init__(self, blocked_resource_types=default_blocked_resource_types, blocked_domains=default_blocked_domains,
+                 blocklist_path: str = None, block_third_party_scripts: bool = False,
+                 block_third_party_frames: bool = False, third_party_allowlist: dict[str, list[str]] = None,
+                 exact_resource_types: bool = True, native_domain_limit: int = 500):
+        """
+        Purpose: Decide which browser requests are aborted
+        Input:
+            - blocked_resource_types = Playwright resource types to block
+            - blocked_domains = hosts to block (subdomains included)
+            - blocklist_path = optional domain blocklist file added to blocked_domains
+            - block_third_party_scripts = block scripts not served from the page's own site
+            - block_third_party_frames = block iframes not served from the page's own site
+            - third_party_allowlist = {page site domain or "*": [script/frame domains still allowed]}
+            - exact_resource_types = also check each request's reported resource type in a Python callback. Needed to
+                                     block images/fonts/stylesheets/media without a file extension and eventsource/ping
+                                     requests, which have none; False leaves only extension and domain rules (faster)
+            - native_domain_limit = largest domain list still compiled into the native URL pattern; longer lists are
+                                    matched with the DomainTrie in the callback
+        """
+        self.blocked_resource_types = frozenset(blocked_resource_types)
+        self.domains = list(blocked_domains) + (load_domain_list(blocklist_path) if blocklist_path else [])
+        self.domain_trie = DomainTrie(self.domains)
+        self.block_third_party_scripts = block_third_party_scripts
+        self.block_third_party_frames = block_third_party_frames
+        self.third_party_allowlist = {site: DomainTrie(domains) for site, domains in (third_party_allowlist or {}).items()}
+        self.exact_resource_types = exact_resource_types
+        self.native_domains = len(self.domain_trie) <= native_domain_limit
+
+        self.native_pattern = self._build_native_pattern()
+        # The per-request callback is only needed for decisions a URL pattern cannot make (websockets have their own route)
+        self.needs_callback = ((exact_resource_types and bool(self.blocked_resource_types - {"websocket"}))
+                               or block_third_party_scripts or block_third_party_frames or not self.native_domains)
+
+    def _build_native_pattern(self) -> re.Pattern | None:
+        """
+        Purpose: Compile blocked file extensions and (short) domain lists into one regex that Playwright matches
+                 itself, so requests that are not blocked never reach Python
+        Note: Must stay valid JavaScript regex syntax
+        """
+        alternatives = []
+        extensions = [re.escape(extension) for extension in self._blocked_extensions()]
+        if extensions:
+            alternatives.append(rf"^[^?#]*\.(?:{'|'.join(extensions)})(?:[?#]|$)")
+        if self.native_domains and self.domains:
+            domains = "|".join(re.escape(domain) for domain in sorted(set(self.domains)))
+            alternatives.append(rf"^[a-z][a-z0-9+.-]*://(?:[^/?#]*\.)?(?:{domains})(?::\d+)?(?:[/?#]|$)")
+        if not alternatives:
+            return None
+        return re.compile("|".join(alternatives), re.IGNORECASE)
+
+    def _blocked_extensions(self) -> list[str]:
+        return [extension for resource_type in sorted(self.blocked_resource_types)
+                for extension in resource_type_extensions.get(resource_type, ())]
+
+    def url_wildcards(self) -> list[str]:
+        """
+        Purpose: Express the URL-based part of the policy as Chromium blocked-URL wildcards, for pages where routing
+                 cannot be used (routing disables the browser's HTTP cache)
+        Note: Decisions that need the request's resource type or page (third parties, exact types) are not covered
+        """
+        wildcards = []
+        for extension in self._blocked_extensions():
+            wildcards += [f"*.{extension}", f"*.{extension}?*", f"*.{extension}#*"]
+        if self.native_domains:
+            for domain in sorted(set(self.domains)):
+                wildcards += [f"*://{domain}/*", f"*://*.{domain}/*"]
+        if "websocket" in self.blocked_resource_types:
+            wildcards += ["ws://*", "wss://*"]
+        return wildcards
+
+    def _is_allowed_third_party(self, host: str, page_site: str) -> bool:
+        for site in (page_site, "*"):
+            allowlist = self.third_party_allowlist.get(site)
+            if allowlist is not None and allowlist.matches(host):
+                return True
+        return False
+
+    def block_reason(self, url: str, resource_type: str, is_subframe: bool, page_url: str) -> str | None:
+        """
+        Purpose: Decide whether a request that reached the callback is blocked
+        Input:
+            - url = request URL
+            - resource_type = Playwright resource type
+            - is_subframe = request loads an iframe document
+            - page_url = URL of the page making the request
+        Output:
+            - Reason for blocking, or None to let the request through
+        """
+        if resource_type == "document" and not is_subframe:
+            return None  # Never block the page itself
+        if resource_type in self.blocked_resource_types:
+            return resource_type
+        host = urlparse(url).hostname or ""
+        if not self.native_domains and self.domain_trie.matches(host):
+            return "blocklist"
+
+        third_party_check = ((self.block_third_party_scripts and resource_type == "script")
+                             or (self.block_third_party_frames and is_subframe))
+        if third_party_check:
+            page_host = urlparse(page_url).hostname or ""
+            if page_host and site_domain(host) != site_domain(page_host):
+                page_site = site_domain(page_host)
+                if not self._is_allowed_third_party(host, page_site):
+                    return "third-party frame" if is_subframe else "third-party script"
+        return None
+
+
+@dataclass
+class BlockStats:
+    requests: int = 0
+    estimated_bytes: int = 0
+    reasons: dict[str, int] = field(default_factory=dict)
+
+    def add(self, reason: str, resource_type: str) -> None:
+        self.requests += 1
+        self.estimated_bytes += typical_resource_bytes.get(resource_type, 2_000)
+        self.reasons[reason] = self.reasons.get(reason, 0) + 1
+
+
+class RequestBlocker:
+    def __init__(self, policy: BlockingPolicy = None, DEBUG: bool = False):
+        """
+        Purpose: Apply a BlockingPolicy to browser contexts and count what it blocked per page and in total
+        """
+        self.policy = policy or BlockingPolicy()
+        self.DEBUG = DEBUG
+        self.totals = BlockStats()
+        self.page_stats: dict = {}
+
+    async def install(self, context) -> None:
+        """
+        Purpose: Register the policy's routes on a browser context
+        """
+        # Routes registered later take precedence, so pattern matches are aborted before the callback is consulted
+        if self.policy.needs_callback:
+            await context.route("**/*", self._route_callback)
+        if self.policy.native_pattern is not None:
+            await context.route(self.policy.native_pattern, self._abort_native)
+        if "websocket" in self.policy.blocked_resource_types:
+            await context.route_web_socket(re.compile(".*"), self._block_web_socket)
+
+    async def install_on_page(self, page) -> None:
+        """
+        Purpose: Block the policy's URL wildcards on one page through the Chrome DevTools Protocol instead of routing,
+                 which keeps the browser's HTTP cache working (see BlockingPolicy.url_wildcards for what is covered)
+        """
+        session = await page.context.new_cdp_session(page)
+        await session.send("Network.enable")
+        await session.send("Network.setBlockedURLs", {"urls": self.policy.url_wildcards()})
+        page.on("requestfailed", self._record_blocked_by_client)
+
+    def _record_blocked_by_client(self, request) -> None:
+        if request.failure == "net::ERR_BLOCKED_BY_CLIENT":
+            self._record(request, "pattern")
+
+    def _record(self, request, reason: str) -> None:
+        self.totals.add(reason, request.resource_type)
+        try:
+            page = request.frame.page
+        except Exception:
+            return  # Service worker requests have no page
+        self.page_stats.setdefault(page, BlockStats()).add(reason, request.resource_type)
+
+    async def _abort_native(self, route, request) -> None:
+        self._record(request, "pattern")
+        await route.abort()
+
+    async def _route_callback(self, route, request) -> None:
+        try:
+            frame = request.frame
+            page_url = frame.page.url
+        except Exception:
+            await route.fallback()  # Service worker requests have no frame or page to judge them against
+            return
+        is_subframe = request.resource_type == "document" and frame.parent_frame is not None
+        reason = self.policy.block_reason(request.url, request.resource_type, is_subframe, page_url)
+        if reason:
+            self._record(request, reason)
+            await route.abort()
+        else:
+            await route.fallback()
+
+    async def _block_web_socket(self, web_socket_route) -> None:
+        # Never connected to the server; closing tells the page the socket is gone
+        self.totals.add("websocket", "websocket")
+        await web_socket_route.close()
+
+    def take_page_stats(self, page) -> BlockStats:
+        """
+        Purpose: Return and reset what was blocked for a page since the last call (pages are reused by the PagePool)
+        """
+        return self.page_stats.pop(page, BlockStats())
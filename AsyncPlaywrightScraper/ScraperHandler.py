@@ -1,21 +1,89 @@
 import asyncio
+from typing import AsyncIterator, Callable
 from HomepageScraper import HomepageScraper, CrawlResult
+from BrowserHandler import BrowserHandler
+from HomepageResolver import HomepageResolver
 from NewsScraper import NewsScraper
+from CrawlGraph import CrawlGraph
+from Metrics import Metrics, null_metrics
 
 class ScraperHandler:
     brave_api_key = "<insert API key>"
     def __init__(self, whitelist_keywords: list[str] = None, blacklist_keywords: list[str] = None,
-                 max_depth: int = 3, headless: bool = True, stealth: bool = True, DEBUG = False):
+                 max_depth: int = 3, headless: bool = True, stealth: bool = True, crawl_graph_path: str | None = None,
+                 revisit_interval: float = 24 * 3600, storage_state_dir: str | None = None, http_cache_dir: str | None = None,
+                 metrics: Metrics = None, journal_dir: str | None = None, DEBUG = False):
 
-        self.homepage_scraper = HomepageScraper(api_key = self.brave_api_key, search_terms = [], whitelist_keywords = whitelist_keywords, blacklist_keywords = blacklist_keywords,
-                                                max_depth = max_depth, headless = headless, stealth = stealth, DEBUG = DEBUG)
+        self.whitelist_keywords = whitelist_keywords
+        self.blacklist_keywords = blacklist_keywords
+        self.max_depth = max_depth
+        self.headless = headless
+        self.stealth = stealth
+        # One crawl graph shared by every homepage scraper, so repeated runs only fetch what changed
+        self.crawl_graph = CrawlGraph(crawl_graph_path) if crawl_graph_path else None
+        self.revisit_interval = revisit_interval
+        # Browser state reused across runs: cookies/localStorage per site, and an on-disk HTTP cache
+        self.storage_state_dir = storage_state_dir
+        self.http_cache_dir = http_cache_dir
+        # One Metrics instance shared by every homepage crawl (only recorded in DEBUG mode unless given)
+        self.metrics = metrics or (Metrics(DEBUG = DEBUG) if DEBUG else null_metrics)
+        # Crawl journals (one per homepage) so interrupted crawls and batch runs resume where they stopped
+        self.journal_dir = journal_dir
+
+        self.homepage_scraper = self._create_homepage_scraper(DEBUG = DEBUG)
         self.news_scraper = NewsScraper(DEBUG = DEBUG)
 
         self.company = None
         self.search_terms = None
+        self.homepage = None
+
+        # Set by start(): the browser stays open and each company scrape gets its own context on it
+        self.warm = False
+        self._start_lock = None
 
         self.DEBUG = DEBUG
 
+    def _create_homepage_scraper(self, browser_handler: BrowserHandler = None, homepage_resolver: HomepageResolver = None,
+                                 DEBUG: bool = False) -> HomepageScraper:
+        return HomepageScraper(api_key = self.brave_api_key, search_terms = [], whitelist_keywords = self.whitelist_keywords,
+                               blacklist_keywords = self.blacklist_keywords, max_depth = self.max_depth, headless = self.headless,
+                               stealth = self.stealth, browser_handler = browser_handler, homepage_resolver = homepage_resolver,
+                               crawl_graph = self.crawl_graph, revisit_interval = self.revisit_interval,
+                               storage_state_dir = self.storage_state_dir, http_cache_dir = self.http_cache_dir,
+                               metrics = self.metrics, journal_dir = self.journal_dir, DEBUG = DEBUG)
+
+    async def start(self) -> None:
+        """
+        Purpose: Launch the browser once and keep it open, so later company scrapes skip the launch cost
+        Effect: Company scrapes run on isolated contexts of this browser until stop()
+        """
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if not self.warm:
+                await self.homepage_scraper.browser_handler.start()
+                self.warm = True
+
+    async def stop(self) -> None:
+        """
+        Purpose: Close the warm browser, the shared homepage resolver and the news client session, and write
+                 buffered metrics events
+        Note: The Metrics instance is not closed, since the caller that created it may still use it
+        """
+        self.warm = False
+        await self.homepage_scraper.stop()
+        await self.news_scraper.stop()
+
+    def _search_scraper(self) -> HomepageScraper:
+        """
+        Purpose: Return the HomepageScraper for one company scrape - a fresh one on an isolated context of the warm
+                 browser after start(), otherwise the handler's own scraper
+        """
+        if not self.warm:
+            return self.homepage_scraper
+        return self._create_homepage_scraper(browser_handler = self.homepage_scraper.browser_handler.new_isolated_handler(),
+                                             homepage_resolver = self.homepage_scraper.homepage_resolver, DEBUG = self.DEBUG)
+
     def retrieve_company(self, company: str) -> None:
         if self.DEBUG:
             print(f'[DEBUG][GUI] Company: {company}')
@@ -34,28 +102,154 @@ class ScraperHandler:
             print(f'[DEBUG][GUI] News: {news}')
         return news
 
-    def find_homepage(self) -> str:
+    async def run_news_scrape_async(self) -> list[dict]:
+        if self.DEBUG:
+            print(f'\n[DEBUG][GUI] BEGINNING NEWS SCRAPE')
+        news = await self.news_scraper.perform_search_async(self.company, self.search_terms)
+        if not self.warm:
+            await self.news_scraper.stop()
+        if self.DEBUG:
+            print(f'[DEBUG][GUI] News: {news}')
+        return news
+
+    async def find_homepage(self) -> str:
         if self.DEBUG:
             print(f'\n[DEBUG][GUI] FINDING HOMEPAGE')
-        homepage: str = self.homepage_scraper.find_company_homepage(self.company)
+        homepage: str = await self.homepage_scraper.find_company_homepage(self.company)
+        self.homepage = homepage
+        if not self.warm:
+            await self.homepage_scraper.homepage_resolver.stop()
         return homepage
 
     async def run_company_scrape(self) -> tuple[str,list[CrawlResult]] | None:
         if self.DEBUG:
             print(f'\n[DEBUG][GUI] BEGINNING HOMEPAGE SCRAPE')
-        self.homepage_scraper.reset_search_values()
-        homepage: str = self.homepage_scraper.find_company_homepage(self.company)
-        await self.homepage_scraper.browser_handler.start()
+        scraper = self._search_scraper()
+        scraper.reset_search_values()
+        homepage: str = await scraper.find_company_homepage(self.company)
+        self.homepage = homepage
+        await scraper.start()
         if homepage:
-            self.homepage_scraper.update_search_terms(self.search_terms)
-            await self.homepage_scraper.crawl()
-            results = self.homepage_scraper.results
-            await self.homepage_scraper.browser_handler.stop()
+            scraper.update_search_terms(self.search_terms)
+            await scraper.crawl()
+            results = scraper.results
+            await scraper.stop()
             return homepage, results
         else:
-            await self.homepage_scraper.browser_handler.stop()
+            await scraper.stop()
             return None
 
+    async def run_company_scrape_iter(self, buffer_size: int = 100,
+                                      on_progress: Callable[[str], None] = None) -> AsyncIterator[CrawlResult]:
+        """
+        Purpose: Find the company homepage and crawl it, yielding each result as soon as it is found
+            - ex) async for result in handler.run_company_scrape_iter(): ...
+        Inputs:
+            - buffer_size = Max number of results waiting for the consumer before the crawl pauses
+            - on_progress = Optional function called with a short message when the scrape moves to a new step
+        Output:
+            - CrawlResult objects (nothing when no homepage is found; the homepage is in ScraperHandler.homepage)
+        Effect: Cancelling the consuming task stops the crawl and closes the scraper
+        """
+        if self.DEBUG:
+            print(f'\n[DEBUG][GUI] BEGINNING STREAMING HOMEPAGE SCRAPE')
+        company, search_terms = self.company, self.search_terms
+        scraper = self._search_scraper()
+        scraper.reset_search_values()
+        try:
+            if on_progress:
+                on_progress(f"Finding homepage for {company}")
+            homepage: str = await scraper.find_company_homepage(company)
+            self.homepage = homepage
+            if not homepage:
+                return
+            if on_progress:
+                on_progress(f"Crawling {homepage}")
+            await scraper.start()
+            scraper.update_search_terms(search_terms)
+            async for result in scraper.crawl_iter(buffer_size = buffer_size):
+                yield result
+        finally:
+            await scraper.stop()
+
+    async def run_full_scrape(self, homepage_only: bool = False) -> tuple[list[dict], tuple[str, list[CrawlResult]] | None]:
+        """
+        Purpose: Run the news scrape and the homepage scrape in parallel
+        Inputs:
+            - homepage_only = Only find the company homepage instead of crawling it
+        Output:
+            - Tuple containing news results and (homepage, results) or None
+        """
+        if homepage_only:
+            news, homepage = await asyncio.gather(self.run_news_scrape_async(), self.find_homepage())
+            return news, (homepage, []) if homepage else None
+        return await asyncio.gather(self.run_news_scrape_async(), self.run_company_scrape())
+
+    async def crawl_company(self, company: str, search_terms: list[str],
+                            max_tabs: int = 5) -> tuple[str, list[CrawlResult]] | None:
+        """
+        Purpose: Crawl one company in its own browser context with its own crawl state (the browser must be started)
+        Inputs:
+            - company = Company name
+            - search_terms = Terms to search the company for
+            - max_tabs = Max number of tabs (and crawl workers) for the company
+        Output:
+            - (homepage, results), or None when no homepage was found; crawl errors are raised
+        """
+        scraper = self._create_homepage_scraper(browser_handler = self.homepage_scraper.browser_handler.new_isolated_handler(max_tabs),
+                                                homepage_resolver = self.homepage_scraper.homepage_resolver, DEBUG = self.DEBUG)
+        scraper.update_search_terms(search_terms)
+        try:
+            homepage = await scraper.find_company_homepage(company)
+            if not homepage:
+                return None
+            await scraper.start()
+            await scraper.crawl(max_tabs = max_tabs)
+            return homepage, scraper.results
+        finally:
+            await scraper.stop()
+
+    async def crawl_many(self, companies: list[str], search_terms: list[str], max_concurrent_companies: int = 5,
+                         global_max_tabs: int = 20, per_company_tabs: int = 5) -> dict[str, tuple[str, list[CrawlResult]] | None]:
+        """
+        Purpose: Crawl many companies concurrently on one long-lived browser
+        Inputs:
+            - companies = Company names
+            - search_terms = Terms to search every company for
+            - max_concurrent_companies = Max number of company crawls running at once
+            - global_max_tabs = Max number of tabs open across all companies
+            - per_company_tabs = Max number of tabs (and crawl workers) for a single company
+        Output:
+            - Dict of company name to (homepage, results), or None when no homepage was found or the crawl failed
+        """
+        if self.DEBUG:
+            print(f'\n[DEBUG][GUI] BEGINNING BATCH SCRAPE OF {len(companies)} COMPANIES')
+        browser_handler = self.homepage_scraper.browser_handler
+        homepage_resolver = self.homepage_scraper.homepage_resolver
+        started_here = browser_handler.context is None
+        if started_here:
+            await browser_handler.start()
+        browser_handler.tab_budget = asyncio.Semaphore(global_max_tabs)
+        company_slots = asyncio.Semaphore(max_concurrent_companies)
+
+        async def crawl_in_slot(company: str) -> tuple[str, list[CrawlResult]] | None:
+            async with company_slots:
+                try:
+                    return await self.crawl_company(company, search_terms, per_company_tabs)
+                except Exception as e:
+                    if self.DEBUG:
+                        print(f'[DEBUG][GUI][ERROR] Batch scrape failed for {company}: {e}')
+                    return None
+
+        try:
+            results = await asyncio.gather(*(crawl_in_slot(company) for company in companies))
+        finally:
+            browser_handler.tab_budget = None
+            if started_here:
+                await browser_handler.stop()
+                await homepage_resolver.stop()
+        return dict(zip(companies, results))
+
 async def main():
     handler = ScraperHandler(DEBUG = True)
     company = 'United Aluminum'
@@ -63,9 +257,7 @@ async def main():
     handler.retrieve_company(company)
     handler.retrieve_search_terms(search_terms)
 
-    handler.run_news_scrape()
-
-    await handler.run_company_scrape()
+    await handler.run_full_scrape()
 
 if __name__ == '__main__':
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,151 @@
+from collections import deque
+from functools import lru_cache
+from rapidfuzz import fuzz
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+class AhoCorasickAutomaton:
+    def __init__(self, keywords: list[str]):
+        """
+        Purpose: Pure Python Aho-Corasick automaton, used when pyahocorasick is not installed
+        Input:
+            - keywords = strings to find; keyword i is reported as (end_index, i)
+        """
+        self.transitions: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.outputs: list[list[int]] = [[]]
+
+        for keyword_id, keyword in enumerate(keywords):
+            state = 0
+            for char in keyword:
+                next_state = self.transitions[state].get(char)
+                if next_state is None:
+                    next_state = len(self.transitions)
+                    self.transitions.append({})
+                    self.fail.append(0)
+                    self.outputs.append([])
+                    self.transitions[state][char] = next_state
+                state = next_state
+            self.outputs[state].append(keyword_id)
+
+        # Breadth-first pass to set failure links and merge outputs along them
+        queue = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.transitions[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.transitions[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.transitions[fallback].get(char, 0)
+                self.outputs[next_state] = self.outputs[next_state] + self.outputs[self.fail[next_state]]
+
+    def iter(self, text: str):
+        """
+        Purpose: Yield (end_index, keyword_id) for every keyword occurrence in text
+        """
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in self.transitions[state]:
+                state = self.fail[state]
+            state = self.transitions[state].get(char, 0)
+            for keyword_id in self.outputs[state]:
+                yield index, keyword_id
+
+
+class SearchTermIndex:
+    def __init__(self, search_terms: list[str], word_boundary: bool = False, fuzzy_threshold: int | None = None):
+        """
+        Purpose: Find every search term contained in a text with a single pass over the text
+        Input:
+            - search_terms = terms to search for (matched case-insensitively)
+            - word_boundary = only match terms that are not part of a larger word
+            - fuzzy_threshold = if set, terms without an exact match also match when rapidfuzz's partial_ratio
+                                reaches this score (0-100); costs one comparison per unmatched term
+        """
+        self.search_terms = list(search_terms or [])
+        self.word_boundary = word_boundary
+        self.fuzzy_threshold = fuzzy_threshold
+
+        # Terms are stored lowercased once; duplicates share a keyword but keep their own positions in the output
+        self.keywords: list[str] = []
+        self.keyword_terms: list[list[int]] = []
+        self.always_match: list[int] = []
+        keyword_ids: dict[str, int] = {}
+        for term_id, term in enumerate(self.search_terms):
+            keyword = term.lower()
+            if not keyword:
+                self.always_match.append(term_id)  # An empty term is contained in every text
+                continue
+            if keyword not in keyword_ids:
+                keyword_ids[keyword] = len(self.keywords)
+                self.keywords.append(keyword)
+                self.keyword_terms.append([])
+            self.keyword_terms[keyword_ids[keyword]].append(term_id)
+
+        self.automaton = None
+        if self.keywords:
+            if ahocorasick is not None:
+                self.automaton = ahocorasick.Automaton()
+                for keyword_id, keyword in enumerate(self.keywords):
+                    self.automaton.add_word(keyword, keyword_id)
+                self.automaton.make_automaton()
+            else:
+                self.automaton = AhoCorasickAutomaton(self.keywords)
+
+    def __reduce__(self):
+        # Rebuild from terms when sent to a worker process (cached there, so it is built once per process)
+        return build_search_index, (tuple(self.search_terms), self.word_boundary, self.fuzzy_threshold)
+
+    def __bool__(self) -> bool:
+        return bool(self.search_terms)
+
+    def _is_word(self, text: str, start: int, end: int) -> bool:
+        """
+        Purpose: determine if text[start:end] is not joined to letters or digits on either side
+        """
+        return ((start == 0 or not text[start - 1].isalnum())
+                and (end == len(text) or not text[end].isalnum()))
+
+    def match(self, text: str) -> list[str]:
+        """
+        Purpose: Return every search term found in text, in the order the terms were given
+        """
+        if not self.search_terms:
+            return []
+        lowered = text.lower()
+        matched_ids = set(self.always_match)
+
+        if self.automaton is not None:
+            found_keywords: set[int] = set()
+            for end_index, keyword_id in self.automaton.iter(lowered):
+                if keyword_id in found_keywords:
+                    continue
+                if self.word_boundary:
+                    start = end_index - len(self.keywords[keyword_id]) + 1
+                    if not self._is_word(lowered, start, end_index + 1):
+                        continue
+                found_keywords.add(keyword_id)
+            for keyword_id in found_keywords:
+                matched_ids.update(self.keyword_terms[keyword_id])
+
+        if self.fuzzy_threshold is not None:
+            for keyword_id, keyword in enumerate(self.keywords):
+                term_ids = self.keyword_terms[keyword_id]
+                if term_ids[0] not in matched_ids and fuzz.partial_ratio(keyword, lowered) >= self.fuzzy_threshold:
+                    matched_ids.update(term_ids)
+
+        return [self.search_terms[term_id] for term_id in sorted(matched_ids)]
+
+
+@lru_cache(maxsize=32)
+def build_search_index(search_terms: tuple[str, ...], word_boundary: bool = False,
+                       fuzzy_threshold: int | None = None) -> SearchTermIndex:
+    """
+    Purpose: Build (or reuse) a SearchTermIndex for a set of search terms
+    """
+    return SearchTermIndex(list(search_terms), word_boundary, fuzzy_threshold)
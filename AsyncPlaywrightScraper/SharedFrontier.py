@@ -0,0 +1,400 @@
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+PENDING, LEASED, DONE, FAILED = 0, 1, 2, 3
+
+
+@dataclass
+class WorkItem:
+    key: str
+    payload: dict
+    attempts: int
+
+
+class SQLiteFrontier:
+    name = "sqlite"
+
+    def __init__(self, path: str = "frontier.sqlite", lease_seconds: float = 120.0, max_attempts: int = 3,
+                 DEBUG: bool = False):
+        """
+        Purpose: Work queue and dedup store shared by crawl worker processes on one machine, in a SQLite file in WAL
+                 mode. Workers claim items with a lease; an item whose lease runs out (worker crashed or hung) is
+                 handed out again, up to max_attempts claims
+        Input:
+            - path = SQLite database file shared by the coordinator and every worker
+            - lease_seconds = How long a claimed item stays with a worker without being renewed
+            - max_attempts = Claims before an item is marked failed
+        """
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.DEBUG = DEBUG
+
+        # Transactions are opened explicitly (BEGIN IMMEDIATE) so a claim never races another process
+        self.connection = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        # Workers call the frontier from worker threads (asyncio.to_thread); one statement or transaction at a time
+        self.lock = threading.Lock()
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS work (
+                key TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                state INTEGER NOT NULL DEFAULT 0,
+                owner TEXT,
+                lease_until REAL NOT NULL DEFAULT 0,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                outcome TEXT
+            );
+            CREATE INDEX IF NOT EXISTS work_state ON work (state, lease_until);
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                work_key TEXT NOT NULL,
+                payload TEXT NOT NULL
+            );
+        """)
+
+    @contextmanager
+    def _transaction(self):
+        """
+        Purpose: Take the database write lock for a read-modify-write, committed when the with block ends
+        """
+        with self.lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            with self.connection:
+                yield self.connection
+
+    def _query(self, sql: str, parameters: tuple = ()) -> list[tuple]:
+        with self.lock:
+            return self.connection.execute(sql, parameters).fetchall()
+
+    def add(self, items: list[tuple[str, dict]]) -> int:
+        """
+        Purpose: Queue work items; keys already known (pending, claimed, done or failed) are ignored
+        Input:
+            - items = (key, payload) pairs
+        Output:
+            - Number of new items
+        """
+        with self._transaction() as connection:
+            before = connection.total_changes
+            connection.executemany("INSERT OR IGNORE INTO work (key, payload) VALUES (?, ?)",
+                                   [(key, json.dumps(payload)) for key, payload in items])
+            return connection.total_changes - before
+
+    def claim(self, owner: str, limit: int = 1) -> list[WorkItem]:
+        """
+        Purpose: Lease up to limit pending items to a worker. Expired leases are recovered first
+        Input:
+            - owner = Worker id
+            - limit = Max number of items to claim
+        Output:
+            - Claimed items (empty when nothing is pending right now)
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            connection.execute("UPDATE work SET state = ?, owner = NULL WHERE state = ? AND lease_until < ? AND attempts >= ?",
+                               (FAILED, LEASED, now, self.max_attempts))
+            connection.execute("UPDATE work SET state = ?, owner = NULL WHERE state = ? AND lease_until < ?",
+                               (PENDING, LEASED, now))
+            rows = connection.execute("SELECT key, payload, attempts FROM work WHERE state = ? ORDER BY rowid LIMIT ?",
+                                      (PENDING, limit)).fetchall()
+            connection.executemany(
+                "UPDATE work SET state = ?, owner = ?, lease_until = ?, attempts = attempts + 1 WHERE key = ?",
+                [(LEASED, owner, now + self.lease_seconds, key) for key, _, _ in rows])
+        return [WorkItem(key, json.loads(payload), attempts + 1) for key, payload, attempts in rows]
+
+    def renew(self, owner: str, keys: list[str]) -> int:
+        """
+        Purpose: Extend the leases a worker still holds (heartbeat)
+        Output:
+            - Number of leases renewed (fewer than keys if some expired and were claimed by another worker)
+        """
+        with self._transaction() as connection:
+            before = connection.total_changes
+            connection.executemany("UPDATE work SET lease_until = ? WHERE key = ? AND owner = ? AND state = ?",
+                                   [(time.time() + self.lease_seconds, key, owner, LEASED) for key in keys])
+            return connection.total_changes - before
+
+    def complete(self, owner: str, key: str, outcome: dict | None = None, new_items: list[tuple[str, dict]] = (),
+                 results: list[tuple[str, dict]] = ()) -> bool:
+        """
+        Purpose: Finish a claimed item in one transaction: store its outcome, queue the work it found and record its
+                 results (result keys already recorded are ignored)
+        Input:
+            - owner = Worker id holding the lease
+            - key = Claimed item
+            - outcome = Summary of the item (ex. the company homepage)
+            - new_items = (key, payload) pairs to queue
+            - results = (result key, payload) pairs
+        Output:
+            - False if the lease was lost to another worker; nothing is written then
+        """
+        with self._transaction() as connection:
+            finished = connection.execute(
+                "UPDATE work SET state = ?, owner = NULL, outcome = ? WHERE key = ? AND owner = ? AND state = ?",
+                (DONE, json.dumps(outcome), key, owner, LEASED)).rowcount
+            if not finished:
+                return False
+            connection.executemany("INSERT OR IGNORE INTO work (key, payload) VALUES (?, ?)",
+                                   [(item_key, json.dumps(payload)) for item_key, payload in new_items])
+            connection.executemany("INSERT OR IGNORE INTO results (key, work_key, payload) VALUES (?, ?, ?)",
+                                   [(result_key, key, json.dumps(payload)) for result_key, payload in results])
+        return True
+
+    def release(self, owner: str, key: str) -> None:
+        """
+        Purpose: Give a claimed item back after an error; it is retried until it reaches max_attempts
+        """
+        with self._transaction() as connection:
+            connection.execute("UPDATE work SET state = CASE WHEN attempts >= ? THEN ? ELSE ? END, owner = NULL "
+                               "WHERE key = ? AND owner = ? AND state = ?",
+                               (self.max_attempts, FAILED, PENDING, key, owner, LEASED))
+
+    def counts(self) -> dict[str, int]:
+        """
+        Purpose: Return the number of pending, leased, done and failed items
+        """
+        counts = dict(self._query("SELECT state, COUNT(*) FROM work GROUP BY state"))
+        return {"pending": counts.get(PENDING, 0), "leased": counts.get(LEASED, 0),
+                "done": counts.get(DONE, 0), "failed": counts.get(FAILED, 0)}
+
+    def outcomes(self) -> dict[str, dict | None]:
+        """
+        Purpose: Return the outcome of every finished item by key
+        """
+        return {key: json.loads(outcome) for key, outcome in
+                self._query("SELECT key, outcome FROM work WHERE state = ?", (DONE,))}
+
+    def unfinished(self) -> list[str]:
+        """
+        Purpose: Return the keys of items still pending or leased (work a resumed run would continue)
+        """
+        return [key for key, in self._query("SELECT key FROM work WHERE state IN (?, ?)", (PENDING, LEASED))]
+
+    def results(self) -> list[tuple[str, str, dict]]:
+        """
+        Purpose: Return every recorded result as (result key, work item key, payload)
+        """
+        return [(key, work_key, json.loads(payload)) for key, work_key, payload in
+                self._query("SELECT key, work_key, payload FROM results ORDER BY rowid")]
+
+    def clear(self) -> None:
+        """
+        Purpose: Remove all work items and results
+        """
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM work")
+            connection.execute("DELETE FROM results")
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
+
+
+class RedisFrontier:
+    name = "redis"
+
+    # Claim: recover expired leases, then lease up to ARGV[4] pending keys. Runs atomically on the server
+    _claim_script = """
+        local prefix, now, lease_until, limit, owner, max_attempts = KEYS[1], tonumber(ARGV[1]), ARGV[2], tonumber(ARGV[3]), ARGV[4], tonumber(ARGV[5])
+        for _, key in ipairs(redis.call('ZRANGEBYSCORE', prefix .. ':leases', '-inf', now)) do
+            redis.call('ZREM', prefix .. ':leases', key)
+            redis.call('HDEL', prefix .. ':owners', key)
+            if tonumber(redis.call('HGET', prefix .. ':attempts', key) or 0) >= max_attempts then
+                redis.call('SADD', prefix .. ':failed', key)
+            else
+                redis.call('LPUSH', prefix .. ':pending', key)
+            end
+        end
+        local claimed = {}
+        for _ = 1, limit do
+            local key = redis.call('LPOP', prefix .. ':pending')
+            if not key then break end
+            redis.call('ZADD', prefix .. ':leases', lease_until, key)
+            redis.call('HSET', prefix .. ':owners', key, owner)
+            local attempts = redis.call('HINCRBY', prefix .. ':attempts', key, 1)
+            table.insert(claimed, key)
+            table.insert(claimed, redis.call('HGET', prefix .. ':work', key))
+            table.insert(claimed, attempts)
+        end
+        return claimed
+    """
+
+    # Complete: ARGV = key, owner, outcome, number of new items, new item key/payload pairs, result key/payload pairs
+    _complete_script = """
+        local prefix, key, owner = KEYS[1], ARGV[1], ARGV[2]
+        if redis.call('HGET', prefix .. ':owners', key) ~= owner or not redis.call('ZSCORE', prefix .. ':leases', key) then
+            return 0
+        end
+        redis.call('ZREM', prefix .. ':leases', key)
+        redis.call('HDEL', prefix .. ':owners', key)
+        redis.call('HSET', prefix .. ':done', key, ARGV[3])
+        local new_items = tonumber(ARGV[4])
+        local index = 5
+        for _ = 1, new_items do
+            if redis.call('HSETNX', prefix .. ':work', ARGV[index], ARGV[index + 1]) == 1 then
+                redis.call('RPUSH', prefix .. ':pending', ARGV[index])
+            end
+            index = index + 2
+        end
+        while index < #ARGV do
+            if redis.call('HSETNX', prefix .. ':results', ARGV[index], ARGV[index + 1]) == 1 then
+                redis.call('RPUSH', prefix .. ':result_order', ARGV[index])
+            end
+            index = index + 2
+        end
+        return 1
+    """
+
+    _release_script = """
+        local prefix, key, owner, max_attempts = KEYS[1], ARGV[1], ARGV[2], tonumber(ARGV[3])
+        if redis.call('HGET', prefix .. ':owners', key) ~= owner or not redis.call('ZSCORE', prefix .. ':leases', key) then
+            return 0
+        end
+        redis.call('ZREM', prefix .. ':leases', key)
+        redis.call('HDEL', prefix .. ':owners', key)
+        if tonumber(redis.call('HGET', prefix .. ':attempts', key) or 0) >= max_attempts then
+            redis.call('SADD', prefix .. ':failed', key)
+        else
+            redis.call('RPUSH', prefix .. ':pending', key)
+        end
+        return 1
+    """
+
+    _renew_script = """
+        local prefix, owner, lease_until, renewed = KEYS[1], ARGV[1], ARGV[2], 0
+        for index = 3, #ARGV do
+            if redis.call('HGET', prefix .. ':owners', ARGV[index]) == owner then
+                redis.call('ZADD', prefix .. ':leases', 'XX', lease_until, ARGV[index])
+                renewed = renewed + 1
+            end
+        end
+        return renewed
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379/0", prefix: str = "frontier", lease_seconds: float = 120.0,
+                 max_attempts: int = 3, DEBUG: bool = False):
+        """
+        Purpose: Same frontier as SQLiteFrontier on a Redis-compatible server, so workers on several machines can share
+                 it. Claims, completions and lease recovery run as Lua scripts, so each is atomic
+        Input:
+            - url = Server URL
+            - prefix = Key prefix (one frontier per prefix)
+            - lease_seconds / max_attempts = See SQLiteFrontier
+        """
+        if redis is None:
+            raise ImportError("The redis frontier backend needs the redis package (pip install redis)")
+        self.url = url
+        self.prefix = prefix
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.DEBUG = DEBUG
+
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.claim_script = self.client.register_script(self._claim_script)
+        self.complete_script = self.client.register_script(self._complete_script)
+        self.release_script = self.client.register_script(self._release_script)
+        self.renew_script = self.client.register_script(self._renew_script)
+
+    def _key(self, name: str) -> str:
+        return f"{self.prefix}:{name}"
+
+    def add(self, items: list[tuple[str, dict]]) -> int:
+        if not items:
+            return 0
+        pipeline = self.client.pipeline()
+        for key, payload in items:
+            pipeline.hsetnx(self._key("work"), key, json.dumps(payload))
+        added = [key for (key, _), new in zip(items, pipeline.execute()) if new]
+        if added:
+            self.client.rpush(self._key("pending"), *added)
+        return len(added)
+
+    def claim(self, owner: str, limit: int = 1) -> list[WorkItem]:
+        now = time.time()
+        claimed = self.claim_script(keys=[self.prefix],
+                                    args=[now, now + self.lease_seconds, limit, owner, self.max_attempts])
+        return [WorkItem(claimed[index], json.loads(claimed[index + 1]), int(claimed[index + 2]))
+                for index in range(0, len(claimed), 3)]
+
+    def renew(self, owner: str, keys: list[str]) -> int:
+        if not keys:
+            return 0
+        return self.renew_script(keys=[self.prefix], args=[owner, time.time() + self.lease_seconds, *keys])
+
+    def complete(self, owner: str, key: str, outcome: dict | None = None, new_items: list[tuple[str, dict]] = (),
+                 results: list[tuple[str, dict]] = ()) -> bool:
+        args = [key, owner, json.dumps(outcome), len(new_items)]
+        for item_key, payload in new_items:
+            args += [item_key, json.dumps(payload)]
+        for result_key, payload in results:
+            args += [result_key, json.dumps({"work_key": key, "payload": payload})]
+        return bool(self.complete_script(keys=[self.prefix], args=args))
+
+    def release(self, owner: str, key: str) -> None:
+        self.release_script(keys=[self.prefix], args=[key, owner, self.max_attempts])
+
+    def counts(self) -> dict[str, int]:
+        pipeline = self.client.pipeline()
+        pipeline.llen(self._key("pending"))
+        pipeline.zcard(self._key("leases"))
+        pipeline.hlen(self._key("done"))
+        pipeline.scard(self._key("failed"))
+        pending, leased, done, failed = pipeline.execute()
+        return {"pending": pending, "leased": leased, "done": done, "failed": failed}
+
+    def outcomes(self) -> dict[str, dict | None]:
+        return {key: json.loads(outcome) for key, outcome in self.client.hgetall(self._key("done")).items()}
+
+    def unfinished(self) -> list[str]:
+        pipeline = self.client.pipeline()
+        pipeline.lrange(self._key("pending"), 0, -1)
+        pipeline.zrange(self._key("leases"), 0, -1)
+        pending, leased = pipeline.execute()
+        return pending + leased
+
+    def results(self) -> list[tuple[str, str, dict]]:
+        stored = self.client.hgetall(self._key("results"))
+        results = []
+        for key in self.client.lrange(self._key("result_order"), 0, -1):
+            result = json.loads(stored[key])
+            results.append((key, result["work_key"], result["payload"]))
+        return results
+
+    def clear(self) -> None:
+        names = ("work", "pending", "leases", "owners", "attempts", "done", "failed", "results", "result_order")
+        self.client.delete(*(self._key(name) for name in names))
+
+    def close(self) -> None:
+        self.client.close()
+
+
+frontier_backends = {
+    SQLiteFrontier.name: SQLiteFrontier,
+    RedisFrontier.name: RedisFrontier,
+}
+
+
+def create_frontier(backend: str = "sqlite", **options):
+    """
+    Purpose: Create a shared frontier by backend name
+    Input:
+        - backend = "sqlite" (one machine) or "redis" (several machines)
+        - options = Keyword arguments for the backend (ex. path for sqlite, url for redis)
+    Output:
+        - New frontier connection (each process creates its own)
+    """
+    if backend not in frontier_backends:
+        raise ValueError(f"Unknown frontier backend '{backend}', expected one of {list(frontier_backends)}")
+    return frontier_backends[backend](**options)
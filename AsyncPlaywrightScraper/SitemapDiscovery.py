@@ -0,0 +1,196 @@
+import asyncio
+import zlib
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+import aiohttp
+from lxml import etree
+from HostScheduler import HostScheduler
+
+
+@dataclass
+class SitemapEntry:
+    loc: str
+    lastmod: float | None
+    is_index: bool
+
+
+def parse_lastmod(value: str | None) -> float | None:
+    """
+    Purpose: Convert a sitemap <lastmod> (W3C datetime, ex. 2024-05-01 or 2024-05-01T10:00:00+00:00) to a timestamp
+    Output:
+        - POSIX timestamp, or None if missing or unreadable (dates without a timezone are treated as UTC)
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def parse_robots_sitemaps(robots_txt: str) -> list[str]:
+    """
+    Purpose: Return the sitemap URLs listed in a robots.txt
+    """
+    sitemaps = []
+    for line in robots_txt.splitlines():
+        key, _, value = line.partition(":")
+        if key.strip().lower() == "sitemap" and value.strip():
+            sitemaps.append(value.strip())
+    return sitemaps
+
+
+class SitemapParser:
+    gzip_magic = b"\x1f\x8b"
+
+    def __init__(self):
+        """
+        Purpose: Incremental sitemap / sitemap index parser. Bytes are fed as they arrive (gzipped or not) and each
+                 <url>/<sitemap> element is freed once read, so memory stays flat on 50k-URL sitemaps
+        """
+        self.parser = etree.XMLPullParser(events=("end",), resolve_entities=False, no_network=True, huge_tree=True)
+        self.decompressor = None
+        self.started = False
+
+    def feed(self, chunk: bytes) -> list[SitemapEntry]:
+        if not self.started:
+            self.started = True
+            if chunk.startswith(self.gzip_magic):
+                self.decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if self.decompressor:
+            chunk = self.decompressor.decompress(chunk)
+        self.parser.feed(chunk)
+        return self._read_entries()
+
+    def close(self) -> list[SitemapEntry]:
+        if self.decompressor:
+            self.parser.feed(self.decompressor.flush())
+        try:
+            self.parser.close()
+        except etree.XMLSyntaxError:
+            pass  # Truncated sitemap; keep the entries read so far
+        return self._read_entries()
+
+    def _read_entries(self) -> list[SitemapEntry]:
+        entries = []
+        for _, element in self.parser.read_events():
+            tag = etree.QName(element).localname if isinstance(element.tag, str) else None
+            if tag not in ("url", "sitemap"):
+                continue
+            loc = lastmod = None
+            for child in element:
+                if not isinstance(child.tag, str):
+                    continue
+                child_tag = etree.QName(child).localname
+                if child_tag == "loc":
+                    loc = (child.text or "").strip()
+                elif child_tag == "lastmod":
+                    lastmod = child.text
+            if loc:
+                entries.append(SitemapEntry(loc, parse_lastmod(lastmod), tag == "sitemap"))
+            # Free the element and everything before it
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+        return entries
+
+
+class SitemapDiscovery:
+    def __init__(self, headers: dict[str, str] = None, max_sitemaps: int = 20, max_urls: int = 50000,
+                 timeout: int = 30, host_scheduler: HostScheduler = None, DEBUG: bool = False):
+        """
+        Purpose: Find a site's pages from robots.txt and its sitemaps using only lightweight HTTP fetches
+        Input:
+            - headers = HTTP headers sent with every request
+            - max_sitemaps = max number of sitemap files fetched per site
+            - max_urls = max number of page URLs returned per site
+            - timeout = total seconds allowed per request
+            - host_scheduler = HostScheduler that fetches wait on, if any
+        """
+        self.headers = headers
+        self.max_sitemaps = max_sitemaps
+        self.max_urls = max_urls
+        self.timeout = timeout
+        self.host_scheduler = host_scheduler
+        self.DEBUG = DEBUG
+
+    async def _get(self, session: aiohttp.ClientSession, url: str, parser: SitemapParser = None):
+        """
+        Purpose: GET a URL (through the host scheduler, if set)
+        Output:
+            - Parsed SitemapEntry list when a parser is given, otherwise the response text; None on failure
+        """
+        async with self.host_scheduler.slot(url) if self.host_scheduler else nullcontext() as slot:
+            try:
+                async with session.get(url, allow_redirects=True) as response:
+                    if slot:
+                        slot.record_status(response.status, response.headers.get("Retry-After"))
+                    if response.status != 200:
+                        if self.DEBUG:
+                            print(f"[DEBUG][SITEMAP] HTTP {response.status}: {url}")
+                        return None
+                    if parser is None:
+                        return await response.text(errors="replace")
+                    entries = []
+                    async for chunk in response.content.iter_chunked(64 * 1024):
+                        entries.extend(parser.feed(chunk))
+                    entries.extend(parser.close())
+                    return entries
+            except (aiohttp.ClientError, asyncio.TimeoutError, zlib.error, etree.LxmlError) as e:
+                if slot and isinstance(e, asyncio.TimeoutError):
+                    slot.record_timeout()
+                if self.DEBUG:
+                    print(f"[DEBUG][SITEMAP][ERROR] Failed to fetch {url}: {e}")
+                return None
+
+    async def discover(self, homepage: str, prioritize=None) -> list[SitemapEntry]:
+        """
+        Purpose: Collect page URLs from the sitemaps listed in robots.txt (or /sitemap.xml if none are listed)
+        Input:
+            - homepage = Company homepage
+            - prioritize = Optional function of a sitemap URL; sitemaps for which it is true are fetched first
+                           (ex. news-sitemap.xml ahead of product sitemaps)
+        Output:
+            - Page entries, most recently modified first (entries without a lastmod last)
+        """
+        parsed = urlparse(homepage)
+        root = f"{parsed.scheme}://{parsed.netloc}"
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+        async with aiohttp.ClientSession(headers=self.headers, timeout=timeout) as session:
+            robots_txt = await self._get(session, f"{root}/robots.txt")
+            pending = parse_robots_sitemaps(robots_txt) if robots_txt else []
+            if not pending:
+                pending = [f"{root}/sitemap.xml"]
+            if self.DEBUG:
+                print(f"[DEBUG][SITEMAP] Sitemaps from robots.txt: {pending}")
+
+            fetched: set[str] = set()
+            pages: dict[str, SitemapEntry] = {}
+            while pending and len(fetched) < self.max_sitemaps and len(pages) < self.max_urls:
+                sitemap_url = pending.pop(0)
+                if sitemap_url in fetched:
+                    continue
+                fetched.add(sitemap_url)
+                entries = await self._get(session, sitemap_url, SitemapParser())
+                if not entries:
+                    continue
+
+                child_sitemaps = [entry for entry in entries if entry.is_index]
+                child_sitemaps.sort(key=lambda entry: (not (prioritize and prioritize(entry.loc)),
+                                                       -(entry.lastmod or 0)))
+                pending.extend(entry.loc for entry in child_sitemaps)
+                for entry in entries:
+                    if not entry.is_index and entry.loc not in pages and len(pages) < self.max_urls:
+                        pages[entry.loc] = entry
+
+                if self.DEBUG:
+                    print(f"[DEBUG][SITEMAP] {sitemap_url}: {len(entries) - len(child_sitemaps)} pages, "
+                          f"{len(child_sitemaps)} sitemaps")
+
+        return sorted(pages.values(), key=lambda entry: (entry.lastmod is None, -(entry.lastmod or 0)))
@@ -0,0 +1,92 @@
+import json
+import os
+import re
+import time
+from urllib.parse import urlparse
+from RequestBlocker import site_domain
+
+
+class StorageStateStore:
+    def __init__(self, directory: str = "browser_state", DEBUG: bool = False):
+        """
+        Purpose: Keep browser storage state (cookies and localStorage) on disk, one JSON file per site, so consent
+                 choices and session cookies from earlier runs are loaded into new browser contexts
+        Input:
+            - directory = folder holding one <site domain>.json file per site
+        """
+        self.directory = directory
+        self.DEBUG = DEBUG
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, site: str) -> str:
+        return os.path.join(self.directory, re.sub(r"[^a-z0-9.-]", "_", site.lower()) + ".json")
+
+    def _read(self, path: str) -> dict:
+        try:
+            with open(path, encoding="utf-8") as file:
+                state = json.load(file)
+        except (OSError, ValueError):
+            return {"cookies": [], "origins": []}
+        return {"cookies": state.get("cookies", []), "origins": state.get("origins", [])}
+
+    def sites(self) -> list[str]:
+        """
+        Purpose: Return the sites with saved state
+        """
+        return [name[:-len(".json")] for name in os.listdir(self.directory) if name.endswith(".json")]
+
+    def load(self, sites: list[str] = None) -> dict | None:
+        """
+        Purpose: Merge the saved state of some (or all) sites into one Playwright storage_state
+        Input:
+            - sites = registrable domains (ex. lenovo.com) to load; None loads every saved site
+        Output:
+            - {"cookies": [...], "origins": [...]} for new_context(storage_state=...), or None if nothing is saved
+        """
+        now = time.time()
+        cookies, origins = [], []
+        for site in (sites if sites is not None else self.sites()):
+            state = self._read(self._path(site))
+            # Session cookies (expires -1) are kept on purpose; consent banners often use them
+            cookies.extend(cookie for cookie in state["cookies"] if cookie.get("expires", -1) < 0 or cookie["expires"] > now)
+            origins.extend(state["origins"])
+        if not cookies and not origins:
+            return None
+        return {"cookies": cookies, "origins": origins}
+
+    def save(self, state: dict) -> int:
+        """
+        Purpose: Split a context's storage_state by site and merge it into each site's file
+        Input:
+            - state = result of BrowserContext.storage_state()
+        Output:
+            - Number of sites written
+        """
+        by_site: dict[str, dict] = {}
+        for cookie in state.get("cookies", []):
+            site = site_domain(cookie["domain"].lstrip("."))
+            by_site.setdefault(site, {"cookies": [], "origins": []})["cookies"].append(cookie)
+        for origin in state.get("origins", []):
+            if not origin.get("localStorage"):
+                continue
+            site = site_domain(urlparse(origin["origin"]).hostname or "")
+            by_site.setdefault(site, {"cookies": [], "origins": []})["origins"].append(origin)
+
+        by_site.pop("", None)
+        for site, new_state in by_site.items():
+            path = self._path(site)
+            saved = self._read(path)
+            # Newer values replace older ones with the same identity
+            cookies = {(cookie["name"], cookie["domain"], cookie["path"]): cookie for cookie in saved["cookies"]}
+            cookies.update({(cookie["name"], cookie["domain"], cookie["path"]): cookie for cookie in new_state["cookies"]})
+            origins = {origin["origin"]: origin for origin in saved["origins"]}
+            origins.update({origin["origin"]: origin for origin in new_state["origins"]})
+
+            temp_path = path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump({"cookies": list(cookies.values()), "origins": list(origins.values())}, file)
+            os.replace(temp_path, path)
+
+        if self.DEBUG and by_site:
+            print(f"[DEBUG][STORAGE] Saved browser state for {len(by_site)} sites")
+        return len(by_site)
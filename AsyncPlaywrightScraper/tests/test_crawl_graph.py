@@ -0,0 +1,137 @@
+import asyncio
+
+import pytest
+
+from CrawlGraph import CrawlGraph
+from HomepageScraper import HomepageScraper
+from SitemapDiscovery import SitemapEntry
+
+HOMEPAGE = "https://example.com/"
+PAGE = """<html><body>
+    <a href="/newsroom">Newsroom</a>
+    <a href="/press">Press</a>
+    <a href="/products/alpha">Alpha launch</a>
+    <a href="/products/beta">Beta partnership</a>
+</body></html>"""
+
+
+def make_scraper(graph: CrawlGraph, search_terms: list[str]) -> tuple[HomepageScraper, list[str]]:
+    scraper = HomepageScraper("key", search_terms, homepage_cache_path=":memory:", crawl_graph=graph,
+                              politeness=False, sitemap_discovery=False)
+    fetches: list[str] = []
+
+    async def fetch_page(url: str) -> str:
+        fetches.append(url)
+        return PAGE
+
+    scraper._fetch_page = fetch_page
+    return scraper, fetches
+
+
+def crawl_results(scraper: HomepageScraper) -> list[str]:
+    links, results = asyncio.run(scraper._crawl_page(HOMEPAGE, 0))
+    return sorted(result.url for result in results)
+
+
+def test_other_search_terms_on_a_shared_graph_still_find_results():
+    graph = CrawlGraph(":memory:")
+
+    alpha, alpha_fetches = make_scraper(graph, ["alpha"])
+    assert crawl_results(alpha) == ["https://example.com/products/alpha"]
+
+    # Same graph, other terms: the fresh page is not reused, so the beta result is found
+    beta, beta_fetches = make_scraper(graph, ["beta"])
+    assert crawl_results(beta) == ["https://example.com/products/beta"]
+    assert beta_fetches == [HOMEPAGE]
+
+    # Re-running a term set reuses its own page and emits nothing it already emitted
+    alpha.reset_search_values()
+    alpha.update_search_terms(["alpha"])
+    assert crawl_results(alpha) == []
+    assert alpha_fetches == [HOMEPAGE]
+    assert alpha.incremental_counts["fresh"] == 1
+
+
+def test_sitemap_results_are_not_emitted_again():
+    graph = CrawlGraph(":memory:")
+
+    class StubDiscovery:
+        async def discover(self, homepage, prioritize=None):
+            return [SitemapEntry(f"{homepage}{path}", None, False)
+                    for path in ("newsroom", "products/alpha", "products/alpha-two")]
+
+    def seed() -> list[str]:
+        scraper, _ = make_scraper(graph, ["alpha"])
+        scraper.sitemap_discovery = StubDiscovery()
+        scraper.company_homepage = HOMEPAGE
+        emitted: list[str] = []
+
+        async def emit(results):
+            emitted.extend(result.url for result in results)
+
+        asyncio.run(scraper._seed_from_sitemaps(asyncio.Queue(), emit))
+        return sorted(emitted)
+
+    assert seed() == ["https://example.com/products/alpha", "https://example.com/products/alpha-two"]
+    assert seed() == []
+
+
+class StubSitemaps:
+    def __init__(self, paths: list[str]):
+        self.paths = paths
+
+    async def discover(self, homepage, prioritize=None):
+        return [SitemapEntry(f"{homepage}{path}", None, False) for path in self.paths]
+
+
+@pytest.mark.parametrize("parse_workers", [0, 1])
+@pytest.mark.parametrize("sitemap", [False, True])
+def test_sitemap_links_still_match_anchor_text_found_later(sitemap, parse_workers):
+    pages = {
+        HOMEPAGE: '<a href="/newsroom">Newsroom</a>',
+        "https://example.com/newsroom": '<a href="/newsroom/q2-2024">Second quarter results</a>',
+        "https://example.com/newsroom/q2-2024": "<p>Report</p>",
+    }
+    scraper = HomepageScraper("key", ["quarter"], homepage_cache_path=":memory:", politeness=False,
+                              sitemap_discovery=False, parse_workers=parse_workers)
+    if sitemap:
+        # The sitemap lists the article without anchor text; it is relevant, so seeding queues it
+        scraper.sitemap_discovery = StubSitemaps(["newsroom/q2-2024", "about"])
+    fetches: list[str] = []
+
+    async def fetch_page(url: str) -> str:
+        fetches.append(url)
+        return pages.get(url, "")
+
+    scraper._fetch_page = fetch_page
+    scraper.company_homepage = HOMEPAGE
+    try:
+        asyncio.run(scraper.crawl(max_tabs=2))
+    finally:
+        if scraper.parse_executor:
+            scraper.parse_executor.shutdown()
+
+    assert [(result.url, result.text) for result in scraper.results] == \
+           [("https://example.com/newsroom/q2-2024", "Second quarter results")]
+    assert fetches.count("https://example.com/newsroom/q2-2024") <= 1  # Queued from the sitemap at most
+
+
+def test_graph_from_before_signatures_is_rebuilt(tmp_path):
+    path = str(tmp_path / "graph.sqlite")
+    graph = CrawlGraph(path)
+    graph.connection.executescript("""
+        DROP TABLE pages; DROP TABLE results;
+        CREATE TABLE pages (url TEXT PRIMARY KEY, depth INTEGER NOT NULL, content_hash TEXT NOT NULL,
+                            last_fetched REAL NOT NULL, links TEXT NOT NULL);
+        CREATE TABLE results (url TEXT PRIMARY KEY, first_seen REAL NOT NULL);
+    """)
+    graph.close()
+
+    graph = CrawlGraph(path)
+    graph.record_page(HOMEPAGE, 0, "hash", ["https://example.com/newsroom"], "terms")
+    assert graph.get_page(HOMEPAGE, "terms").links == ["https://example.com/newsroom"]
+    assert graph.get_page(HOMEPAGE, "other") is None
+    assert graph.new_results([HOMEPAGE], "terms") == {HOMEPAGE}
+    assert graph.new_results([HOMEPAGE], "other") == {HOMEPAGE}
+    assert graph.new_results([HOMEPAGE], "terms") == set()
+    graph.close()
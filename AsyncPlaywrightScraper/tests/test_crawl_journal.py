@@ -0,0 +1,50 @@
+import asyncio
+
+from HomepageScraper import HomepageScraper
+
+HOMEPAGE = "https://example.com/"
+
+
+def make_scraper(journal_dir: str, search_terms: list[str], **kwargs) -> HomepageScraper:
+    scraper = HomepageScraper("key", search_terms, homepage_cache_path=":memory:", politeness=False,
+                              sitemap_discovery=False, journal_dir=journal_dir, **kwargs)
+    scraper.company_homepage = HOMEPAGE
+    return scraper
+
+
+def journal_an_interrupted_crawl(scraper: HomepageScraper) -> None:
+    async def run():
+        await scraper._resume_from_journal(asyncio.Queue(), emit)
+        scraper.journal.record(queued=[(HOMEPAGE, 0), ("https://example.com/newsroom", 1)],
+                               results=[("https://example.com/alpha", "Alpha launch", ["alpha"])])
+        scraper.journal.close()
+
+    asyncio.run(run())
+
+
+async def emit(results):
+    pass
+
+
+def resumes(scraper: HomepageScraper) -> bool:
+    queue = asyncio.Queue()
+    resumed = asyncio.run(scraper._resume_from_journal(queue, emit))
+    scraper.journal.close()
+    return bool(resumed) and queue.qsize() > 0
+
+
+def test_journal_is_resumed_only_with_the_same_crawl_settings(tmp_path):
+    journal_dir = str(tmp_path)
+    journal_an_interrupted_crawl(make_scraper(journal_dir, ["alpha"]))
+
+    assert resumes(make_scraper(journal_dir, ["alpha"]))
+    # Same search terms, but other keywords or depth: the journaled frontier and results do not apply
+    assert not resumes(make_scraper(journal_dir, ["alpha"], whitelist_keywords=[r"press"]))
+
+    journal_an_interrupted_crawl(make_scraper(journal_dir, ["alpha"]))
+    assert not resumes(make_scraper(journal_dir, ["alpha"], max_depth=1))
+
+    journal_an_interrupted_crawl(make_scraper(journal_dir, ["alpha"]))
+    scraper = make_scraper(journal_dir, ["alpha"])
+    scraper.update_search_terms(["alpha"], word_boundary=True)
+    assert not resumes(scraper)
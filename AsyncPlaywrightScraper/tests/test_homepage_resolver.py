@@ -0,0 +1,89 @@
+import asyncio
+import os
+
+from aiohttp import web
+
+from HomepageResolver import HomepageResolver, default_cache_path
+
+RESULTS = {
+    "acme official website": [{"url": "https://en.wikipedia.org/wiki/Acme"}, {"url": "https://www.acme.com/"}],
+    "globex official website": [{"url": "https://en.wikipedia.org/wiki/Globex"}],
+}
+
+
+async def run_with_stub_api(test, handler=None):
+    """
+    Purpose: Run test(resolver_url, requests) against a local stand-in for the Brave web search endpoint
+    """
+    requests: list[str] = []
+
+    async def search(request: web.Request) -> web.Response:
+        requests.append(request.query["q"])
+        await asyncio.sleep(0.05)  # Keep lookups in flight long enough to overlap
+        if handler:
+            return await handler(request, requests)
+        return web.json_response({"web": {"results": RESULTS.get(request.query["q"].lower(), [])}})
+
+    app = web.Application()
+    app.router.add_get("/search", search)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    try:
+        await test(f"http://127.0.0.1:{port}/search", requests)
+    finally:
+        await runner.cleanup()
+
+
+def test_repeat_and_concurrent_lookups_make_one_call(tmp_path):
+    cache_path = str(tmp_path / "homepages.sqlite")
+
+    async def test(url, requests):
+        resolver = HomepageResolver("key", brave_url=url, cache_path=cache_path)
+        homepages = await asyncio.gather(*(resolver.resolve(name) for name in ["Acme", "ACME", "acme."]))
+        assert homepages == ["https://www.acme.com/"] * 3
+        assert len(requests) == 1  # Same normalized name: one API call shared by every caller
+
+        assert await resolver.resolve("Globex") is None
+        assert await resolver.resolve("Globex") is None  # Misses are cached too
+        assert len(requests) == 2
+        await resolver.stop()
+        resolver.cache.close()
+
+        # A new resolver on the same file answers from the persistent cache without any request
+        resolver = HomepageResolver("key", brave_url=url, cache_path=cache_path)
+        assert await resolver.resolve("Acme") == "https://www.acme.com/"
+        assert await resolver.resolve("Globex") is None
+        assert len(requests) == 2
+        await resolver.stop()
+        resolver.cache.close()
+
+    asyncio.run(run_with_stub_api(test))
+
+
+def test_retries_server_errors_and_does_not_cache_failures(tmp_path):
+    async def flaky(request, requests):
+        if len(requests) < 3:
+            return web.Response(status=503)
+        return web.json_response({"web": {"results": RESULTS["acme official website"]}})
+
+    async def test(url, requests):
+        resolver = HomepageResolver("key", brave_url=url, cache_path=str(tmp_path / "homepages.sqlite"),
+                                    retries=1, backoff_factor=0.01)
+        assert await resolver.resolve("Acme") is None  # Both attempts fail
+        assert len(requests) == 2
+        assert await resolver.resolve("Acme") == "https://www.acme.com/"  # The failure was not cached
+        assert len(requests) == 3
+        await resolver.stop()
+        resolver.cache.close()
+
+    asyncio.run(run_with_stub_api(test, flaky))
+
+
+def test_default_cache_path_is_in_user_cache_folder(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    path = default_cache_path()
+    assert path == os.path.join(str(tmp_path), "AsyncPlaywrightScraper", "homepage_cache.sqlite")
+    assert os.path.isdir(os.path.dirname(path))
@@ -0,0 +1,84 @@
+import re
+from urllib.parse import urlparse
+
+import pytest
+
+from HomepageScraper import HomepageScraper
+from LinkClassifier import LinkClassifier, hyperscan
+
+FIXTURE_PATHS = [
+    "", "/", "news", "/news", "/newsroom", "/News/", "/en-us/newsroom/", "/company/press-releases",
+    "/press", "/pressreleases", "/media", "/mediacenter", "/insights/", "/insight", "/articles", "/blog",
+    "/blogs/tech", "/updates", "/announcements", "/investor-relations", "/investors relations updates",
+    "/company-news", "/company_news", "/industry-news", "/bulletins", "/journalists",
+    "/contact", "/news/contact", "/careers", "/newsroom/jobs", "/support", "/faq", "/privacy", "/news/terms",
+    "/legal", "/cookies", "/sitemap", "/news/search", "/login", "/register", "/account", "/profile", "/cart",
+    "/checkout", "/blog/author", "/blog/author/jane-doe", "/news/date/2024", "/news/date/2024/",
+    "/news/index.html", "/press/release.PDF", "/media/logo.png", "/newsroom/page.php", "/blogxhtml",
+    "https://www.facebook.com/acme-news", "https://instagram.com/acmenews", "https://linkedin.com/company/acme-news",
+    "https://twitter.com/acmenews", "https://www.youtube.com/c/acmenews", "https://www.tiktok.com/@acmenews",
+    "https://x.com/acmenews", "https://X.com/AcmeNews",
+    "/news/2024/07/15/launch", "/news/2024-07-15", "/news/20240715", "/news/15/07/2024", "/news/07-15-2025",
+    "/blog/123e4567-e89b-12d3-a456-426614174000", "/news/ACME-ANNOUNCES-RECORD-QUARTERLY-RESULTS-TODAY",
+    "/news/acme-wins-award", "/news/a-b-c-d", "/news/2024", "/news/12", "/press/room?page=2", "/news#top",
+    "https://example.com/en/newsroom/press-releases", "https://example.com/about", "/about-us", "/products",
+    "/résumé/news", "/новости/news", "/newsletter", "/media-kit", "/investorrelations",
+]
+
+
+class BaselineClassifier:
+    """
+    Purpose: The per-pattern is_article/is_relevant logic LinkClassifier replaced, kept as the parity reference
+    """
+    def __init__(self, whitelist_keywords: list[str], blacklist_keywords: list[str]):
+        self.whitelist_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in whitelist_keywords]
+        self.blacklist_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in blacklist_keywords]
+
+    @staticmethod
+    def is_article(path: str) -> bool:
+        parsed = urlparse(path)
+        path = parsed.path.lower().strip("/") or path.lower().strip("/")
+        if not path:
+            return False
+        slug = path.split("/")[-1]
+        parts = slug.split("-")
+        if len(parts) >= 4 and sum(len(p) for p in parts) > 30:
+            return True
+        if re.search(r'/\d{4}([/-])?\d{2}(([/-])?\d{2})?([/-])?', f"/{path}/"):
+            return True
+        if re.search(r'/\d{2}([/-])?\d{2}(([/-])?\d{4})?([/-])?', f"/{path}/"):
+            return True
+        if re.search(r'[a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}', path):
+            return True
+        return False
+
+    def is_relevant(self, path: str) -> bool:
+        path_lower = path.lower()
+        article_check = self.is_article(path_lower)
+        has_whitelist_match = any(pattern.search(path_lower) for pattern in self.whitelist_patterns)
+        has_blacklist_match = any(pattern.search(path_lower) for pattern in self.blacklist_patterns)
+        return has_whitelist_match and not has_blacklist_match and not article_check
+
+
+@pytest.mark.parametrize("use_hyperscan", [
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(hyperscan is None, reason="hyperscan is not installed")),
+])
+def test_matches_baseline_decisions(use_hyperscan):
+    whitelist, blacklist = HomepageScraper.default_whitelist, HomepageScraper.default_blacklist
+    baseline = BaselineClassifier(whitelist, blacklist)
+    classifier = LinkClassifier(whitelist, blacklist, use_hyperscan=use_hyperscan)
+
+    expected = [baseline.is_relevant(path) for path in FIXTURE_PATHS]
+    assert classifier.classify(FIXTURE_PATHS) == expected
+    assert [classifier.is_article(path) for path in FIXTURE_PATHS] == \
+           [baseline.is_article(path) for path in FIXTURE_PATHS]
+    assert any(expected) and not all(expected)
+
+
+def test_unsupported_pattern_falls_back_to_regex():
+    # Lookarounds cannot be compiled by Hyperscan; the classifier must still decide like the baseline
+    whitelist, blacklist = [r"news(?!letter)"], [r"(?<=/)jobs$"]
+    baseline = BaselineClassifier(whitelist, blacklist)
+    classifier = LinkClassifier(whitelist, blacklist)
+    assert classifier.classify(FIXTURE_PATHS) == [baseline.is_relevant(path) for path in FIXTURE_PATHS]
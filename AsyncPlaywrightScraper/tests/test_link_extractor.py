@@ -0,0 +1,28 @@
+import pytest
+
+from LinkExtractor import extract_links
+
+pytest.importorskip("bs4")
+from Benchmarks import legacy_extract_links
+
+SOURCE_URL = "https://www.acme.com/company/"
+
+FIXTURE_PAGES = [
+    '<html><body><a href="/news">News</a><a href="press/">Press <b>room</b></a></body></html>',
+    '<a href="/a">x<!-- split -->y</a><a href="/b">Go<script>var s = "1";</script><style>.x{}</style> now</a>',
+    '<a href="/c">A<noscript>ns</noscript><template><span>t</span></template><b>B</b></a>',
+    '<a href="/d"><span>Second</span> <em>quarter</em>\n results </a><a href="/d/">duplicate</a>',
+    '<a href="/outer">outer <a href="/inner">inner</a> tail</a>',
+    '<a href="/e">unclosed <div>block</div>',
+    '<a href="%2Fencoded%20path">Encoded</a><a href="mailto:press@acme.com">Mail</a><a href="#top">Top</a>',
+    '<div onclick="location.href=\'/clicked\'">Click</div><span data-url="/data">d</span>'
+    '<span data-href="https://other.com/x">e</span>',
+    '<head><meta http-equiv="Refresh" content="0; url=/moved"></head><body><a href="/moved">Moved</a></body>',
+    '<a href="https://WWW.Acme.com/Investors/?q=1#x">Investors<script>track()</script></a>',
+    '<p>no links here <!-- <a href="/commented">hidden</a> --></p>',
+]
+
+
+@pytest.mark.parametrize("content", FIXTURE_PAGES)
+def test_matches_legacy_extractor(content):
+    assert extract_links(content, SOURCE_URL) == legacy_extract_links(content, SOURCE_URL)
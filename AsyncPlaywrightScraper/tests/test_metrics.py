@@ -0,0 +1,29 @@
+import asyncio
+import json
+
+from HomepageScraper import HomepageScraper
+from Metrics import JsonLinesSink, Metrics
+
+
+def read_events(path) -> list[dict]:
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+def test_scraper_stop_writes_buffered_events_and_keeps_the_sink_open(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    metrics = Metrics(sink=JsonLinesSink(str(path), flush_every=500))
+    scraper = HomepageScraper("key", ["alpha"], homepage_cache_path=":memory:", metrics=metrics,
+                              politeness=False, sitemap_discovery=False)
+
+    metrics.count("pages", url="https://example.com/")
+    metrics.observe("fetch", 12.5, "https://example.com/")
+    assert read_events(path) == []  # Still buffered
+
+    asyncio.run(scraper.stop())
+    assert [event["name"] for event in read_events(path)] == ["pages", "fetch"]
+
+    # A shared instance keeps working for the next crawl, and close() writes whatever is left
+    metrics.count("pages", url="https://example.org/")
+    metrics.close()
+    assert [event["domain"] for event in read_events(path)] == ["example.com", "example.com", "example.org"]
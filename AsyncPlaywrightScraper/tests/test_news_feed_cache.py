@@ -0,0 +1,107 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from NewsScraper import NewsScraper
+
+
+class FeedServer:
+    """
+    Purpose: Local RSS server with an ETag that answers 304 when the request's If-None-Match still matches
+    """
+    def __init__(self, entries: int):
+        self.set_entries(entries)
+        self.statuses: list[int] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.headers.get("If-None-Match") == server.etag:
+                    server.statuses.append(304)
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                server.statuses.append(200)
+                body = server.body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/rss+xml")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", server.etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/rss"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def set_entries(self, count: int) -> None:
+        items = "".join(f"<item><title>Acme story {i}</title><link>https://news.example.com/{i}</link>"
+                        f"<guid>story-{i}</guid><description>AI story {i}</description></item>" for i in range(count))
+        self.body = f'<?xml version="1.0"?><rss version="2.0"><channel><title>Acme</title>{items}</channel></rss>'
+        self.etag = f'"v{count}"'
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def feed_server():
+    server = FeedServer(15)
+    yield server
+    server.stop()
+
+
+def make_scraper(tmp_path, url: str) -> NewsScraper:
+    scraper = NewsScraper(parse_workers=1, feed_cache_path=str(tmp_path / "feeds.sqlite"))
+    scraper._build_rss_url = lambda company, search_terms=None: url
+    return scraper
+
+
+def test_async_polls_return_held_back_entries_before_304(tmp_path, feed_server):
+    scraper = make_scraper(tmp_path, feed_server.url)
+
+    async def poll() -> list[str]:
+        return [result["link"] for result in await scraper.perform_search_async("Acme", ["AI"], max_results=10)]
+
+    async def run():
+        first = await poll()
+        assert len(first) == 10
+        second = await poll()  # The 5 entries held back by max_results, not a 304
+        assert len(second) == 5 and not set(first) & set(second)
+        assert await poll() == []  # Everything returned: now the feed is unchanged and skipped
+        assert feed_server.statuses == [200, 200, 304]
+
+        feed_server.set_entries(17)
+        assert await poll() == ["https://news.example.com/15", "https://news.example.com/16"]
+        assert feed_server.statuses[-1] == 200
+        await scraper.stop()
+
+    asyncio.run(run())
+
+
+def test_async_searches_share_one_session_until_stop(tmp_path, feed_server):
+    scraper = make_scraper(tmp_path, feed_server.url)
+
+    async def run():
+        await scraper.perform_search_many([("Acme", ["AI"]), ("Beta", ["AI"])], max_results=1)
+        session = scraper.session
+        await scraper.perform_search_async("Acme", ["AI"], max_results=1)
+        assert scraper.session is session and not session.closed
+        await scraper.stop()
+        assert session.closed and scraper.session is None
+
+    asyncio.run(run())
+
+
+def test_sync_polls_return_held_back_entries_before_304(tmp_path, feed_server):
+    scraper = make_scraper(tmp_path, feed_server.url)
+    assert len(scraper.perform_search("Acme", ["AI"], max_results=10)) == 10
+    assert len(scraper.perform_search("Acme", ["AI"], max_results=10)) == 5
+    assert scraper.perform_search("Acme", ["AI"], max_results=10) == []
+    assert feed_server.statuses == [200, 200, 304]
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from BrowserHandler import PagePool
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    async def close(self) -> None:
+        self.closed = True
+
+    async def evaluate(self, script: str) -> None:
+        pass
+
+    async def goto(self, url: str) -> None:
+        pass
+
+
+class FakeContext:
+    def __init__(self, failures: int = 0):
+        self.created = 0
+        self.failures = failures
+
+    async def new_page(self) -> FakePage:
+        await asyncio.sleep(0.01)  # Page creation yields to the loop, like a real browser round trip
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("new_page failed")
+        self.created += 1
+        return FakePage()
+
+
+def run_borrowers(pool: PagePool, borrowers: int) -> int:
+    open_pages = 0
+    most_open = 0
+
+    async def borrow() -> None:
+        nonlocal open_pages, most_open
+        async with pool.page():
+            open_pages += 1
+            most_open = max(most_open, open_pages)
+            await asyncio.sleep(0.01)
+            open_pages -= 1
+
+    async def run() -> None:
+        await asyncio.gather(*(borrow() for _ in range(borrowers)))
+
+    asyncio.run(run())
+    return most_open
+
+
+def test_concurrent_acquirers_never_create_more_pages_than_the_size():
+    context = FakeContext()
+    pool = PagePool(context, size=2)
+    assert run_borrowers(pool, 10) == 2
+    assert context.created == 2
+
+
+def test_failed_page_creation_frees_its_slot():
+    context = FakeContext(failures=1)
+    pool = PagePool(context, size=1)
+
+    async def run() -> None:
+        with pytest.raises(RuntimeError):
+            await pool.acquire()
+        page = await pool.acquire()
+        await pool.release(page)
+        await pool.warm()
+
+    asyncio.run(run())
+    assert context.created == 1
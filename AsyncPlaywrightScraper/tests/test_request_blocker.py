@@ -0,0 +1,64 @@
+import asyncio
+
+from RequestBlocker import BlockingPolicy, DomainTrie, RequestBlocker
+
+PAGE = "https://www.example.com/newsroom"
+
+
+def test_default_policy_blocks_resource_types_without_file_extensions():
+    policy = BlockingPolicy()
+    assert policy.needs_callback
+    for url, resource_type in [("https://cdn.example.com/image?id=1", "image"),
+                               ("https://www.example.com/fonts/brand", "font"),
+                               ("https://www.example.com/styles?v=2", "stylesheet"),
+                               ("https://video.example.com/stream/42", "media"),
+                               ("https://www.example.com/events", "eventsource"),
+                               ("https://www.example.com/beacon", "ping")]:
+        assert policy.block_reason(url, resource_type, False, PAGE) == resource_type
+
+    assert policy.block_reason(PAGE, "document", False, PAGE) is None
+    assert policy.block_reason("https://www.example.com/app.js", "script", False, PAGE) is None
+    assert policy.block_reason("https://www.example.com/api/news", "fetch", False, PAGE) is None
+
+
+def test_url_only_policy_skips_the_callback():
+    policy = BlockingPolicy(exact_resource_types=False)
+    assert not policy.needs_callback
+    assert policy.native_pattern.search("https://cdn.example.com/logo.PNG?size=2")
+    assert policy.native_pattern.search("https://www.google-analytics.com/collect")
+    assert not policy.native_pattern.search("https://www.example.com/news/image-gallery")
+    assert not BlockingPolicy(blocked_resource_types=["websocket"], blocked_domains=()).needs_callback
+
+
+def test_domain_trie_matches_subdomains_only():
+    trie = DomainTrie(["doubleclick.net"])
+    assert trie.matches("ad.doubleclick.net") and trie.matches("doubleclick.net")
+    assert not trie.matches("notdoubleclick.net")
+
+
+class FakeRoute:
+    def __init__(self):
+        self.action = None
+
+    async def abort(self):
+        self.action = "abort"
+
+    async def fallback(self):
+        self.action = "fallback"
+
+
+class ServiceWorkerRequest:
+    url = "https://cdn.example.com/image?id=1"
+    resource_type = "image"
+
+    @property
+    def frame(self):
+        raise RuntimeError("Service Worker requests do not have an associated frame.")
+
+
+def test_requests_without_a_frame_fall_back():
+    blocker = RequestBlocker()
+    route = FakeRoute()
+    asyncio.run(blocker._route_callback(route, ServiceWorkerRequest()))
+    assert route.action == "fallback"
+    assert blocker.totals.requests == 0
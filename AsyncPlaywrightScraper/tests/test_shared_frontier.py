@@ -0,0 +1,95 @@
+import asyncio
+import time
+
+import pytest
+
+import SharedFrontier
+from SharedFrontier import RedisFrontier, SQLiteFrontier
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+
+@pytest.fixture(params=[
+    "sqlite",
+    # The Lua scripts run on fakeredis' embedded interpreter (needs lupa), so both backends meet one contract
+    pytest.param("redis", marks=pytest.mark.skipif(fakeredis is None or SharedFrontier.redis is None,
+                                                   reason="fakeredis and redis are not installed")),
+])
+def make_frontier(request, tmp_path, monkeypatch):
+    if request.param == "sqlite":
+        return lambda **options: SQLiteFrontier(str(tmp_path / "frontier.sqlite"), **options)
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(SharedFrontier.redis.Redis, "from_url",
+                        lambda url, **kwargs: fakeredis.FakeRedis(server=server, **kwargs))
+    return lambda **options: RedisFrontier(**options)
+
+
+def test_leases_expire_and_items_fail_after_max_attempts(make_frontier):
+    frontier = make_frontier(lease_seconds=0.05, max_attempts=2)
+    assert frontier.add([("a", {"n": 1}), ("b", {"n": 2})]) == 2
+    assert frontier.add([("a", {"n": 1})]) == 0
+
+    [item] = frontier.claim("worker-1")
+    assert (item.key, item.payload, item.attempts) == ("a", {"n": 1}, 1)
+    assert sorted(frontier.unfinished()) == ["a", "b"]
+
+    time.sleep(0.1)  # worker-1 stops renewing: its lease runs out and the item is handed out again
+    assert [item.key for item in frontier.claim("worker-2", 2)] == ["a", "b"]
+    assert not frontier.complete("worker-1", "a")  # Lost lease: nothing is written
+    assert frontier.complete("worker-2", "b", {"ok": True}, new_items=[("c", {})], results=[("r", {"url": "x"})])
+
+    time.sleep(0.1)  # Second expiry of "a" reaches max_attempts
+    assert [item.key for item in frontier.claim("worker-2", 5)] == ["c"]
+    assert frontier.counts() == {"pending": 0, "leased": 1, "done": 1, "failed": 1}
+    assert frontier.outcomes() == {"b": {"ok": True}}
+    assert frontier.results() == [("r", "b", {"url": "x"})]
+    frontier.close()
+
+
+def test_calls_from_worker_threads_share_one_connection(make_frontier):
+    frontier = make_frontier()
+    frontier.add([(f"item-{index}", {}) for index in range(200)])
+
+    async def worker(owner: str) -> int:
+        completed = 0
+        while items := await asyncio.to_thread(frontier.claim, owner, 3):
+            for item in items:
+                await asyncio.to_thread(frontier.renew, owner, [item.key])
+                completed += await asyncio.to_thread(frontier.complete, owner, item.key, {"by": owner})
+        return completed
+
+    async def run() -> list[int]:
+        return await asyncio.gather(*(worker(f"worker-{index}") for index in range(8)))
+
+    assert sum(asyncio.run(run())) == 200
+    assert frontier.counts() == {"pending": 0, "leased": 0, "done": 200, "failed": 0}
+    frontier.close()
+
+
+def test_release_and_renew_only_apply_to_the_lease_owner(make_frontier):
+    frontier = make_frontier(lease_seconds=0.2, max_attempts=2)
+    frontier.add([("a", {}), ("b", {})])
+    [a, b] = frontier.claim("worker-1", 2)
+
+    frontier.release("worker-2", "a")  # Not the owner: nothing changes
+    assert frontier.counts() == {"pending": 0, "leased": 2, "done": 0, "failed": 0}
+    assert frontier.renew("worker-2", ["a", "b"]) == 0
+    assert frontier.renew("worker-1", ["a", "b"]) == 2
+
+    frontier.release("worker-1", "a")  # Handed back for another attempt
+    [again] = frontier.claim("worker-2")
+    assert (again.key, again.attempts) == ("a", 2)
+    frontier.release("worker-2", "a")  # Out of attempts
+    assert frontier.claim("worker-2") == []
+    assert frontier.counts() == {"pending": 0, "leased": 1, "done": 0, "failed": 1}
+
+    # Duplicate new items and results are only stored once
+    assert frontier.complete("worker-1", "b", new_items=[("a", {}), ("c", {"n": 3})], results=[("r", {})])
+    assert [item.key for item in frontier.claim("worker-3", 5)] == ["c"]
+    assert frontier.complete("worker-3", "c", results=[("r", {"again": True})])
+    assert frontier.results() == [("r", "b", {})]
+    assert sorted(frontier.unfinished()) == []
+    frontier.close()
@@ -0,0 +1,75 @@
+import asyncio
+
+from BrowserHandler import BrowserHandler
+from HomepageScraper import HomepageScraper
+from StorageStateStore import StorageStateStore
+
+
+class FakeContext:
+    async def route(self, *args):
+        pass
+
+    async def route_web_socket(self, *args):
+        pass
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.storage_states: list[dict | None] = []
+
+    async def new_context(self, storage_state=None):
+        self.storage_states.append(storage_state)
+        return FakeContext()
+
+
+def cookie(name: str, domain: str) -> dict:
+    return {"name": name, "value": "1", "domain": domain, "path": "/", "expires": -1}
+
+
+def save_two_sites(directory: str) -> None:
+    StorageStateStore(directory).save({
+        "cookies": [cookie("consent", ".acme.com"), cookie("session", "www.other.org")],
+        "origins": [{"origin": "https://www.acme.com", "localStorage": [{"name": "theme", "value": "dark"}]},
+                    {"origin": "https://other.org", "localStorage": [{"name": "cart", "value": "3"}]}],
+    })
+
+
+def cookie_names(state: dict | None) -> list[str]:
+    return sorted(cookie["name"] for cookie in state["cookies"]) if state else []
+
+
+def test_isolated_context_only_gets_its_sites_state(tmp_path):
+    save_two_sites(str(tmp_path))
+    parent = BrowserHandler(storage_state_dir=str(tmp_path))
+    browser = FakeBrowser()
+
+    asyncio.run(parent.new_isolated_handler(1, site="acme.com")._new_context(browser, 1))
+    asyncio.run(parent.new_isolated_handler(1, site="unknown.net")._new_context(browser, 1))
+    asyncio.run(parent._new_context(browser, 1))  # No site: every saved site, as before
+
+    acme, unknown, every_site = browser.storage_states
+    assert cookie_names(acme) == ["consent"]
+    assert [origin["origin"] for origin in acme["origins"]] == ["https://www.acme.com"]
+    assert unknown is None
+    assert cookie_names(every_site) == ["consent", "session"]
+
+
+def test_homepage_scraper_scopes_its_context_to_the_company_site(tmp_path):
+    save_two_sites(str(tmp_path))
+    scraper = HomepageScraper("key", [], homepage_cache_path=":memory:", storage_state_dir=str(tmp_path),
+                              politeness=False, sitemap_discovery=False)
+    scraper.company_homepage = "https://www.acme.com/"
+    loaded: list[dict | None] = []
+
+    async def start():
+        loaded.append(scraper.browser_handler._load_storage_state())
+
+    async def noop():
+        pass
+
+    scraper.browser_handler.start = start
+    scraper.fetcher.start = noop
+    asyncio.run(scraper.start())
+
+    assert scraper.browser_handler.site == "acme.com"
+    assert cookie_names(loaded[0]) == ["consent"]